@@ -0,0 +1,164 @@
+"""
+Barridos de parámetros en paralelo.
+
+Cada corrida (método, f, x0, y0, h, x_final) se reparte en un
+ProcessPoolExecutor. Cada proceso integra en su propia memoria (los métodos
+de solvers.py reservan su salida) y copia la trayectoria en su bloque de
+una memoria compartida (multiprocessing.shared_memory) reservada de
+antemano, de modo que los resultados no se serializan de vuelta: el
+proceso principal solo recibe la confirmación de que la tarea terminó y
+luego pasa cada bloque a los arreglos x e y de su resultado.
+
+Crear el pool cuesta decenas de milisegundos, más que integrar unos pocos
+miles de pasos, así que los barridos pequeños (menos de
+MIN_FILAS_PARALELO filas en total, una sola tarea o un solo proceso) se
+ejecutan en serie en el proceso actual, sin memoria compartida.
+
+    tareas = [(euler, f, 0.0, 2.0, h, 0.5) for h in (0.1, 0.05)]
+    resultados = barrido(tareas)        # [(x, y), (x, y)]
+
+Como las tareas viajan a otros procesos, el método y f deben poder
+serializarse con pickle (funciones definidas a nivel de módulo, no
+lambdas ni cierres).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from solvers import (_numero_pasos, adams_bashforth_moulton,
+                     adams_bashforth_moulton_sistema)
+
+
+# Por debajo de este total de filas el barrido no usa procesos
+MIN_FILAS_PARALELO = 20_000
+
+# Opciones que cambian el tamaño o la forma de la salida de un método
+OPCIONES_NO_ADMITIDAS = ("guardar_cada", "t_eval", "eventos", "densa")
+
+
+def validar_opciones(opciones):
+    """ValueError si opciones incluye alguna de OPCIONES_NO_ADMITIDAS."""
+    rechazadas = [nombre for nombre in OPCIONES_NO_ADMITIDAS if nombre in opciones]
+    if rechazadas:
+        raise ValueError(f"Opciones no admitidas en un barrido: {', '.join(rechazadas)} "
+                         "(cambian el tamaño o la forma de la salida)")
+
+
+def _numero_filas(metodo, x0, h, x_final):
+    """Filas de la trayectoria que produce el método (n_pasos + 1)."""
+    n_pasos = _numero_pasos(x0, h, x_final)
+    if metodo in (adams_bashforth_moulton, adams_bashforth_moulton_sistema):
+        # ABM siempre calcula al menos los 3 pasos de arranque con RK4
+        n_pasos = max(3, n_pasos)
+    return n_pasos + 1
+
+
+def _correr(filas, columnas, tarea):
+    """Corre una tarea y verifica que (x, y) tenga el tamaño esperado."""
+    metodo, f, x0, y0, h, x_final, opciones = tarea
+    x, y = metodo(f, x0, y0, h, x_final, **opciones)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) != filas or y.size != filas * (columnas - 1):
+        raise ValueError(f"{metodo.__name__} produjo {len(x)} filas, se esperaban {filas}")
+    return x, y
+
+
+def _ejecutar(nombre, total, inicio, filas, columnas, tarea):
+    """
+    Corre una tarea en un proceso trabajador y copia (x, y) en su bloque de
+    la memoria compartida (el método reserva su propia salida; la copia es
+    la única extra). El bloque tiene forma (filas, columnas): la columna 0
+    es x y el resto y.
+    """
+    memoria = shared_memory.SharedMemory(name=nombre)
+    try:
+        buffer = np.ndarray((total,), dtype=np.float64, buffer=memoria.buf)
+        bloque = buffer[inicio:inicio + filas * columnas].reshape(filas, columnas)
+
+        x, y = _correr(filas, columnas, tarea)
+        bloque[:, 0] = x
+        bloque[:, 1:] = y.reshape(filas, columnas - 1)
+        del buffer, bloque
+    finally:
+        memoria.close()
+
+
+def barrido(tareas, max_procesos=None, min_filas_paralelo=MIN_FILAS_PARALELO):
+    """
+    Ejecuta varias corridas de paso fijo en paralelo.
+
+    PARÁMETROS:
+    -----------
+    tareas : list
+        Cada tarea es una tupla (metodo, f, x0, y0, h, x_final) o
+        (metodo, f, x0, y0, h, x_final, opciones), donde opciones es un
+        diccionario de argumentos extra para el método (por ejemplo
+        {"modo": "PEC"}). No se admiten guardar_cada, t_eval, eventos ni
+        densa, porque cambian el tamaño o la forma de la salida.
+
+    max_procesos : int, opcional
+        Número de procesos (por defecto, uno por núcleo). Con 1 las tareas
+        se ejecutan en el proceso actual, sin pool.
+
+    min_filas_paralelo : int
+        Si el total de filas de todas las tareas es menor, también se
+        ejecutan en el proceso actual (el pool costaría más que el trabajo).
+
+    RETORNA:
+    --------
+    list de tuplas (x, y), en el mismo orden que las tareas. y es 1D para
+    problemas escalares y 2D (filas, n_estado) para sistemas.
+    """
+    normalizadas = []
+    for tarea in tareas:
+        tarea = tuple(tarea)
+        if len(tarea) == 6:
+            tarea = tarea + ({},)
+        elif len(tarea) != 7:
+            raise ValueError("Cada tarea debe ser (metodo, f, x0, y0, h, x_final[, opciones])")
+        validar_opciones(tarea[6])
+        normalizadas.append(tarea)
+
+    # Bloque de cada tarea dentro de un único arreglo compartido
+    bloques = []
+    total = 0
+    for metodo, f, x0, y0, h, x_final, opciones in normalizadas:
+        filas = _numero_filas(metodo, x0, h, x_final)
+        columnas = 1 + np.size(y0)
+        bloques.append((total, filas, columnas))
+        total += filas * columnas
+
+    if not normalizadas:
+        return []
+
+    procesos = min(max_procesos or os.cpu_count() or 1, len(normalizadas))
+    if procesos == 1 or sum(filas for _, filas, _ in bloques) < min_filas_paralelo:
+        # En serie la salida de cada método ya es el resultado: sin copias
+        return [_correr(filas, columnas, tarea)
+                for (_, filas, columnas), tarea in zip(bloques, normalizadas)]
+
+    memoria = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [pool.submit(_ejecutar, memoria.name, total, inicio, filas, columnas, tarea)
+                       for (inicio, filas, columnas), tarea in zip(bloques, normalizadas)]
+            for futuro in futuros:
+                futuro.result()
+
+        # El bloque compartido no puede cerrarse mientras haya vistas sobre
+        # él, así que cada tarea se copia una vez a sus propios x e y
+        datos = np.ndarray((total,), dtype=np.float64, buffer=memoria.buf)
+        resultados = []
+        for (inicio, filas, columnas), tarea in zip(bloques, normalizadas):
+            bloque = datos[inicio:inicio + filas * columnas].reshape(filas, columnas)
+            y = bloque[:, 1] if np.ndim(tarea[3]) == 0 else bloque[:, 1:]
+            resultados.append((bloque[:, 0].copy(), y.copy()))
+        del datos, bloque, y
+    finally:
+        memoria.close()
+        memoria.unlink()
+    return resultados
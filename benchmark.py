@@ -0,0 +1,202 @@
+"""
+Benchmark de los métodos de paso fijo sobre los problemas de p1..p5.
+
+Para cada problema, método y paso h se registran:
+    - tiempo de pared (el mejor de varias repeticiones),
+    - número de evaluaciones de f,
+    - memoria pico (tracemalloc),
+    - error en el punto final.
+
+Los resultados se guardan en <salida>/resultados.json y se dibuja un
+diagrama trabajo-precisión por problema (error contra evaluaciones de f y
+contra tiempo) en <salida>/trabajo_precision_<problema>.png.
+
+    python benchmark.py --salida resultados_benchmark --repeticiones 3
+
+p2 resuelve el mismo problema que p1, así que no se repite. p5 no tiene
+solución analítica: la referencia es dormand_prince con rtol = atol = 1e-12.
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+import p1
+import p3
+import p4
+import p5
+from graficas import pyplot, renderizar
+from solvers import (adams_bashforth_moulton, adams_bashforth_moulton_sistema,
+                     dormand_prince, euler, euler_mejorado, rk4, rk4_sistema,
+                     rk4_sistema_np)
+
+
+# ============================================
+# PROBLEMAS Y MÉTODOS
+# ============================================
+
+METODOS_ESCALARES = [euler, euler_mejorado, rk4, adams_bashforth_moulton]
+METODOS_SISTEMA = [rk4_sistema, rk4_sistema_np, adams_bashforth_moulton_sistema]
+
+
+def _problemas():
+    """Problemas de p1..p5: f, condiciones iniciales, pasos y valor de referencia."""
+    pendulo = p5.crear_funcion_pendulo(p5.G_TIERRA, p5.L)
+    y0_pendulo = [p5.THETA_0, p5.OMEGA_0]
+    _, y_ref, _ = dormand_prince(pendulo, p5.T_INICIAL, y0_pendulo, p5.T_FINAL,
+                                 rtol=1e-12, atol=1e-12)
+    return {
+        "p1": {"f": p1.f, "x0": p1.x0, "y0": p1.y0, "x_final": p1.x_final,
+               "hs": [0.1 / 2**k for k in range(8)],
+               "referencia": float(p1.y_analitica(p1.x_final)),
+               "metodos": METODOS_ESCALARES},
+        "p3": {"f": p3.f, "x0": p3.x0, "y0": p3.y0, "x_final": p3.x_final,
+               "hs": [0.2 / 2**k for k in range(8)],
+               "referencia": p3.y_analitica(p3.x_final),
+               "metodos": METODOS_ESCALARES},
+        "p4": {"f": p4.f, "x0": 0.0, "y0": 0.24, "x_final": 10.0,
+               "hs": [0.5 / 2**k for k in range(8)],
+               "referencia": float(p4.y_analitica(10.0)),
+               "metodos": METODOS_ESCALARES},
+        "p5": {"f": pendulo, "x0": p5.T_INICIAL, "y0": y0_pendulo, "x_final": p5.T_FINAL,
+               "hs": [0.1 / 2**k for k in range(7)],
+               "referencia": y_ref[-1],
+               "metodos": METODOS_SISTEMA},
+    }
+
+
+# ============================================
+# MEDICIONES
+# ============================================
+
+def medir(metodo, f, x0, y0, h, x_final, referencia, repeticiones=3):
+    """
+    Mide una corrida. El tiempo, el conteo de evaluaciones y la memoria se
+    miden en corridas separadas para que ni el contador ni tracemalloc
+    alteren el tiempo.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        metodo(f, x0, y0, h, x_final)
+        tiempos.append(time.perf_counter() - inicio)
+
+    evaluaciones = [0]
+
+    def f_contada(x, y):
+        evaluaciones[0] += 1
+        return f(x, y)
+
+    _, y = metodo(f_contada, x0, y0, h, x_final)
+
+    tracemalloc.start()
+    metodo(f, x0, y0, h, x_final)
+    _, memoria_pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    error = float(np.max(np.abs(np.asarray(y[-1], dtype=float) - referencia)))
+    return {
+        "tiempo_s": min(tiempos),
+        "evaluaciones": evaluaciones[0],
+        "memoria_pico_bytes": memoria_pico,
+        "error_final": error,
+    }
+
+
+def ejecutar(problemas=None, repeticiones=3):
+    """Corre todas las combinaciones problema × método × h. Retorna una lista de dicts."""
+    todos = _problemas()
+    nombres = list(todos) if problemas is None else list(problemas)
+    resultados = []
+    for nombre in nombres:
+        problema = todos[nombre]
+        for metodo in problema["metodos"]:
+            for h in problema["hs"]:
+                medicion = medir(metodo, problema["f"], problema["x0"], problema["y0"], h,
+                                 problema["x_final"], problema["referencia"], repeticiones)
+                resultados.append({"problema": nombre, "metodo": metodo.__name__, "h": h,
+                                   **medicion})
+                print(f"{nombre:<4} {metodo.__name__:<32} h = {h:<12.6g} "
+                      f"error = {medicion['error_final']:.3e}  "
+                      f"tiempo = {medicion['tiempo_s']:.3e} s")
+    return resultados
+
+
+# ============================================
+# SALIDA
+# ============================================
+
+def guardar_resultados(resultados, ruta):
+    """Guarda los resultados y el entorno de ejecución en JSON."""
+    documento = {
+        "entorno": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "procesador": platform.processor(),
+        },
+        "resultados": resultados,
+    }
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(documento, archivo, indent=2)
+
+
+def graficar_trabajo_precision(resultados, carpeta):
+    """Un diagrama trabajo-precisión (log-log) por problema."""
+    plt = pyplot(sin_ventana=True)
+
+    figuras = {}
+    for problema in dict.fromkeys(r["problema"] for r in resultados):
+        fig, (ax_eval, ax_tiempo) = plt.subplots(1, 2, figsize=(12, 5))
+        filas = [r for r in resultados if r["problema"] == problema]
+        for metodo in dict.fromkeys(r["metodo"] for r in filas):
+            # Los errores exactamente cero no se pueden dibujar en escala log
+            puntos = [r for r in filas if r["metodo"] == metodo and r["error_final"] > 0]
+            errores = [r["error_final"] for r in puntos]
+            ax_eval.loglog([r["evaluaciones"] for r in puntos], errores, "o-", label=metodo)
+            ax_tiempo.loglog([r["tiempo_s"] for r in puntos], errores, "o-", label=metodo)
+
+        ax_eval.set_xlabel("Evaluaciones de f")
+        ax_tiempo.set_xlabel("Tiempo (s)")
+        for ax in (ax_eval, ax_tiempo):
+            ax.set_ylabel("Error final")
+            ax.grid(True, which="both", alpha=0.3)
+            ax.legend()
+        fig.suptitle(f"Trabajo-precisión: {problema}")
+        fig.tight_layout()
+        figuras[f"trabajo_precision_{problema}"] = fig
+
+    return renderizar(figuras, carpeta, formatos=("png",))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los métodos de solvers.py")
+    parser.add_argument("--salida", default="resultados_benchmark",
+                        help="carpeta para resultados.json y las gráficas")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="repeticiones para medir el tiempo (se toma el mínimo)")
+    parser.add_argument("--problemas", nargs="+", choices=["p1", "p3", "p4", "p5"],
+                        help="problemas a medir (por defecto todos)")
+    parser.add_argument("--sin-graficas", action="store_true",
+                        help="no generar los diagramas trabajo-precisión")
+    args = parser.parse_args()
+
+    os.makedirs(args.salida, exist_ok=True)
+    resultados = ejecutar(args.problemas, args.repeticiones)
+
+    ruta = os.path.join(args.salida, "resultados.json")
+    guardar_resultados(resultados, ruta)
+    print(f"\nResultados guardados en {ruta}")
+
+    if not args.sin_graficas:
+        for ruta in graficar_trabajo_precision(resultados, args.salida):
+            print(f"Gráfica guardada en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Caché en disco de corridas de los métodos.
+
+Los mismos problemas de p1..p5 se vuelven a integrar muchas veces con los
+mismos (f, x0, y0, h, x_final). memoizar envuelve un método de solvers.py
+(o de rigidos.py) y guarda cada resultado en disco; una corrida repetida se
+lee del archivo en lugar de integrarse otra vez:
+
+    rk4_cache = memoizar(rk4, carpeta=".cache_solvers")
+    x, y = rk4_cache(f, 0, 2, 0.001, 0.5)    # integra y guarda
+    x, y = rk4_cache(f, 0, 2, 0.001, 0.5)    # lee del disco
+
+CLAVE: un hash SHA-256 de
+    - el método (su nombre y su bytecode, para que un cambio en el método
+      invalide lo guardado),
+    - f: bytecode, constantes, valores de las variables del cierre, valores
+      por defecto y las variables globales que usa (números, arreglos,
+      otras funciones...), así que crear_funcion_pendulo(32, 3) y
+      crear_funcion_pendulo(5.28, 3) tienen claves distintas,
+    - los demás argumentos.
+Para las funciones de un módulo con archivo fuente (solvers.py, p5.py...)
+se usa además el hash del código fuente del módulo, y de sus variables
+globales privadas (nombre con _) solo se siguen las funciones: los datos
+privados ya están en el fuente, y así el estado mutable del módulo
+(_TABLAS_COMPILADAS, _instrumentacion) no cambia la clave.
+Si algún argumento no se puede reducir a una huella estable (por ejemplo
+un objeto cuyo repr incluye su dirección en memoria), la corrida se hace
+sin caché.
+
+ALMACENAMIENTO: un archivo .npz sin pickle por resultado. Al superar
+tam_max_bytes se borran los menos usados recientemente (LRU, según la
+fecha de modificación, que se actualiza en cada acierto).
+"""
+
+import hashlib
+import json
+import os
+import sys
+import types
+
+import numpy as np
+
+
+CARPETA_POR_DEFECTO = ".cache_solvers"
+TAM_MAX_POR_DEFECTO = 256 * 1024**2
+
+# Hash del fuente de cada módulo, por (ruta, fecha de modificación, tamaño)
+_FUENTES = {}
+
+
+class _SinHuella(Exception):
+    """El objeto no tiene una representación estable para la clave."""
+
+
+# ============================================
+# CLAVE
+# ============================================
+
+def _huella(obj, hasher, vistos):
+    """Agrega al hasher una representación estable de obj."""
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+    elif isinstance(obj, np.ndarray):
+        hasher.update(f"ndarray:{obj.dtype.str}:{obj.shape};".encode())
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+
+    elif isinstance(obj, np.generic):
+        _huella(obj.item(), hasher, vistos)
+
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(f"{type(obj).__name__}[{len(obj)}](".encode())
+        for elemento in obj:
+            _huella(elemento, hasher, vistos)
+        hasher.update(b")")
+
+    elif isinstance(obj, dict):
+        hasher.update(f"dict[{len(obj)}](".encode())
+        for clave in sorted(obj, key=repr):
+            _huella(clave, hasher, vistos)
+            _huella(obj[clave], hasher, vistos)
+        hasher.update(b")")
+
+    elif isinstance(obj, types.CodeType):
+        hasher.update(b"code:")
+        hasher.update(obj.co_code)
+        _huella(obj.co_names, hasher, vistos)
+        _huella(obj.co_varnames, hasher, vistos)
+        for constante in obj.co_consts:
+            _huella(constante, hasher, vistos)
+
+    elif isinstance(obj, types.FunctionType):
+        # Las funciones recursivas (o que se llaman entre sí) solo se recorren una vez
+        if id(obj) in vistos:
+            hasher.update(f"ref:{obj.__qualname__};".encode())
+            return
+        vistos.add(id(obj))
+        hasher.update(f"function:{obj.__module__}.{obj.__qualname__};".encode())
+        _huella(obj.__code__, hasher, vistos)
+        _huella(obj.__defaults__, hasher, vistos)
+        _huella(obj.__kwdefaults__, hasher, vistos)
+        for celda in obj.__closure__ or ():
+            _huella(celda.cell_contents, hasher, vistos)
+        fuente = _hash_fuente(obj.__globals__.get("__file__"))
+        if fuente is not None:
+            hasher.update(f"fuente:{fuente};".encode())
+        # Variables globales que usa la función (constantes del módulo, otras funciones)
+        for nombre in _nombres_globales(obj.__code__):
+            if nombre not in obj.__globals__:
+                continue
+            valor = obj.__globals__[nombre]
+            if (fuente is not None and nombre.startswith("_")
+                    and not isinstance(valor, types.FunctionType)):
+                continue  # cachés y estado del módulo; su definición está en el fuente
+            hasher.update(f"global:{nombre};".encode())
+            _huella(valor, hasher, vistos)
+
+    elif isinstance(obj, types.ModuleType):
+        hasher.update(f"module:{obj.__name__};".encode())
+
+    elif isinstance(obj, (types.BuiltinFunctionType, np.ufunc, type)):
+        modulo = getattr(obj, "__module__", None) or "builtins"
+        hasher.update(f"builtin:{modulo}.{getattr(obj, '__qualname__', obj.__name__)};".encode())
+
+    elif hasattr(obj, "func") and hasattr(obj, "args") and hasattr(obj, "keywords"):
+        # functools.partial
+        hasher.update(b"partial:")
+        _huella(obj.func, hasher, vistos)
+        _huella(obj.args, hasher, vistos)
+        _huella(obj.keywords, hasher, vistos)
+
+    else:
+        texto = repr(obj)
+        if " at 0x" in texto:
+            raise _SinHuella(texto)
+        hasher.update(f"{type(obj).__qualname__}:{texto};".encode())
+
+
+def _hash_fuente(ruta):
+    """SHA-256 del archivo fuente de un módulo (None si no hay archivo .py)."""
+    if not isinstance(ruta, str) or not ruta.endswith(".py"):
+        return None
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        return None
+    firma = (ruta, estado.st_mtime_ns, estado.st_size)
+    if firma not in _FUENTES:
+        with open(ruta, "rb") as archivo:
+            _FUENTES[firma] = hashlib.sha256(archivo.read()).hexdigest()
+    return _FUENTES[firma]
+
+
+def _nombres_globales(codigo):
+    """co_names de la función y de las funciones anidadas que define."""
+    nombres = list(codigo.co_names)
+    for constante in codigo.co_consts:
+        if isinstance(constante, types.CodeType):
+            nombres.extend(_nombres_globales(constante))
+    return sorted(set(nombres))
+
+
+def clave_corrida(metodo, args, kwargs):
+    """Hash hexadecimal de una llamada metodo(*args, **kwargs), o None si no se puede calcular."""
+    hasher = hashlib.sha256()
+    hasher.update(f"python:{sys.version_info[:2]};numpy:{np.__version__};".encode())
+    try:
+        _huella(metodo, hasher, set())
+        _huella(tuple(args), hasher, set())
+        _huella(dict(kwargs), hasher, set())
+    except _SinHuella:
+        return None
+    return hasher.hexdigest()
+
+
+# ============================================
+# FORMATO EN DISCO
+# ============================================
+
+def _aplanar(obj, arreglos):
+    """
+    Describe obj (tuplas, listas, dicts, arreglos y números) como una
+    estructura JSON; los datos van en arreglos con nombre a0, a1, ...
+    """
+    if isinstance(obj, (tuple, list)):
+        return {"tipo": type(obj).__name__, "elementos": [_aplanar(e, arreglos) for e in obj]}
+    if isinstance(obj, dict):
+        if not all(isinstance(clave, str) for clave in obj):
+            raise TypeError("Solo se guardan diccionarios con claves str")
+        return {"tipo": "dict", "elementos": {k: _aplanar(v, arreglos) for k, v in obj.items()}}
+    if obj is None:
+        return {"tipo": "none"}
+    if isinstance(obj, (bool, int, float, np.generic)):
+        nombre = f"a{len(arreglos)}"
+        arreglos[nombre] = np.asarray(obj)
+        return {"tipo": "numero", "arreglo": nombre}
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            raise TypeError("No se guardan arreglos de objetos")
+        nombre = f"a{len(arreglos)}"
+        arreglos[nombre] = obj
+        return {"tipo": "arreglo", "arreglo": nombre}
+    raise TypeError(f"Tipo de resultado no soportado: {type(obj).__name__}")
+
+
+def _reconstruir(descripcion, datos):
+    tipo = descripcion["tipo"]
+    if tipo in ("tuple", "list"):
+        elementos = [_reconstruir(e, datos) for e in descripcion["elementos"]]
+        return tuple(elementos) if tipo == "tuple" else elementos
+    if tipo == "dict":
+        return {k: _reconstruir(v, datos) for k, v in descripcion["elementos"].items()}
+    if tipo == "none":
+        return None
+    if tipo == "numero":
+        return datos[descripcion["arreglo"]].item()
+    return datos[descripcion["arreglo"]]
+
+
+def _guardar(ruta, resultado):
+    arreglos = {}
+    descripcion = _aplanar(resultado, arreglos)
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        np.savez(archivo, _estructura=np.array(json.dumps(descripcion)), **arreglos)
+    os.replace(temporal, ruta)
+
+
+def _cargar(ruta):
+    with np.load(ruta, allow_pickle=False) as datos:
+        descripcion = json.loads(str(datos["_estructura"]))
+        arreglos = {nombre: datos[nombre] for nombre in datos.files if nombre != "_estructura"}
+    return _reconstruir(descripcion, arreglos)
+
+
+def _desalojar(carpeta, tam_max_bytes):
+    """Borra los resultados menos usados recientemente hasta quedar bajo tam_max_bytes."""
+    entradas = []
+    for nombre in os.listdir(carpeta):
+        if nombre.endswith(".npz"):
+            ruta = os.path.join(carpeta, nombre)
+            try:
+                estado = os.stat(ruta)
+            except FileNotFoundError:
+                continue  # otro proceso lo borró
+            entradas.append((estado.st_mtime, estado.st_size, ruta))
+
+    total = sum(tam for _, tam, _ in entradas)
+    for _, tam, ruta in sorted(entradas):
+        if total <= tam_max_bytes:
+            break
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+        total -= tam
+
+
+# ============================================
+# API
+# ============================================
+
+def memoizar(metodo, carpeta=CARPETA_POR_DEFECTO, tam_max_bytes=TAM_MAX_POR_DEFECTO):
+    """
+    Envuelve metodo con una caché en disco.
+
+    PARÁMETROS:
+    -----------
+    metodo : función
+        Cualquier método que retorne arreglos, tuplas, listas o dicts de
+        arreglos y números (euler, rk4, rk4_sistema, dormand_prince, bdf...).
+        No sirve para las versiones *_iter, que retornan generadores.
+
+    carpeta : str
+        Carpeta donde se guardan los resultados.
+
+    tam_max_bytes : int
+        Tamaño máximo de la carpeta; al superarlo se desaloja por LRU.
+
+    RETORNA:
+    --------
+    Función con la misma firma que metodo. Tiene el atributo
+    estadisticas = {"aciertos": ..., "fallos": ..., "sin_clave": ...}.
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    estadisticas = {"aciertos": 0, "fallos": 0, "sin_clave": 0}
+
+    def metodo_con_cache(*args, **kwargs):
+        clave = clave_corrida(metodo, args, kwargs)
+        if clave is None:
+            estadisticas["sin_clave"] += 1
+            return metodo(*args, **kwargs)
+
+        ruta = os.path.join(carpeta, clave + ".npz")
+        try:
+            resultado = _cargar(ruta)
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            resultado = None
+        if resultado is not None:
+            estadisticas["aciertos"] += 1
+            try:
+                os.utime(ruta)  # uso reciente para el LRU
+            except FileNotFoundError:
+                pass
+            return resultado
+
+        estadisticas["fallos"] += 1
+        resultado = metodo(*args, **kwargs)
+        try:
+            _guardar(ruta, resultado)
+        except TypeError:
+            return resultado  # resultado que no se sabe guardar: solo no se cachea
+        _desalojar(carpeta, tam_max_bytes)
+        return resultado
+
+    metodo_con_cache.__name__ = metodo.__name__
+    metodo_con_cache.__doc__ = metodo.__doc__
+    metodo_con_cache.__wrapped__ = metodo
+    metodo_con_cache.estadisticas = estadisticas
+    return metodo_con_cache
+
+
+def limpiar_cache(carpeta=CARPETA_POR_DEFECTO):
+    """Borra todos los resultados guardados en carpeta."""
+    if os.path.isdir(carpeta):
+        for nombre in os.listdir(carpeta):
+            if nombre.endswith((".npz", ".tmp")):
+                os.remove(os.path.join(carpeta, nombre))
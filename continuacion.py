@@ -0,0 +1,170 @@
+"""
+Integraciones que se pueden continuar o guardar a medio camino.
+
+Los métodos de solvers.py siempre empiezan en x0: si después se necesita
+un x_final mayor, se vuelve a integrar todo. Además p3 corría rk4 para
+mostrar la tabla de arranque y luego adams_bashforth_moulton repetía esos
+mismos pasos de RK4. Aquí el estado de una integración (punto actual, h e
+historia del multipaso) es un diccionario que se extiende y se guarda:
+
+    estado = iniciar_integracion("adams_bashforth_moulton", 0.0, 1.0, 0.2)
+    x1, y1 = extender(estado, f, 0.6)     # y₁..y₃ (arranque con RK4)
+    x2, y2 = extender(estado, f, 0.8)     # solo el paso nuevo (ABM)
+
+    guardar_estado(estado, "corrida.npz")  # checkpoint
+    estado = cargar_estado("corrida.npz")  # ... en otro proceso
+    x3, y3 = extender(estado, f, 10.0)
+
+La malla es la misma de solvers.py (xᵢ = x0 + i·h) y los métodos de un
+paso usan el mismo paso compilado de la tabla de Butcher que runge_kutta,
+así que extender por tramos da exactamente los mismos valores que una sola
+corrida de euler, euler_mejorado, rk4 (o cualquier tabla de
+TABLAS_BUTCHER) o adams_bashforth_moulton hasta el x final. y0 puede
+ser un escalar o un vector (f recibe entonces un numpy.ndarray).
+
+Dentro de solvers.instrumentar() extender cuenta sus evaluaciones de f y
+sus pasos como los métodos de solvers.py.
+"""
+
+import os
+
+import numpy as np
+
+from solvers import (TABLAS_BUTCHER, _compilar_tabla, _medir_rhs, _numero_pasos,
+                     _paso_abm, _registrador_pasos, _validar_modo_abm)
+
+
+METODOS = tuple(TABLAS_BUTCHER) + ("adams_bashforth_moulton",)
+
+
+def iniciar_integracion(metodo, x0, y0, h, modo="PECE"):
+    """
+    Crea el estado de una integración en (x0, y0) con paso h.
+
+    PARÁMETROS:
+    -----------
+    metodo : str
+        Una tabla de TABLAS_BUTCHER ("euler", "euler_mejorado", "rk4", ...)
+        o "adams_bashforth_moulton".
+
+    modo : str
+        "PECE" o "PEC" (solo para adams_bashforth_moulton).
+
+    RETORNA:
+    --------
+    dict con "metodo", "modo", "x0", "h", "pasos" (pasos dados), "x" e "y"
+    (punto actual) e "historia" (para ABM: los y del arranque y después
+    las últimas cuatro derivadas f_{n-3}..f_n).
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido: {metodo!r}")
+    _validar_modo_abm(modo)
+    y = float(y0) if np.ndim(y0) == 0 else np.array(y0, dtype=float)
+    return {
+        "metodo": metodo,
+        "modo": modo,
+        "x0": float(x0),
+        "h": float(h),
+        "pasos": 0,
+        "x": float(x0),
+        "y": y,
+        "historia": [y] if metodo == "adams_bashforth_moulton" else [],
+    }
+
+
+def extender(estado, f, x_nuevo):
+    """
+    Avanza la integración hasta x_nuevo (el primer punto de la malla que
+    lo alcanza) y actualiza el estado.
+
+    RETORNA:
+    --------
+    x, y : numpy.ndarray con solo los puntos nuevos (sin el punto actual).
+    """
+    x0, h = estado["x0"], estado["h"]
+    metodo = estado["metodo"]
+    i = estado["pasos"]
+    n_pasos = _numero_pasos(x0, h, x_nuevo)
+    if metodo == "adams_bashforth_moulton" and i == 0:
+        # Igual que adams_bashforth_moulton: al menos los 3 pasos de arranque
+        n_pasos = max(3, n_pasos)
+
+    f = _medir_rhs(f)
+    escalar = np.ndim(estado["y"]) == 0
+    if not escalar:
+        f_original = f
+
+        def f(x, y):
+            return np.asarray(f_original(x, y), dtype=float)
+
+    n_nuevos = max(0, n_pasos - i)
+    y_nuevos = np.empty((n_nuevos,) + np.shape(estado["y"]))
+    y_actual = estado["y"]
+    historia = estado["historia"]
+    abm = metodo == "adams_bashforth_moulton"
+    # El mismo paso compilado que usa runge_kutta (ABM arranca con RK4)
+    paso = _compilar_tabla("rk4" if abm else metodo)["paso"]
+    registrar = _registrador_pasos()
+
+    for j in range(n_nuevos):
+        x_actual = x0 + i*h
+        if not abm or i < 3:
+            y_actual = paso(f, x_actual, y_actual, h)
+            if abm:
+                historia.append(y_actual)
+                if i == 2:
+                    # Con y₀..y₃ se pasa a guardar las derivadas f₀..f₃
+                    historia[:] = [f(x0 + k*h, historia[k]) for k in range(4)]
+
+        else:
+            y_actual = _paso_abm(f, x0 + (i + 1)*h, y_actual, h, historia, estado["modo"])
+
+        i += 1
+        y_nuevos[j] = y_actual
+        if registrar is not None:
+            registrar(x0 + i*h, y_actual)
+
+    estado["pasos"] = i
+    estado["x"] = x0 + i*h
+    estado["y"] = y_actual
+    x_nuevos = x0 + h * np.arange(n_pasos - n_nuevos + 1, n_pasos + 1)
+    return x_nuevos, y_nuevos
+
+
+def guardar_estado(estado, ruta):
+    """
+    Guarda el estado en un archivo .npz (sin pickle); ruta puede ser str o
+    pathlib.Path. Se escribe primero en un archivo temporal y luego se
+    renombra, así que un proceso que muere a mitad de la escritura deja
+    intacto el checkpoint anterior.
+    """
+    temporal = os.fspath(ruta) + ".tmp"
+    with open(temporal, "wb") as archivo:
+        np.savez(
+            archivo,
+            metodo=np.array(estado["metodo"]),
+            modo=np.array(estado["modo"]),
+            numeros=np.array([estado["x0"], estado["h"], estado["x"]]),
+            pasos=np.array(estado["pasos"]),
+            y=np.asarray(estado["y"], dtype=float),
+            historia=np.array(estado["historia"], dtype=float),
+        )
+    os.replace(temporal, ruta)
+
+
+def cargar_estado(ruta):
+    """Lee un estado guardado con guardar_estado."""
+    with np.load(ruta, allow_pickle=False) as datos:
+        x0, h, x = datos["numeros"]
+        y = datos["y"]
+        escalar = y.ndim == 0
+        return {
+            "metodo": str(datos["metodo"]),
+            "modo": str(datos["modo"]),
+            "x0": float(x0),
+            "h": float(h),
+            "pasos": int(datos["pasos"]),
+            "x": float(x),
+            "y": float(y) if escalar else y.copy(),
+            "historia": [float(v) if escalar else v.copy() for v in datos["historia"]],
+        }
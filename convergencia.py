@@ -0,0 +1,184 @@
+"""
+Selección automática del paso h para obtener un número dado de decimales.
+
+En p1 y p3 el enunciado pide "cuatro decimales" y h se elige a mano
+(0.1, 0.05, 0.2) revisando la tabla de errores. paso_para_decimales parte
+de un h grueso y lo divide a la mitad hasta que la estimación de
+Richardson del error global queda por debajo de 0.5·10^(-decimales):
+
+    y_h/2 - y  ≈  (y_h - y_h/2) / (2^p - 1)
+
+Antes de aceptar la estimación se comprueba que el orden observado,
+log2(|y_h - y_h/2| / |y_h/2 - y_h/4|), coincide con el orden teórico p
+del método; si no, la malla aún no está en el régimen asintótico y la
+estimación de Richardson no es confiable.
+
+comparar_precision mide la otra fuente de error: el redondeo. Corre un
+método con estado numpy.ndarray en float32 y en float64 sobre el mismo
+problema y reporta cuántos dígitos significativos se conservan en float32.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from solvers import adams_bashforth_moulton, euler, euler_mejorado, rk4
+
+
+# Orden global de cada método
+ORDENES = {
+    euler: 1,
+    euler_mejorado: 2,
+    rk4: 4,
+    adams_bashforth_moulton: 4,
+}
+
+
+def paso_para_decimales(metodo, f, x0, y0, x_final, decimales=4, h0=None,
+                        max_mitades=20, tolerancia_orden=0.5, **opciones):
+    """
+    Busca el h más grande (el más barato) que da `decimales` decimales correctos.
+
+    PARÁMETROS:
+    -----------
+    metodo : euler, euler_mejorado, rk4 o adams_bashforth_moulton
+    f, x0, y0, x_final : el problema, como en los métodos de solvers.py
+    decimales : int
+        Decimales correctos pedidos; la tolerancia es 0.5·10^(-decimales).
+    h0 : float, opcional
+        Paso inicial. Debe dividir [x0, x_final] en un número entero de
+        pasos; por defecto (x_final - x0)/4.
+    max_mitades : int
+        Número máximo de veces que se divide h.
+    tolerancia_orden : float
+        Diferencia admitida entre el orden observado y el teórico.
+    **opciones : argumentos extra del método (por ejemplo modo="PEC").
+
+    RETORNA:
+    --------
+    x, y : la solución calculada con el h elegido
+    info : dict con
+        "h", "orden_observado", "error_estimado",
+        "y_extrapolado"   (valor de Richardson en x_final),
+        "evaluaciones"    (evaluaciones de f con el h elegido),
+        "evaluaciones_totales" (todas las corridas de la búsqueda).
+    """
+    if metodo not in ORDENES:
+        raise ValueError(f"Método no soportado: {getattr(metodo, '__name__', metodo)}")
+    orden = ORDENES[metodo]
+    tolerancia = 0.5 * 10.0**(-decimales)
+    h = (x_final - x0) / 4 if h0 is None else h0
+
+    contador = [0]
+
+    def f_contada(x, y):
+        contador[0] += 1
+        return f(x, y)
+
+    def resolver(h):
+        contador[0] = 0
+        x, y = metodo(f_contada, x0, y0, h, x_final, **opciones)
+        return x, y, contador[0]
+
+    x, y, evaluaciones = resolver(h)
+    total = evaluaciones
+    diferencia_anterior = None
+
+    for _ in range(max_mitades):
+        x_fino, y_fino, evaluaciones_fino = resolver(h / 2)
+        total += evaluaciones_fino
+        if len(x_fino) != 2 * len(x) - 1:
+            raise ValueError("h0 debe dividir [x0, x_final] en un número entero de pasos")
+
+        # Diferencia en los puntos comunes a las dos mallas
+        diferencia = float(np.max(np.abs(y_fino[::2] - y)))
+        error = diferencia / (2**orden - 1)
+
+        if diferencia == 0.0:
+            orden_observado = math.inf
+        elif diferencia_anterior is not None:
+            orden_observado = math.log2(diferencia_anterior / diferencia)
+        else:
+            orden_observado = None
+
+        confirmado = orden_observado is not None and (
+            orden_observado == math.inf or abs(orden_observado - orden) <= tolerancia_orden)
+
+        # El error de y_fino está por debajo de la tolerancia, pero quizá el
+        # de y (h actual) también: su estimación es error·2^p.
+        if confirmado and error <= tolerancia:
+            if error * 2**orden <= tolerancia:
+                h_elegido, x_sol, y_sol, eval_sol, error_sol = h, x, y, evaluaciones, error * 2**orden
+            else:
+                h_elegido, x_sol, y_sol, eval_sol, error_sol = h / 2, x_fino, y_fino, evaluaciones_fino, error
+            info = {
+                "h": h_elegido,
+                "orden_observado": orden_observado,
+                "error_estimado": error_sol,
+                "y_extrapolado": float(y_fino[-1] + (y_fino[-1] - y[-1]) / (2**orden - 1)),
+                "evaluaciones": eval_sol,
+                "evaluaciones_totales": total,
+            }
+            return x_sol, y_sol, info
+
+        h /= 2
+        x, y, evaluaciones = x_fino, y_fino, evaluaciones_fino
+        diferencia_anterior = diferencia
+
+    raise RuntimeError(f"No se alcanzaron {decimales} decimales con {max_mitades} divisiones de h")
+
+
+def comparar_precision(metodo, f, x0, y0, h, x_final, /, **opciones):
+    """
+    Compara una corrida en float32 contra la misma en float64.
+
+    Las dos corridas usan la misma malla y el mismo método, así que su
+    diferencia es solo el error de redondeo de float32 (el de truncamiento
+    es igual en ambas).
+
+    PARÁMETROS:
+    -----------
+    metodo : función
+        Un método con opción dtype: rk4_sistema_np,
+        adams_bashforth_moulton_sistema o integrar_ensamble.
+
+    f, x0, y0, h, x_final :
+        Argumentos del método (y0 es el vector o el lote inicial).
+
+    **opciones :
+        Argumentos extra para el método (por ejemplo parametros=P o
+        metodo="euler" para integrar_ensamble).
+
+    RETORNA:
+    --------
+    info : dict
+        "error_absoluto":  max |y32 - y64| sobre toda la trayectoria
+        "error_relativo":  error_absoluto / max |y64|
+        "digitos":         dígitos significativos que conserva float32
+                           (-log10 del error relativo)
+        "error_final":     max |y32 - y64| en el último punto
+        "bytes_float32", "bytes_float64": tamaño de cada trayectoria
+        "tiempo_float32", "tiempo_float64": segundos de cada corrida
+    """
+    corridas = {}
+    for dtype in (np.float32, np.float64):
+        inicio = time.perf_counter()
+        _, y = metodo(f, x0, y0, h, x_final, dtype=dtype, **opciones)[:2]
+        corridas[dtype] = (y, time.perf_counter() - inicio)
+
+    (y32, tiempo32), (y64, tiempo64) = corridas[np.float32], corridas[np.float64]
+    diferencia = np.abs(y32.astype(np.float64) - y64)
+    error_absoluto = float(diferencia.max())
+    escala = float(np.abs(y64).max())
+    error_relativo = error_absoluto / escala if escala > 0 else error_absoluto
+    return {
+        "error_absoluto": error_absoluto,
+        "error_relativo": error_relativo,
+        "digitos": -math.log10(error_relativo) if error_relativo > 0 else math.inf,
+        "error_final": float(diferencia[-1].max()),
+        "bytes_float32": y32.nbytes,
+        "bytes_float64": y64.nbytes,
+        "tiempo_float32": tiempo32,
+        "tiempo_float64": tiempo64,
+    }
@@ -0,0 +1,226 @@
+"""
+Compilador de expresiones a funciones f(t, y) vectorizadas con NumPy.
+
+En p1..p5 el lado derecho de cada EDO es una función de Python escrita a
+mano, y en p5 además pasa por el cierre de crear_funcion_pendulo. Aquí el
+problema se declara como texto:
+
+    f = compilar_rhs({"theta": "omega",
+                      "omega": "-(g/l)*sin(theta)"},
+                     parametros={"g": 32.0, "l": 3.0})
+
+    t, y = rk4_sistema_np(f, 0, [1.0, 2.0], 0.01, 10)
+
+Las expresiones se analizan una sola vez con ast, se validan (solo números,
+variables del estado, parámetros, el tiempo y funciones matemáticas), las
+subexpresiones que solo dependen de parámetros fijos (como g/l) se evalúan
+al compilar, las que se repiten se calculan una sola vez en variables
+temporales y todo se genera como UNA función de Python que opera sobre
+arreglos de NumPy. El código generado queda en f.fuente. En los sistemas
+la derivada tiene el mismo tipo que el estado (float32 o float64).
+
+Si parametros es una lista de nombres en lugar de un diccionario, la
+función tiene la firma f(t, Y, P) de integrar_ensamble: Y tiene forma
+(n_trayectorias, n_estado) y la columna k de P es el parámetro k.
+"""
+
+import ast
+
+import numpy as np
+
+
+# Funciones y constantes que pueden aparecer en las expresiones
+_FUNCIONES = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "abs": np.abs,
+}
+_CONSTANTES = {"pi": np.pi, "e": np.e}
+
+_NODOS_PERMITIDOS = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Constant,
+    ast.Load, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod,
+    ast.FloorDiv, ast.USub, ast.UAdd,
+)
+
+
+def _analizar(texto, nombres):
+    """Convierte el texto en un árbol ast y verifica que sea una expresión válida."""
+    try:
+        arbol = ast.parse(str(texto), mode="eval")
+    except SyntaxError as error:
+        raise ValueError(f"Expresión inválida {texto!r}: {error.msg}") from None
+
+    for nodo in ast.walk(arbol):
+        if not isinstance(nodo, _NODOS_PERMITIDOS):
+            raise ValueError(f"{type(nodo).__name__} no está permitido en {texto!r}")
+        if isinstance(nodo, ast.Constant) and not isinstance(nodo.value, (int, float)):
+            raise ValueError(f"Solo se permiten constantes numéricas en {texto!r}")
+        if isinstance(nodo, ast.Call):
+            if (not isinstance(nodo.func, ast.Name) or nodo.func.id not in _FUNCIONES
+                    or nodo.keywords):
+                raise ValueError(f"Llamada no permitida en {texto!r}")
+        elif isinstance(nodo, ast.Name) and nodo.id not in nombres and not (
+                nodo.id in _FUNCIONES or nodo.id in _CONSTANTES):
+            raise ValueError(f"Nombre desconocido {nodo.id!r} en {texto!r}")
+    return arbol.body
+
+
+def _es_trivial(nodo):
+    return isinstance(nodo, (ast.Name, ast.Constant)) or (
+        isinstance(nodo, ast.UnaryOp) and isinstance(nodo.operand, ast.Constant))
+
+
+def _plegar_constantes(arboles, constantes):
+    """
+    Plegado de constantes. Cada subárbol no trivial que solo usa números,
+    parámetros fijos, pi/e y funciones matemáticas (como g/l) se evalúa una
+    sola vez aquí y se reemplaza por una constante _cK. Retorna
+    (valores, arboles), con valores = {"_cK": valor}. Un subárbol cuya
+    evaluación falla se deja como está (el error aparecerá al llamar f).
+    """
+    fijos = set(constantes) | set(_CONSTANTES) | set(_FUNCIONES)
+    espacio = {**_FUNCIONES, **_CONSTANTES, **constantes}
+    valores = {}
+    asignadas = {}
+
+    class Plegado(ast.NodeTransformer):
+        def visit(self, nodo):
+            if (isinstance(nodo, ast.expr) and not _es_trivial(nodo)
+                    and all(n.id in fijos for n in ast.walk(nodo) if isinstance(n, ast.Name))):
+                clave = ast.dump(nodo, annotate_fields=False)
+                if clave not in asignadas:
+                    expresion = ast.fix_missing_locations(ast.Expression(nodo))
+                    try:
+                        valor = eval(compile(expresion, "<compilar_rhs>", "eval"), dict(espacio))
+                    except (ArithmeticError, ValueError):
+                        return self.generic_visit(nodo)
+                    asignadas[clave] = f"_c{len(valores)}"
+                    # Como escalar de Python, para no promover float32 a float64
+                    valores[asignadas[clave]] = valor.item() if isinstance(valor, np.generic) else valor
+                return ast.Name(id=asignadas[clave], ctx=ast.Load())
+            return self.generic_visit(nodo)
+
+    arboles = [Plegado().visit(arbol) for arbol in arboles]
+    return valores, arboles
+
+
+def _eliminar_subexpresiones(arboles):
+    """
+    Eliminación de subexpresiones comunes. Cada subárbol no trivial que
+    aparece más de una vez (en la misma ecuación o en varias) se calcula una
+    sola vez en una variable temporal _sK. Retorna (temporales, arboles),
+    con las temporales en orden de dependencia.
+    """
+    def clave(nodo):
+        return ast.dump(nodo, annotate_fields=False)
+
+    es_trivial = _es_trivial
+
+    conteo = {}
+    for arbol in arboles:
+        for nodo in ast.walk(arbol):
+            if isinstance(nodo, ast.expr) and not es_trivial(nodo):
+                conteo[clave(nodo)] = conteo.get(clave(nodo), 0) + 1
+
+    temporales = []
+    asignadas = {}
+
+    class Reemplazo(ast.NodeTransformer):
+        def generic_visit(self, nodo):
+            original = clave(nodo) if isinstance(nodo, ast.expr) else None
+            nodo = super().generic_visit(nodo)
+            if original is None or es_trivial(nodo) or conteo.get(original, 0) < 2:
+                return nodo
+            if original not in asignadas:
+                asignadas[original] = f"_s{len(temporales)}"
+                temporales.append((asignadas[original], nodo))
+            return ast.Name(id=asignadas[original], ctx=ast.Load())
+
+    arboles = [Reemplazo().visit(arbol) for arbol in arboles]
+    return temporales, arboles
+
+
+def compilar_rhs(ecuaciones, estado="y", parametros=None, tiempo="t"):
+    """
+    Compila las ecuaciones en una sola función vectorizada.
+
+    PARÁMETROS:
+    -----------
+    ecuaciones : str o dict
+        - str: problema escalar, por ejemplo "(x + y - 1)**2". La función
+          resultante es f(t, y) como en rk4 (y también acepta arreglos).
+        - dict {variable: expresión}: sistema; el orden de las claves es el
+          orden del vector de estado. La función retorna un numpy.ndarray.
+
+    estado : str
+        Nombre de la variable de estado en el caso escalar.
+
+    parametros : dict o list, opcional
+        - dict {nombre: valor}: constantes fijas del problema.
+        - list [nombre, ...]: parámetros por trayectoria; la función tiene
+          entonces la firma f(t, Y, P) de integrar_ensamble.
+
+    tiempo : str
+        Nombre de la variable independiente ("t", "x", ...).
+
+    RETORNA:
+    --------
+    f : función compilada, con el código generado en f.fuente.
+    """
+    escalar = isinstance(ecuaciones, str)
+    variables = [estado] if escalar else list(ecuaciones)
+    expresiones = [ecuaciones] if escalar else [ecuaciones[v] for v in variables]
+
+    por_trayectoria = isinstance(parametros, (list, tuple))
+    constantes = {} if parametros is None or por_trayectoria else dict(parametros)
+    nombres_parametros = list(parametros) if por_trayectoria else list(constantes)
+
+    nombres = set(variables) | set(nombres_parametros) | {tiempo}
+    if len(nombres) != len(variables) + len(nombres_parametros) + 1:
+        raise ValueError("Las variables, los parámetros y el tiempo deben tener nombres distintos")
+    for nombre in nombres:
+        if not nombre.isidentifier() or nombre.startswith("_"):
+            raise ValueError(f"Nombre inválido {nombre!r}")
+
+    arboles = [_analizar(texto, nombres) for texto in expresiones]
+    plegadas, arboles = _plegar_constantes(arboles, constantes)
+    temporales, arboles = _eliminar_subexpresiones(arboles)
+
+    # ----- Generación del código -----
+    if por_trayectoria:
+        lineas = [f"def _rhs({tiempo}, _Y, _P):"]
+    else:
+        lineas = [f"def _rhs({tiempo}, {'_Y' if not escalar else estado}):"]
+
+    if not escalar or por_trayectoria:
+        lineas.append("    _Y = _np.asarray(_Y)")
+    if not escalar:
+        for i, variable in enumerate(variables):
+            lineas.append(f"    {variable} = _Y[..., {i}]")
+    elif por_trayectoria:
+        lineas.append(f"    {estado} = _Y[..., 0]")
+    if por_trayectoria:
+        for k, nombre in enumerate(nombres_parametros):
+            lineas.append(f"    {nombre} = _P[:, {k}]")
+
+    for nombre, arbol in temporales:
+        lineas.append(f"    {nombre} = {ast.unparse(arbol)}")
+
+    if escalar and not por_trayectoria:
+        lineas.append(f"    return {ast.unparse(arboles[0])}")
+    else:
+        # Mismo tipo que el estado (float32 se queda en float32; enteros pasan a float)
+        lineas.append("    _dY = _np.empty_like(_Y, dtype=_np.result_type(_Y, 0.0))")
+        for i, arbol in enumerate(arboles):
+            lineas.append(f"    _dY[..., {i}] = {ast.unparse(arbol)}")
+        lineas.append("    return _dY")
+    fuente = "\n".join(lineas) + "\n"
+
+    espacio = {"_np": np, **_FUNCIONES, **_CONSTANTES, **constantes, **plegadas}
+    exec(compile(fuente, "<compilar_rhs>", "exec"), espacio)
+    f = espacio["_rhs"]
+    f.fuente = fuente
+    return f
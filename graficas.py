@@ -0,0 +1,202 @@
+"""
+Gráficas bajo demanda y sin ventana.
+
+matplotlib solo se importa cuando de verdad se va a graficar, y todas las
+figuras de una corrida se dibujan juntas al final: en pantalla con un solo
+plt.show() o, en modo sin ventana (backend Agg), directo a archivos
+PNG/SVG/PDF.
+
+    plt = pyplot(sin_ventana=carpeta is not None)
+    fig = plt.figure()
+    ...
+    renderizar({"p4_h0.5": fig}, carpeta="graficas", formatos=("png", "svg"))
+
+Desde la línea de comandos (p4.py, p5.py):
+
+    python p5.py                          # ventanas
+    python p5.py --salida graficas        # PNG en graficas/, sin ventana
+    python p5.py --sin-graficas           # no importa matplotlib
+
+Antes de dibujar, reducir_puntos deja a lo sumo unos pocos puntos por
+píxel del eje (mínimo y máximo de cada grupo, o LTTB), así que una
+trayectoria de millones de pasos no se le pasa entera a matplotlib:
+
+    ax.plot(*reducir_puntos(t, theta, puntos_por_eje(ax)))
+"""
+
+import os
+
+import numpy as np
+
+
+FORMATOS = ("png", "svg", "pdf")
+
+
+def pyplot(sin_ventana=False):
+    """
+    Importa y retorna matplotlib.pyplot. Con sin_ventana=True se fija antes
+    el backend no interactivo Agg (no necesita pantalla ni toolkit gráfico).
+    """
+    import matplotlib
+    if sin_ventana:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def renderizar(figuras, carpeta=None, formatos=("png",), dpi=120):
+    """
+    Dibuja todas las figuras de una corrida de una sola vez.
+
+    PARÁMETROS:
+    -----------
+    figuras : dict
+        {nombre: matplotlib.figure.Figure}. El nombre es el del archivo
+        (sin extensión).
+
+    carpeta : str, opcional
+        Si se da, cada figura se guarda en carpeta/<nombre>.<formato> y se
+        cierra. Si es None, se muestran todas con un solo plt.show().
+
+    formatos : tuple
+        Formatos de archivo ("png", "svg" y/o "pdf").
+
+    dpi : int
+        Resolución de los formatos de mapa de bits.
+
+    RETORNA:
+    --------
+    rutas : list
+        Archivos escritos (vacía si las figuras se mostraron en pantalla).
+    """
+    formatos = tuple(formatos)
+    for formato in formatos:
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato no soportado: {formato!r}. Disponibles: {FORMATOS}")
+
+    plt = pyplot(sin_ventana=carpeta is not None)
+    if carpeta is None:
+        if figuras:
+            plt.show()
+        return []
+
+    os.makedirs(carpeta, exist_ok=True)
+    rutas = []
+    for nombre, figura in figuras.items():
+        for formato in formatos:
+            ruta = os.path.join(carpeta, f"{nombre}.{formato}")
+            figura.savefig(ruta, dpi=dpi)
+            rutas.append(ruta)
+        plt.close(figura)
+    return rutas
+
+
+def opciones_graficas(parser):
+    """Agrega --sin-graficas, --salida y --formatos a un argparse.ArgumentParser."""
+    parser.add_argument("--sin-graficas", action="store_true",
+                        help="no graficar (matplotlib no se importa)")
+    parser.add_argument("--salida", default=None,
+                        help="carpeta donde guardar las gráficas sin abrir ventanas")
+    parser.add_argument("--formatos", nargs="+", default=["png"], choices=FORMATOS,
+                        help="formatos de archivo con --salida (por defecto png)")
+    return parser
+
+
+# ============================================
+# REDUCCIÓN DE PUNTOS PARA GRAFICAR
+# ============================================
+
+def puntos_por_eje(ax, por_pixel=2):
+    """Cantidad de puntos que vale la pena dibujar en ax: por_pixel por píxel de ancho."""
+    return max(4, int(por_pixel * ax.bbox.width))
+
+
+def reducir_puntos(x, y, max_puntos=4000, metodo="minmax"):
+    """
+    Reduce una curva a lo sumo a max_puntos puntos antes de graficarla,
+    conservando su forma visible.
+
+    Los puntos se agrupan por índice (el orden de la integración), así que
+    también sirve para curvas paramétricas como el retrato de fase.
+
+    PARÁMETROS:
+    -----------
+    x, y : array_like, forma (n,)
+        Puntos de la curva.
+
+    max_puntos : int
+        Número máximo de puntos del resultado.
+
+    metodo : str
+        "minmax": en cada grupo se guardan el punto con el y mínimo y el
+                  de y máximo, en su orden original. Conserva exactamente
+                  los picos y, con ellos, los cruces por cero.
+        "lttb":   Largest-Triangle-Three-Buckets: un punto por grupo, el
+                  que forma el triángulo de mayor área con el punto
+                  elegido en el grupo anterior y el promedio del siguiente.
+                  Se ve más suave; sirve para curvas paramétricas (usa x e
+                  y a la vez).
+
+    RETORNA:
+    --------
+    x_reducido, y_reducido : numpy.ndarray
+        Incluyen siempre el primer y el último punto. Si la curva ya tiene
+        max_puntos o menos, se retorna tal cual.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if max_puntos < 4:
+        raise ValueError("max_puntos debe ser al menos 4")
+    if n <= max_puntos:
+        return x, y
+    if metodo == "minmax":
+        indices = _indices_minmax(y, (max_puntos - 2) // 2)
+    elif metodo == "lttb":
+        indices = _indices_lttb(x, y, max_puntos)
+    else:
+        raise ValueError(f"metodo debe ser 'minmax' o 'lttb', no {metodo!r}")
+    return x[indices], y[indices]
+
+
+def _indices_minmax(y, n_grupos):
+    """Índices del mínimo y el máximo de cada grupo (más los extremos), ordenados."""
+    n = len(y)
+    interior = y[1:-1]
+    tam = -(-len(interior) // n_grupos)
+    # Se completa el último grupo repitiendo su último valor
+    relleno = np.pad(interior, (0, n_grupos * tam - len(interior)), mode="edge")
+    grupos = relleno.reshape(n_grupos, tam)
+    inicio = np.arange(n_grupos) * tam
+    minimos = np.minimum(inicio + grupos.argmin(axis=1), len(interior) - 1)
+    maximos = np.minimum(inicio + grupos.argmax(axis=1), len(interior) - 1)
+    indices = np.concatenate(([0], minimos + 1, maximos + 1, [n - 1]))
+    return np.unique(indices)
+
+
+def _indices_lttb(x, y, max_puntos):
+    """Índices elegidos por Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    x = x.astype(float)
+    y = y.astype(float)
+    # Bordes de los max_puntos - 2 grupos interiores
+    bordes = np.linspace(1, n - 1, max_puntos - 1).astype(int)
+    indices = np.empty(max_puntos, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    elegido = 0
+    for k in range(max_puntos - 2):
+        a, b = bordes[k], bordes[k + 1]
+        # Promedio del grupo siguiente (el último punto si no hay más grupos)
+        if k + 2 < len(bordes):
+            c, d = bordes[k + 1], bordes[k + 2]
+            x_sig, y_sig = x[c:d].mean(), y[c:d].mean()
+        else:
+            x_sig, y_sig = x[-1], y[-1]
+        # Área (al doble) del triángulo con el punto elegido y ese promedio
+        area = np.abs((x[elegido] - x_sig) * (y[a:b] - y[elegido])
+                      - (x[elegido] - x[a:b]) * (y_sig - y[elegido]))
+        elegido = a + int(area.argmax())
+        indices[k + 1] = elegido
+    return indices
@@ -0,0 +1,342 @@
+"""
+Corre en lote los problemas de p1..p5 desde la línea de comandos.
+
+Cada problema está declarado como datos en PROBLEMAS: la ecuación y la
+solución analítica como texto (se compilan con compilar_rhs), la
+condición inicial, el intervalo, los pasos, los métodos y, opcionalmente,
+"opciones" extra para los métodos (como en barrido, sin las que cambian la
+forma de la salida: guardar_cada, t_eval, eventos ni densa). Cada corrida
+(problema, caso, método, h) se reparte en un proceso distinto, salvo que
+el lote sea pequeño (menos de MIN_FILAS_PARALELO filas en total, como en
+barrido): entonces corre en serie en el proceso actual.
+
+    python main.py                          # todos los problemas
+    python main.py p1 p4 --h 0.1 0.05       # algunos, con otros pasos
+    python main.py --no-plot --output-dir resultados
+    python main.py --listar
+    python main.py p5 --comparar-precision  # float32 contra float64
+
+Con --output-dir se guarda una tabla CSV por corrida (con los errores si
+hay solución analítica) y una gráfica por problema, sin abrir ventanas.
+Con --no-plot matplotlib no se importa. Con --comparar-precision cada
+corrida se repite con la versión de arreglos del método (rk4_sistema_np,
+adams_bashforth_moulton_sistema o integrar_ensamble con un lote de una
+trayectoria) en float32 y en float64, y se reporta cuánto se pierde.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import solvers
+from convergencia import comparar_precision
+from expresiones import compilar_rhs
+from barrido import MIN_FILAS_PARALELO, validar_opciones
+from graficas import FORMATOS
+
+
+# ============================================
+# REGISTRO DE PROBLEMAS
+# ============================================
+
+PROBLEMAS = {
+    "p1": {
+        "descripcion": "y' = (x + y - 1)², y(0) = 2",
+        "ecuacion": "(x + y - 1)**2",
+        "tiempo": "x",
+        "y0": 2.0,
+        "intervalo": (0.0, 0.5),
+        "h": [0.1, 0.05],
+        "metodos": ["euler", "euler_mejorado"],
+        "analitica": "tan(x + pi/4) - x + 1",
+    },
+    "p2": {
+        "descripcion": "y' = (x + y - 1)², y(0) = 2 (RK4)",
+        "ecuacion": "(x + y - 1)**2",
+        "tiempo": "x",
+        "y0": 2.0,
+        "intervalo": (0.0, 0.5),
+        "h": [0.1],
+        "metodos": ["rk4"],
+        "analitica": "tan(x + pi/4) - x + 1",
+    },
+    "p3": {
+        "descripcion": "y' = 2x - 3y + 1, y(0) = 1 (ABM con arranque RK4)",
+        "ecuacion": "2*x - 3*y + 1",
+        "tiempo": "x",
+        "y0": 1.0,
+        "intervalo": (0.0, 0.8),
+        "h": [0.2],
+        "metodos": ["adams_bashforth_moulton"],
+        "analitica": "(2/3)*x + 1/9 + (8/9)*exp(-3*x)",
+    },
+    "p4": {
+        "descripcion": "dA/dt = A(2.128 - 0.0432A), A(0) = 0.24",
+        "ecuacion": "A*(2.128 - 0.0432*A)",
+        "tiempo": "t",
+        "estado": "A",
+        "y0": 0.24,
+        "intervalo": (0.0, 10.0),
+        "h": [0.5],
+        "metodos": ["rk4"],
+        "analitica": "49.25925925925926/(1 + 204.2469135802469*exp(-2.128*t))",
+    },
+    "p5": {
+        "descripcion": "θ'' + (g/l)sen(θ) = 0, θ(0) = 1, θ'(0) = 2",
+        "ecuacion": {"theta": "omega", "omega": "-(g/l)*sin(theta)"},
+        "tiempo": "t",
+        "y0": [1.0, 2.0],
+        "intervalo": (0.0, 10.0),
+        "h": [0.01],
+        "metodos": ["rk4_sistema_np"],
+        "casos": {"Tierra": {"g": 32.0, "l": 3.0},
+                  "Luna": {"g": 0.165 * 32.0, "l": 3.0}},
+    },
+}
+
+METODOS = {
+    "euler": solvers.euler,
+    "euler_mejorado": solvers.euler_mejorado,
+    "rk4": solvers.rk4,
+    "adams_bashforth_moulton": solvers.adams_bashforth_moulton,
+    "rk4_sistema": solvers.rk4_sistema,
+    "rk4_sistema_np": solvers.rk4_sistema_np,
+    "adams_bashforth_moulton_sistema": solvers.adams_bashforth_moulton_sistema,
+}
+
+
+def _metodo(nombre):
+    """Función de un método por nombre; las demás tablas de Butcher usan runge_kutta."""
+    if nombre in METODOS:
+        return METODOS[nombre]
+    if nombre in solvers.TABLAS_BUTCHER:
+        def metodo(f, x0, y0, h, x_final, **opciones):
+            return solvers.runge_kutta(f, x0, y0, h, x_final, nombre, **opciones)
+        return metodo
+    raise ValueError(f"Método desconocido: {nombre!r}")
+
+
+# ============================================
+# CORRIDAS
+# ============================================
+
+def _compilar(problema, caso):
+    """f(t, y) y la solución analítica (o None) de un problema del registro."""
+    datos = PROBLEMAS[problema]
+    parametros = datos.get("casos", {}).get(caso)
+    estado = datos.get("estado", "y")
+    f = compilar_rhs(datos["ecuacion"], estado=estado, parametros=parametros,
+                     tiempo=datos["tiempo"])
+    if datos.get("analitica") is None:
+        return f, None
+    # Se compila como un lado derecho que no usa el estado
+    g = compilar_rhs(datos["analitica"], estado=estado, tiempo=datos["tiempo"])
+
+    def analitica(x):
+        return g(x, None)
+    return f, analitica
+
+
+def _correr(problema, caso, metodo, h):
+    """
+    Una corrida, en el proceso trabajador. Como las funciones compiladas no
+    se pueden enviar entre procesos, cada trabajador compila el problema a
+    partir de sus datos.
+    """
+    f, analitica = _compilar(problema, caso)
+    x0, x_final = PROBLEMAS[problema]["intervalo"]
+    inicio = time.perf_counter()
+    opciones = PROBLEMAS[problema].get("opciones", {})
+    x, y = _metodo(metodo)(f, x0, PROBLEMAS[problema]["y0"], h, x_final, **opciones)
+    segundos = time.perf_counter() - inicio
+    y_real = None if analitica is None else np.broadcast_to(analitica(x), np.shape(x)).astype(float)
+    return {"problema": problema, "caso": caso, "metodo": metodo, "h": h,
+            "x": np.asarray(x), "y": np.asarray(y), "y_real": y_real, "segundos": segundos}
+
+
+def _precision(problema, caso, metodo, h):
+    """Una corrida en float32 contra float64 con la versión de arreglos del método."""
+    f, _ = _compilar(problema, caso)
+    x0, x_final = PROBLEMAS[problema]["intervalo"]
+    y0 = np.atleast_1d(np.asarray(PROBLEMAS[problema]["y0"], dtype=float))
+    if metodo in ("rk4_sistema", "rk4_sistema_np"):
+        info = comparar_precision(solvers.rk4_sistema_np, f, x0, y0, h, x_final)
+    elif metodo in ("adams_bashforth_moulton", "adams_bashforth_moulton_sistema"):
+        info = comparar_precision(solvers.adams_bashforth_moulton_sistema, f, x0, y0, h, x_final)
+    else:
+        # Lote de una sola trayectoria: f recibe el estado con forma (1, m)
+        info = comparar_precision(solvers.integrar_ensamble, f, x0, y0[np.newaxis], h,
+                                  x_final, metodo=metodo)
+    return {"problema": problema, "caso": caso, "metodo": metodo, "h": h, **info}
+
+
+def tareas(problemas, hs=None):
+    """Lista de corridas (problema, caso, método, h) de los problemas pedidos."""
+    lista = []
+    for problema in problemas:
+        datos = PROBLEMAS[problema]
+        # Antes de repartir: en el trabajador fallaría al desempacar (x, y)
+        validar_opciones(datos.get("opciones", {}))
+        for caso in datos.get("casos", {None: None}):
+            for metodo in datos["metodos"]:
+                for h in hs or datos["h"]:
+                    lista.append((problema, caso, metodo, h))
+    return lista
+
+
+def _filas(problema, caso, metodo, h):
+    """Puntos de la malla de una corrida (n_pasos + 1)."""
+    x0, x_final = PROBLEMAS[problema]["intervalo"]
+    return solvers._numero_pasos(x0, h, x_final) + 1
+
+
+def ejecutar(lista, max_procesos=None, corrida=_correr, min_filas_paralelo=MIN_FILAS_PARALELO):
+    """
+    Corre las tareas en paralelo y devuelve los resultados en orden. Como en
+    barrido, se ejecutan en serie en este proceso si hay un solo proceso,
+    una sola tarea o menos de min_filas_paralelo filas en total.
+    """
+    procesos = min(max_procesos or os.cpu_count() or 1, len(lista))
+    if procesos <= 1 or sum(_filas(*tarea) for tarea in lista) < min_filas_paralelo:
+        return [corrida(*tarea) for tarea in lista]
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [pool.submit(corrida, *tarea) for tarea in lista]
+        return [futuro.result() for futuro in futuros]
+
+
+# ============================================
+# SALIDA
+# ============================================
+
+def _etiqueta(resultado):
+    caso = f" {resultado['caso']}" if resultado["caso"] else ""
+    return f"{resultado['problema']}{caso} {resultado['metodo']} h={resultado['h']:g}"
+
+
+def imprimir_resumen(resultados):
+    print(f"{'Corrida':<44} {'Puntos':>8} {'y final':>14} {'Error final':>12} {'Tiempo':>10}")
+    print("-" * 92)
+    for r in resultados:
+        y_final = np.ravel(r["y"][-1])
+        texto_y = f"{y_final[0]:.6f}" if y_final.size == 1 else f"[{y_final[0]:.4f}, …]"
+        error = "" if r["y_real"] is None else f"{abs(r['y_real'][-1] - r['y'][-1]):.2e}"
+        print(f"{_etiqueta(r):<44} {len(r['x']):>8} {texto_y:>14} {error:>12} "
+              f"{r['segundos'] * 1e3:>8.2f}ms")
+
+
+def imprimir_precision(comparaciones):
+    print(f"{'Corrida':<44} {'Error abs':>10} {'Error rel':>10} {'Dígitos':>8} "
+          f"{'Memoria 32/64':>15} {'Tiempo 32/64':>16}")
+    print("-" * 108)
+    for c in comparaciones:
+        memoria = f"{c['bytes_float32'] / 1024:.1f}/{c['bytes_float64'] / 1024:.1f} KiB"
+        tiempos = f"{c['tiempo_float32'] * 1e3:.1f}/{c['tiempo_float64'] * 1e3:.1f}ms"
+        print(f"{_etiqueta(c):<44} {c['error_absoluto']:>10.2e} {c['error_relativo']:>10.2e} "
+              f"{c['digitos']:>8.1f} {memoria:>15} {tiempos:>16}")
+
+
+def guardar_tablas(resultados, carpeta):
+    """Una tabla CSV por corrida: la de errores si hay solución analítica."""
+    import pandas as pd
+    from reportes import exportar_tabla, tabla_errores
+
+    os.makedirs(carpeta, exist_ok=True)
+    rutas = []
+    for r in resultados:
+        nombre = _etiqueta(r).replace(" h=", "_h").replace(" ", "_")
+        if r["y_real"] is not None:
+            valores = r["y_real"]
+            tabla = tabla_errores(r["x"], {f"yn_{r['metodo']}": r["y"]},
+                                  lambda x: valores, nombres_error=[r["metodo"]])
+        else:
+            columnas = PROBLEMAS[r["problema"]]["ecuacion"]
+            y = r["y"].reshape(len(r["x"]), -1)
+            nombres = list(columnas) if isinstance(columnas, dict) else ["y"]
+            tabla = pd.DataFrame({"xn": r["x"], **{n: y[:, k] for k, n in enumerate(nombres)}})
+        ruta = os.path.join(carpeta, f"{nombre}.csv")
+        exportar_tabla(tabla, ruta)
+        rutas.append(ruta)
+    return rutas
+
+
+def graficar(resultados, carpeta=None, formatos=("png",)):
+    """Una figura por problema con todas sus corridas (y la analítica)."""
+    from graficas import puntos_por_eje, pyplot, reducir_puntos, renderizar
+
+    plt = pyplot(sin_ventana=carpeta is not None)
+    figuras = {}
+    for problema in dict.fromkeys(r["problema"] for r in resultados):
+        fig, ax = plt.subplots(figsize=(8, 5))
+        n_puntos = puntos_por_eje(ax)
+        for r in (r for r in resultados if r["problema"] == problema):
+            y = r["y"].reshape(len(r["x"]), -1)
+            ax.plot(*reducir_puntos(r["x"], y[:, 0], n_puntos), "-", label=_etiqueta(r))
+            if r["y_real"] is not None:
+                ax.plot(*reducir_puntos(r["x"], r["y_real"], n_puntos), "k--", linewidth=0.8)
+        ax.set_title(f"{problema}: {PROBLEMAS[problema]['descripcion']}")
+        ax.set_xlabel(PROBLEMAS[problema]["tiempo"])
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+        fig.tight_layout()
+        figuras[problema] = fig
+    return renderizar(figuras, carpeta, formatos)
+
+
+# ============================================
+# LÍNEA DE COMANDOS
+# ============================================
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Corre los problemas p1..p5 en paralelo")
+    parser.add_argument("problemas", nargs="*", metavar="problema",
+                        help=f"problemas a correr (por defecto todos: {', '.join(PROBLEMAS)})")
+    parser.add_argument("--h", nargs="+", type=float,
+                        help="pasos a usar en lugar de los de cada problema")
+    parser.add_argument("--no-plot", "--sin-graficas", dest="sin_graficas", action="store_true",
+                        help="no graficar (matplotlib no se importa)")
+    parser.add_argument("--output-dir", "--salida", dest="salida",
+                        help="carpeta para las tablas CSV y las gráficas (sin ventanas)")
+    parser.add_argument("--formatos", nargs="+", default=["png"], choices=FORMATOS,
+                        help="formatos de las gráficas con --output-dir")
+    parser.add_argument("--procesos", type=int,
+                        help="número de procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--comparar-precision", action="store_true",
+                        help="comparar cada corrida en float32 contra float64")
+    parser.add_argument("--listar", action="store_true", help="mostrar los problemas y salir")
+    args = parser.parse_args(argumentos)
+
+    if args.listar:
+        for nombre, datos in PROBLEMAS.items():
+            print(f"{nombre}: {datos['descripcion']}  métodos: {', '.join(datos['metodos'])}  "
+                  f"h: {datos['h']}")
+        return
+
+    desconocidos = [p for p in args.problemas if p not in PROBLEMAS]
+    if desconocidos:
+        parser.error(f"problemas desconocidos: {', '.join(desconocidos)}")
+    if args.h and any(h <= 0 for h in args.h):
+        parser.error("--h debe ser positivo")
+
+    lista = tareas(args.problemas or list(PROBLEMAS), args.h)
+    inicio = time.perf_counter()
+    resultados = ejecutar(lista, args.procesos)
+    print(f"{len(resultados)} corridas en {time.perf_counter() - inicio:.2f} s\n")
+    imprimir_resumen(resultados)
+
+    if args.comparar_precision:
+        print("\nPrecisión float32 contra float64:\n")
+        imprimir_precision(ejecutar(lista, args.procesos, corrida=_precision))
+
+    if args.salida:
+        for ruta in guardar_tablas(resultados, args.salida):
+            print(f"Tabla guardada en {ruta}")
+    if not args.sin_graficas:
+        for ruta in graficar(resultados, args.salida, args.formatos):
+            print(f"Gráfica guardada en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
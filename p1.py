@@ -1,5 +1,8 @@
-import math
+import numpy as np
 from solvers import euler, euler_mejorado
+from barrido import barrido
+from convergencia import paso_para_decimales
+from reportes import imprimir_tabla, tabla_errores
 
 """
 Considere el problema con valores iniciales  
@@ -21,60 +24,9 @@ def f(x, y):
     y_prima = (x+y-1)**2
     return y_prima
 
-def y_analitica(x: float) -> float:
-    # Solución analítica: y(x) = tan(x + pi/4) - x + 1
-    return math.tan(x + math.pi/4) - x + 1
-
-def generar_tabla(x_vals, y_euler, y_euler_mej, decimales=4, precision_porcentaje=6):
-    tabla = []
-    for i, x in enumerate(x_vals):
-        y_e = y_euler[i]
-        y_em = y_euler_mej[i]
-        y_true = y_analitica(x)
-
-        # Calcular errores absolutos
-        err_e = abs(y_true - y_e)
-        err_em = abs(y_true - y_em)
-
-        # Calcular errores relativos (porcentaje)
-        # Evitar división por cero
-        if abs(y_true) > 1e-15:
-            pct_e = (err_e / abs(y_true)) * 100.0
-            pct_em = (err_em / abs(y_true)) * 100.0
-        else:
-            pct_e = float('inf') if err_e != 0 else 0.0
-            pct_em = float('inf') if err_em != 0 else 0.0
-
-        # Crear fila con redondeo apropiado
-        fila = (
-            round(x, 8),                           # xn
-            round(y_e, decimales),                 # ynEuler
-            round(y_em, decimales),                # ynEulerMejorado
-            round(y_true, decimales),              # ValorReal
-            round(err_e, decimales),               # ErrAbs_Euler
-            round(pct_e, precision_porcentaje),    # %ErrRel_Euler
-            round(err_em, decimales),              # ErrAbs_EulerMej
-            round(pct_em, precision_porcentaje)    # %ErrRel_EulerMej
-        )
-        tabla.append(fila)
-    return tabla
-
-def imprimir_tabla(tabla, h):
-    encabezado = ("xn", "ynEuler", "ynEulerMejorado", "ValorReal",
-                  "ErrAbs_Euler", "%ErrRel_Euler", "ErrAbs_EulerMej", "%ErrRel_EulerMej")
-    
-    print(f"\n{'='*80}")
-    print(f"RESULTADOS PARA h = {h}")
-    print(f"{'='*80}")
-    
-    # Imprimir encabezado
-    print("{:<8} {:<12} {:<16} {:<12} {:<12} {:<14} {:<14} {:<14}".format(*encabezado))
-    print("-" * 80)
-    
-    # Imprimir datos
-    for fila in tabla:
-        print("{:<8.4f} {:<12.4f} {:<16.4f} {:<12.4f} {:<12.4f} {:<14.6f} {:<14.4f} {:<14.6f}".format(*fila))
-    
+def y_analitica(x):
+    # Solución analítica: y(x) = tan(x + pi/4) - x + 1 (x escalar o arreglo)
+    return np.tan(x + np.pi/4) - x + 1
 
 """ def _imprimir_resumen(tabla, h):
     #Imprime un resumen estadístico de los resultados.
@@ -124,19 +76,31 @@ def main():
     x_final = 0.5
     hs = [0.1, 0.05]
 
-    for h in hs:
+    # Aplicar métodos numéricos: todas las corridas en paralelo
+    tareas = [(metodo, f, x0, y0, h, x_final) for h in hs for metodo in (euler, euler_mejorado)]
+    resultados = barrido(tareas)
+
+    for i, h in enumerate(hs):
         print(f"\nProcesando con h = {h}...")
         
-        # Aplicar métodos numéricos
-        x_euler, y_euler = euler(f, x0, y0, h, x_final)
-        x_em, y_em = euler_mejorado(f, x0, y0, h, x_final)
+        (x_euler, y_euler), (x_em, y_em) = resultados[2*i:2*i + 2]
         x_vals = x_euler
 
-        # Generar tabla con parámetros mejorados
-        tabla = generar_tabla(x_vals, y_euler, y_em, decimales=4, precision_porcentaje=6)
+        # Tabla de errores (vectorizada) e impresión
+        tabla = tabla_errores(x_vals, {"ynEuler": y_euler, "ynEulerMejorado": y_em},
+                              y_analitica, nombres_error=["Euler", "EulerMej"])
+        imprimir_tabla(tabla, h, anchos=[8, 12, 16, 12, 12, 14, 14, 14],
+                       formatos=[".4f", ".4f", ".4f", ".4f", ".4f", ".6f", ".4f", ".6f"])
 
-        # Imprimir resultados con resumen estadístico
-        imprimir_tabla(tabla, h)
+    # h más grande que garantiza cuatro decimales (extrapolación de Richardson)
+    print(f"\n{'='*80}")
+    print("h AUTOMÁTICO PARA CUATRO DECIMALES")
+    print(f"{'='*80}")
+    for nombre, metodo in (("Euler", euler), ("Euler Mejorado", euler_mejorado)):
+        x_h, y_h, info = paso_para_decimales(metodo, f, x0, y0, x_final, decimales=4)
+        print(f"{nombre:<16} h = {info['h']:.6g}  y({x_final}) ≈ {y_h[-1]:.4f}  "
+              f"orden observado = {info['orden_observado']:.2f}  "
+              f"evaluaciones de f = {info['evaluaciones']} ({info['evaluaciones_totales']} en total)")
     
     print(f"\n🎉 ¡Análisis completado!")
 
@@ -1,5 +1,7 @@
-import math
+import numpy as np
 from solvers import rk4
+from barrido import barrido
+from reportes import imprimir_tabla, tabla_errores
 
 # Parámetros del problema
 x0 = 0.0
@@ -10,56 +12,9 @@ def f(x, y):
     y_prima = (x+y-1)**2
     return y_prima
 
-def y_analitica(x: float) -> float:
-    # Solución analítica: y(x) = tan(x + pi/4) - x + 1
-    return math.tan(x + math.pi/4) - x + 1
-
-def generar_tabla(x_vals, y_RK4, decimales=4, precision_porcentaje=4):
-    tabla = []
-    for i, x in enumerate(x_vals):
-        y_rk4 = y_RK4[i]
-        y_true = y_analitica(x)
-
-        # Calcular errores absolutos
-        err_rk4 = abs(y_true - y_rk4)
-
-        # Calcular errores relativos (porcentaje)
-        # Evitar división por cero
-        if abs(y_true) > 1e-15:
-            pct_rk4 = (err_rk4 / abs(y_true)) * 100.0
-        else:
-            pct_rk4 = float('inf') if err_rk4 != 0 else 0.0
-
-        # Crear fila con redondeo apropiado
-        fila = (
-            round(x, 1),                           # xn
-            round(y_rk4, decimales),                 # ynRK4
-            round(y_true, decimales),              # ValorReal
-            round(err_rk4, decimales),               # ErrAbs_RK4
-            round(pct_rk4, precision_porcentaje),    # %ErrRel_RK4
-            # x,
-            # y_rk4,
-            # y_true,
-            # err_rk4,
-            # pct_rk4
-        )
-        tabla.append(fila)
-    return tabla
-
-def imprimir_tabla(tabla, h):
-    encabezado = ("xn", "yn_RK4", "ValorReal","ErrAbs_RK4", "%ErrRel_RK4")
-    
-    print(f"\n{'='*80}")
-    print(f"RESULTADOS PARA h = {h}")
-    print(f"{'='*80}")
-    
-    # Imprimir encabezado
-    print("{:<6} {:<12} {:<16} {:<12} {:<12}".format(*encabezado))
-    print("-" * 80)
-    
-    # Imprimir datos
-    for fila in tabla:
-        print("{:<6} {:<12.4f} {:<16.4f} {:<12.4f} {:<12.4f}".format(*fila))
+def y_analitica(x):
+    # Solución analítica: y(x) = tan(x + pi/4) - x + 1 (x escalar o arreglo)
+    return np.tan(x + np.pi/4) - x + 1
 
 def main():
     """
@@ -78,18 +33,18 @@ def main():
     x_final = 0.5
     hs = [0.1]
 
-    for h in hs:
+    # Aplicar métodos numéricos: todas las corridas en paralelo
+    resultados = barrido([(rk4, f, x0, y0, h, x_final) for h in hs])
+
+    for h, (x_rk4, y_rk4) in zip(hs, resultados):
         print(f"\nProcesando con h = {h}...")
         
-        # Aplicar métodos numéricos
-        x_rk4, y_rk4 = rk4(f, x0, y0, h, x_final)
         x_vals = x_rk4
 
-        # Generar tabla con parámetros mejorados
-        tabla = generar_tabla(x_vals, y_rk4, decimales=4, precision_porcentaje=6)
-
-        # Imprimir resultados con resumen estadístico
-        imprimir_tabla(tabla, h)
+        # Tabla de errores (vectorizada) e impresión
+        tabla = tabla_errores(x_vals, {"yn_RK4": y_rk4}, y_analitica, nombres_error=["RK4"])
+        imprimir_tabla(tabla, h, anchos=[6, 12, 16, 12, 12],
+                       formatos=[".1f", ".4f", ".4f", ".4f", ".4f"])
     
     print("\n🎉 ¡Análisis completado!")
 
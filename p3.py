@@ -9,7 +9,10 @@ Reporte en una tabla los valores de RK4 obtenidos y después el valor del métod
 """
 
 import math
-from solvers import rk4, adams_bashforth_moulton
+import numpy as np
+from solvers import adams_bashforth_moulton
+from continuacion import extender, iniciar_integracion
+from convergencia import paso_para_decimales
 
 # ============================================
 # CONFIGURACIÓN DEL PROBLEMA
@@ -110,18 +113,34 @@ def main():
     print("Método: ABM de orden 4 (inicialización con RK4)")
     print("="*60)
     
-    # ========== PASO 1: Calcular solo con RK4 para comparación ==========
+    # El estado de la integración se conserva entre los dos pasos: los
+    # valores de arranque con RK4 no se vuelven a calcular en el paso 2
+    estado = iniciar_integracion("adams_bashforth_moulton", x0, y0, h)
+
+    # ========== PASO 1: Valores iniciales con RK4 (arranque del ABM) ==========
     print("\n PASO 1: Calculando valores iniciales con RK4...")
-    x_rk4, y_rk4 = rk4(f, x0, y0, h, x0 + 3*h)  # Solo hasta y₃
+    x_rk4, y_rk4 = extender(estado, f, x0 + 3*h)  # Solo hasta y₃
+    x_rk4 = np.concatenate(([x0], x_rk4))
+    y_rk4 = np.concatenate(([y0], y_rk4))
     imprimir_tabla_rk4(x_rk4, y_rk4)
     
-    # ========== PASO 2: Aplicar el método completo ABM ==========
+    # ========== PASO 2: Continuar con ABM ==========
     print("\n📍 PASO 2: Aplicando método completo ABM hasta x = 0.8...")
-    x_abm, y_abm = adams_bashforth_moulton(f, x0, y0, h, x_final)
+    x_nuevos, y_nuevos = extender(estado, f, x_final)
+    x_abm = np.concatenate((x_rk4, x_nuevos))
+    y_abm = np.concatenate((y_rk4, y_nuevos))
     
     # ========== PASO 3: Mostrar resultados ==========
     imprimir_tabla_completa(x_abm, y_abm)
     imprimir_resultado_final(x_abm, y_abm)
+
+    # ========== PASO 4: h más grande que garantiza cuatro decimales ==========
+    print("\n📍 PASO 4: Buscando el h más barato para cuatro decimales...")
+    _, y_auto, info = paso_para_decimales(adams_bashforth_moulton, f, x0, y0, x_final,
+                                          decimales=4, h0=h)
+    print(f"h = {info['h']}  y(0.8) ≈ {y_auto[-1]:.4f}  "
+          f"(orden observado {info['orden_observado']:.2f}, "
+          f"{info['evaluaciones']} evaluaciones de f, {info['evaluaciones_totales']} en total)")
     
     
     print("\n🎉 ¡Análisis completado!")
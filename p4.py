@@ -4,15 +4,19 @@ Suponga que el área inicial es 0.24 centímetros cuadrados o sea A(0) = 0.24.
 Utilice algún método numérico para calcular la solución del problema en múltiples puntos del intervalo de tiempo [0,10]. 
 Trace la gráfica de la solución en ese intervalo."""
 
-import math
-from solvers import rk4
-import matplotlib.pyplot as plt
+import argparse
+
+import numpy as np
+from solvers import rk4, solucion_densa
+from barrido import barrido
+from graficas import opciones_graficas, puntos_por_eje, pyplot, reducir_puntos, renderizar
+from reportes import imprimir_tabla, tabla_errores
 
 def f(t, A):
     a_prima = A*(2.128 - 0.0432*A)
     return a_prima
 
-def y_analitica(x: float) -> float:
+def y_analitica(x):
     """
     Solución analítica del problema:
     y' = 2x - 3y + 1, y(0) = 1
@@ -21,59 +25,15 @@ def y_analitica(x: float) -> float:
     
     Esta solución se obtiene resolviendo la EDO lineal de primer orden.
     """
-    return (49.25925925925926)/ (1+204.2469135802469*math.exp(-2.128*x))
-
-
-def generar_tabla(x_vals, y_RK4, decimales=4, precision_porcentaje=4):
-    tabla = []
-    for i, x in enumerate(x_vals):
-        y_rk4 = y_RK4[i]
-        y_true = y_analitica(x)
-
-        # Calcular errores absolutos
-        err_rk4 = abs(y_true - y_rk4)
-
-        # Calcular errores relativos (porcentaje)
-        # Evitar división por cero
-        if abs(y_true) > 1e-15:
-            pct_rk4 = (err_rk4 / abs(y_true)) * 100.0
-        else:
-            pct_rk4 = float('inf') if err_rk4 != 0 else 0.0
-
-        # Crear fila con redondeo apropiado
-        fila = (
-            round(x, 1),                           # xn
-            round(y_rk4, decimales),                 # ynRK4
-            round(y_true, decimales),              # ValorReal
-            round(err_rk4, decimales),               # ErrAbs_RK4
-            round(pct_rk4, precision_porcentaje),    # %ErrRel_RK4
-            # x,
-            # y_rk4,
-            # y_true,
-            # err_rk4,
-            # pct_rk4
-        )
-        tabla.append(fila)
-    return tabla
-
-def imprimir_tabla(tabla, h):
-    encabezado = ("xn", "yn_RK4", "ValorReal","ErrAbs_RK4", "%ErrRel_RK4")
-    
-    print(f"\n{'='*80}")
-    print(f"RESULTADOS PARA h = {h}")
-    print(f"{'='*80}")
-    
-    # Imprimir encabezado
-    print("{:<6} {:<12} {:<16} {:<12} {:<12}".format(*encabezado))
-    print("-" * 80)
-    
-    # Imprimir datos
-    for fila in tabla:
-        print("{:<6} {:<12.4f} {:<16.4f} {:<12.4f} {:<12.4f}".format(*fila))
+    return (49.25925925925926)/ (1+204.2469135802469*np.exp(-2.128*x))
+
 
-def main():
+def main(graficar=True, carpeta=None, formatos=("png",)):
     """
     Función principal que ejecuta los métodos numéricos y genera reportes.
+
+    graficar=False no importa matplotlib. Con carpeta, las gráficas se
+    guardan ahí (en los formatos pedidos) sin abrir ventanas.
     """
     print("🔬 MÉTODOS NUMÉRICOS PARA ECUACIONES DIFERENCIALES")
     print("=" * 60)
@@ -89,40 +49,55 @@ def main():
     t_final = 10
     hs = [0.5]
 
-    for h in hs:
+    # Aplicar métodos numéricos: todas las corridas en paralelo
+    resultados = barrido([(rk4, f, t_inicial, A, h, t_final) for h in hs])
+    figuras = {}
+
+    for h, (x_rk4, y_rk4) in zip(hs, resultados):
         print(f"\nProcesando con h = {h}...")
         
-        # Aplicar métodos numéricos
-        x_rk4, y_rk4 = rk4(f,t_inicial, A, h, t_final)
         x_vals = x_rk4
 
-        # Generar tabla con parámetros mejorados
-        tabla = generar_tabla(x_vals, y_rk4, decimales=4, precision_porcentaje=6)
+        # Tabla de errores (vectorizada) e impresión
+        tabla = tabla_errores(x_vals, {"yn_RK4": y_rk4}, y_analitica, nombres_error=["RK4"])
+        imprimir_tabla(tabla, h, anchos=[6, 12, 16, 12, 12],
+                       formatos=[".1f", ".4f", ".4f", ".4f", ".4f"])
 
-        # Imprimir resultados con resumen estadístico
-        imprimir_tabla(tabla, h)
+        if not graficar:
+            continue
 
         # ---- GRAFICAR RESULTADOS ----
-        # Crear listas para la solución analítica
-        y_real = [y_analitica(x) for x in x_vals]
+        plt = pyplot(sin_ventana=carpeta is not None)
 
         # Crear la figura
-        plt.figure(figsize=(8, 5))
-        plt.plot(x_vals, y_rk4, 'o-', label='RK4', color='blue')
-        plt.plot(x_vals, y_real, '-', label='Analítica', color='red')
+        figuras[f"p4_h{h}"] = plt.figure(figsize=(8, 5))
+        n_puntos = puntos_por_eje(plt.gca())
+
+        # Solución continua de RK4 (Hermite): la curva entre los puntos de
+        # la malla se interpola, sin volver a integrar con un h más chico.
+        # Se evalúa con la resolución del eje y los puntos de la malla se
+        # reducen (mínimo y máximo por grupo) si son más que los píxeles
+        sol = solucion_densa(x_vals, y_rk4, f=f)
+        t_fino = np.linspace(t_inicial, t_final, n_puntos)
+
+        plt.plot(t_fino, sol(t_fino), '-', color='blue')
+        plt.plot(*reducir_puntos(x_vals, y_rk4, n_puntos), 'o', label='RK4', color='blue')
+        plt.plot(t_fino, y_analitica(t_fino), '-', label='Analítica', color='red')
         plt.title(f'Crecimiento de colonia bacteriana (h={h})')
         plt.xlabel('t (días)')
         plt.ylabel('A (cm²)')
         plt.legend()
         plt.grid(True)
         plt.tight_layout()
-        plt.show()
+
+    # Todas las figuras de una vez (ventanas o archivos)
+    if graficar:
+        for ruta in renderizar(figuras, carpeta, formatos):
+            print(f"Gráfica guardada en {ruta}")
     
     print("\n🎉 ¡Análisis completado!")
 
 if __name__ == "__main__":
-    main()
-
-# print(rk4(f,t_inicial, A, h, t_final))
-# print("Ahora analitica")
-print(y_analitica(10))
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="p4: crecimiento de una colonia de bacterias (RK4)")
+    args = opciones_graficas(parser).parse_args()
+    main(not args.sin_graficas, args.salida, args.formatos)
@@ -34,9 +34,12 @@ Condiciones iniciales:
   y₂(0) = 2 rad/s
 """
 
+import argparse
 import math
-import matplotlib.pyplot as plt
-from solvers import rk4_sistema
+import numpy as np
+from graficas import opciones_graficas, puntos_por_eje, pyplot, reducir_puntos, renderizar
+from solvers import crear_evento, integrar_ensamble, rk4_sistema, rk4_sistema_np
+from simplecticos import stormer_verlet, yoshida4
 
 # ============================================
 # PARÁMETROS DEL PROBLEMA
@@ -99,6 +102,27 @@ def sistema_pendulo(t, y, g, l):
     return [dtheta_dt, domega_dt]
 
 
+def sistema_pendulo_lote(t, Y, P):
+    """
+    Versión vectorizada de sistema_pendulo para integrar_ensamble.
+
+    Parámetros:
+    -----------
+    Y : numpy.ndarray, forma (n_trayectorias, 2)
+        Y[:, 0] = θ y Y[:, 1] = ω de cada trayectoria
+    P : numpy.ndarray, forma (n_trayectorias, 2)
+        P[:, 0] = g y P[:, 1] = l de cada trayectoria
+
+    Retorna:
+    --------
+    dY : numpy.ndarray, forma (n_trayectorias, 2)
+    """
+    dY = np.empty_like(Y)
+    dY[:, 0] = Y[:, 1]                                # dy₁/dt = y₂
+    dY[:, 1] = -(P[:, 0] / P[:, 1]) * np.sin(Y[:, 0]) # dy₂/dt = -(g/l)sen(y₁)
+    return dY
+
+
 # ============================================
 # FUNCIONES AUXILIARES
 # ============================================
@@ -114,31 +138,62 @@ def crear_funcion_pendulo(g, l):
     return f
 
 
-def calcular_periodo_aproximado(t_vals, theta_vals):
+def calcular_periodo(g, l):
     """
-    Calcula el periodo aproximado del péndulo detectando los cruces por cero.
-    
+    Calcula el periodo del péndulo detectando los cruces por cero de θ
+    como eventos durante la integración.
+
     Un periodo completo ocurre cuando el péndulo vuelve a la misma posición
-    con la misma dirección de movimiento.
+    con la misma dirección de movimiento, es decir, entre el primer y el
+    tercer cruce por cero. El evento es terminal en el tercer cruce, así que
+    la integración se detiene ahí en lugar de simular un intervalo fijo y
+    recorrer después toda la trayectoria.
     """
-    cruces = []
-    
-    # Detectar cruces por cero (cuando θ cambia de signo)
-    for i in range(1, len(theta_vals)):
-        if theta_vals[i-1] * theta_vals[i] < 0:  # Cambio de signo
-            # Interpolación lineal para encontrar el tiempo exacto del cruce
-            t_cruce = t_vals[i-1] + (t_vals[i] - t_vals[i-1]) * abs(theta_vals[i-1]) / (abs(theta_vals[i-1]) + abs(theta_vals[i]))
-            cruces.append(t_cruce)
-    
-    if len(cruces) >= 2:
-        # El periodo es el doble del tiempo entre dos cruces consecutivos
-        # (un cruce es media oscilación)
-        periodo = 2 * (cruces[1] - cruces[0])
-        return periodo
-    
+    cruce_por_cero = crear_evento(lambda t, y: y[0], terminal=3)
+    t_limite = 10 * T_FINAL  # Cota por si el péndulo nunca cruza
+
+    # Solo interesan los eventos: guardar únicamente los extremos
+    _, _, eventos = rk4_sistema(crear_funcion_pendulo(g, l), T_INICIAL,
+                                [THETA_0, OMEGA_0], H, t_limite,
+                                guardar_cada=int(t_limite / H), eventos=[cruce_por_cero])
+    cruces = eventos[0]["t"]
+
+    if len(cruces) >= 3:
+        return cruces[2] - cruces[0]
+    if len(cruces) == 2:
+        # Media oscilación entre dos cruces consecutivos
+        return 2 * (cruces[1] - cruces[0])
     return None
 
 
+def comparar_energia(g, l, h=0.1, t_final=100.0):
+    """
+    Compara la deriva de la energía H = ω²/2 - (g/l)cos(θ) en una corrida
+    larga con RK4 y con los integradores simplécticos, todos con el mismo
+    paso h (10 veces el H de la simulación). RK4 acumula error de energía
+    que crece con t; el de Verlet y Yoshida oscila sin crecer.
+    """
+    k = g / l
+
+    def fuerza(theta):
+        return -k * math.sin(theta)
+
+    def energia(theta, omega):
+        return omega**2 / 2 - k * np.cos(theta)
+
+    def f(t, y):
+        return np.array([y[1], -k * math.sin(y[0])])
+
+    _, Y = rk4_sistema_np(f, T_INICIAL, [THETA_0, OMEGA_0], h, t_final)
+    deriva_rk4 = np.max(np.abs(energia(Y[:, 0], Y[:, 1]) - energia(THETA_0, OMEGA_0)))
+
+    resultados = {"RK4": deriva_rk4}
+    for nombre, metodo in (("Störmer–Verlet", stormer_verlet), ("Yoshida 4", yoshida4)):
+        _, _, _, info = metodo(fuerza, T_INICIAL, THETA_0, OMEGA_0, h, t_final, energia=energia)
+        resultados[nombre] = info["deriva_maxima"]
+    return resultados
+
+
 def calcular_amplitud(theta_vals):
     """
     Calcula la amplitud máxima del movimiento.
@@ -151,10 +206,13 @@ def calcular_amplitud(theta_vals):
 # FUNCIÓN PRINCIPAL
 # ============================================
 
-def main():
+def main(graficar=True, carpeta=None, formatos=("png",)):
     """
     Simula el movimiento del péndulo en la Tierra y en la Luna,
     genera gráficas comparativas y analiza el comportamiento.
+
+    graficar=False no importa matplotlib. Con carpeta, la figura se guarda
+    ahí (en los formatos pedidos) sin abrir ventanas.
     """
     
     print("=" * 70)
@@ -172,26 +230,23 @@ def main():
     print(f"Tiempo de simulación: [0, {T_FINAL}] s")
     print("=" * 70)
     
-    # ========== SIMULACIÓN EN LA TIERRA ==========
-    print("\n🌍 Resolviendo para la Tierra...")
+    # ========== SIMULACIÓN EN LA TIERRA Y EN LA LUNA ==========
+    # Ambos péndulos se integran juntos como un ensamble de 2 trayectorias:
+    # fila 0 = Tierra, fila 1 = Luna
+    print("\n🌍🌙 Resolviendo para la Tierra y la Luna...")
     y0 = [THETA_0, OMEGA_0]  # Condiciones iniciales: [θ(0), θ'(0)]
-    f_tierra = crear_funcion_pendulo(G_TIERRA, L)
-    
-    t_tierra, y_tierra = rk4_sistema(f_tierra, T_INICIAL, y0, H, T_FINAL)
-    
-    # Extraer θ(t) y ω(t)
-    theta_tierra = [y[0] for y in y_tierra]  # Posición angular
-    omega_tierra = [y[1] for y in y_tierra]  # Velocidad angular
-    
-    # ========== SIMULACIÓN EN LA LUNA ==========
-    print("🌙 Resolviendo para la Luna...")
-    f_luna = crear_funcion_pendulo(G_LUNA, L)
-    
-    t_luna, y_luna = rk4_sistema(f_luna, T_INICIAL, y0, H, T_FINAL)
-    
+    Y0 = [y0, y0]
+    parametros = [[G_TIERRA, L], [G_LUNA, L]]
+
+    t_vals, Y = integrar_ensamble(sistema_pendulo_lote, T_INICIAL, Y0, H, T_FINAL,
+                                  parametros=parametros)
+    t_tierra = t_luna = t_vals
+
     # Extraer θ(t) y ω(t)
-    theta_luna = [y[0] for y in y_luna]
-    omega_luna = [y[1] for y in y_luna]
+    theta_tierra = Y[:, 0, 0]  # Posición angular
+    omega_tierra = Y[:, 0, 1]  # Velocidad angular
+    theta_luna = Y[:, 1, 0]
+    omega_luna = Y[:, 1, 1]
     
     # ========== ANÁLISIS DE RESULTADOS ==========
     print("\n" + "=" * 70)
@@ -199,8 +254,8 @@ def main():
     print("=" * 70)
     
     # Calcular periodos
-    periodo_tierra = calcular_periodo_aproximado(t_tierra, theta_tierra)
-    periodo_luna = calcular_periodo_aproximado(t_luna, theta_luna)
+    periodo_tierra = calcular_periodo(G_TIERRA, L)
+    periodo_luna = calcular_periodo(G_LUNA, L)
     
     # Calcular amplitudes
     amp_tierra = calcular_amplitud(theta_tierra)
@@ -234,18 +289,41 @@ def main():
     print(f"  • ¿Cuál oscila más rápido? → {'TIERRA' if periodo_tierra and periodo_luna and periodo_tierra < periodo_luna else 'LUNA'}")
     print(f"  • ¿Cuál tiene mayor amplitud? → {'TIERRA' if amp_tierra > amp_luna else 'LUNA'}")
     print("=" * 70)
+
+    # ========== CONSERVACIÓN DE LA ENERGÍA ==========
+    h_largo, t_largo = 10 * H, 100 * T_FINAL
+    print(f"\n⚡ DERIVA DE LA ENERGÍA (Tierra, h = {h_largo} s, t ∈ [0, {t_largo}] s):")
+    for nombre, deriva in comparar_energia(G_TIERRA, L, h_largo, t_largo).items():
+        print(f"  • {nombre:<15} max |H - H₀| = {deriva:.2e}")
+    print("=" * 70)
     
     # ========== GRÁFICAS ==========
+    if not graficar:
+        print("\n🎉 ¡Simulación completada!\n")
+        return
+
     print("\n📊 Generando gráficas...")
+    plt = pyplot(sin_ventana=carpeta is not None)
     
     # Crear figura con 3 subplots
     fig, axes = plt.subplots(3, 1, figsize=(12, 10))
     fig.suptitle('Movimiento del Péndulo: Tierra vs Luna', fontsize=16, fontweight='bold')
+
+    # A matplotlib solo le llegan unos pocos puntos por píxel de cada eje:
+    # mínimo y máximo por grupo en las series de tiempo (conserva picos y
+    # cruces por cero) y LTTB en el retrato de fase
+    n_puntos = puntos_por_eje(axes[0])
+
+    def serie(t, y):
+        return reducir_puntos(t, y, n_puntos, "minmax")
+
+    def fase(theta, omega):
+        return reducir_puntos(theta, omega, n_puntos, "lttb")
     
     # --- Gráfica 1: Posición angular θ(t) ---
     ax1 = axes[0]
-    ax1.plot(t_tierra, theta_tierra, 'b-', label='Tierra', linewidth=1.5)
-    ax1.plot(t_luna, theta_luna, 'r-', label='Luna', linewidth=1.5)
+    ax1.plot(*serie(t_tierra, theta_tierra), 'b-', label='Tierra', linewidth=1.5)
+    ax1.plot(*serie(t_luna, theta_luna), 'r-', label='Luna', linewidth=1.5)
     ax1.set_ylabel('θ(t) [radianes]', fontsize=11)
     ax1.set_title('a) Posición Angular θ(t)', fontsize=12, fontweight='bold')
     ax1.grid(True, alpha=0.3)
@@ -254,8 +332,8 @@ def main():
     
     # --- Gráfica 2: Velocidad angular ω(t) ---
     ax2 = axes[1]
-    ax2.plot(t_tierra, omega_tierra, 'b-', label='Tierra', linewidth=1.5)
-    ax2.plot(t_luna, omega_luna, 'r-', label='Luna', linewidth=1.5)
+    ax2.plot(*serie(t_tierra, omega_tierra), 'b-', label='Tierra', linewidth=1.5)
+    ax2.plot(*serie(t_luna, omega_luna), 'r-', label='Luna', linewidth=1.5)
     ax2.set_ylabel('ω(t) [rad/s]', fontsize=11)
     ax2.set_title('b) Velocidad Angular ω(t) = dθ/dt', fontsize=12, fontweight='bold')
     ax2.grid(True, alpha=0.3)
@@ -264,8 +342,8 @@ def main():
     
     # --- Gráfica 3: Retrato de fase (ω vs θ) ---
     ax3 = axes[2]
-    ax3.plot(theta_tierra, omega_tierra, 'b-', label='Tierra', linewidth=1.5, alpha=0.7)
-    ax3.plot(theta_luna, omega_luna, 'r-', label='Luna', linewidth=1.5, alpha=0.7)
+    ax3.plot(*fase(theta_tierra, omega_tierra), 'b-', label='Tierra', linewidth=1.5, alpha=0.7)
+    ax3.plot(*fase(theta_luna, omega_luna), 'r-', label='Luna', linewidth=1.5, alpha=0.7)
     ax3.set_xlabel('θ [radianes]', fontsize=11)
     ax3.set_ylabel('ω [rad/s]', fontsize=11)
     ax3.set_title('c) Retrato de Fase (Espacio de estados)', fontsize=12, fontweight='bold')
@@ -275,11 +353,14 @@ def main():
     ax3.axvline(x=0, color='k', linestyle='--', linewidth=0.5, alpha=0.5)
     
     plt.tight_layout()
-    plt.show()
+    for ruta in renderizar({"p5_pendulo": fig}, carpeta, formatos):
+        print(f"Gráfica guardada en {ruta}")
     
     print("✅ Gráficas generadas exitosamente")
     print("\n🎉 ¡Simulación completada!\n")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="p5: péndulo en la Tierra y en la Luna")
+    args = opciones_graficas(parser).parse_args()
+    main(not args.sin_graficas, args.salida, args.formatos)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Tablas de error compartidas por p1, p2 y p4.
+
+La solución analítica se evalúa sobre toda la malla de una vez, los
+errores se calculan con operaciones de NumPy y el resultado es un
+pandas.DataFrame que se imprime (formateado por columnas) o se exporta con
+una sola llamada:
+
+    tabla = tabla_errores(x, {"yn_RK4": y}, y_analitica, ["RK4"])
+    imprimir_tabla(tabla, h, anchos=[6, 12, 16, 12, 12],
+                   formatos=[".1f", ".4f", ".4f", ".4f", ".4f"])
+    exportar_tabla(tabla, "p2_h0.1.csv")
+
+Las columnas son: xn, una columna por método, ValorReal y, para cada
+método, ErrAbs_<nombre> y %ErrRel_<nombre>.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def evaluar_analitica(y_analitica, x):
+    """
+    Evalúa la solución analítica sobre todo el arreglo x. Si la función
+    solo acepta escalares (por ejemplo porque usa math), se evalúa punto
+    por punto.
+    """
+    x = np.asarray(x, dtype=float)
+    try:
+        y = np.asarray(y_analitica(x), dtype=float)
+        if y.shape == x.shape:
+            return y
+    except TypeError:
+        pass
+    return np.fromiter((y_analitica(float(xi)) for xi in x), dtype=float, count=x.size)
+
+
+def tabla_errores(x, soluciones, y_analitica, nombres_error=None):
+    """
+    Construye la tabla de errores absolutos y relativos.
+
+    PARÁMETROS:
+    -----------
+    x : array
+        Malla de la solución numérica.
+
+    soluciones : dict {columna: y}
+        Solución de cada método sobre la malla x, por ejemplo
+        {"ynEuler": y_euler, "ynEulerMejorado": y_em}.
+
+    y_analitica : función
+        Solución exacta; de preferencia vectorizada (numpy).
+
+    nombres_error : list de str, opcional
+        Sufijos de las columnas de error de cada método (por defecto las
+        mismas claves de soluciones).
+
+    RETORNA:
+    --------
+    pandas.DataFrame
+    """
+    x = np.asarray(x, dtype=float)
+    y_real = evaluar_analitica(y_analitica, x)
+    nombres_error = list(soluciones) if nombres_error is None else list(nombres_error)
+    if len(nombres_error) != len(soluciones):
+        raise ValueError("nombres_error debe tener un nombre por cada solución")
+
+    columnas = {"xn": x}
+    for columna, y in soluciones.items():
+        columnas[columna] = np.asarray(y, dtype=float)
+    columnas["ValorReal"] = y_real
+
+    # Donde la solución exacta es cero el error relativo es inf (o 0 si no hay error)
+    denominador = np.abs(y_real)
+    distinto_de_cero = denominador > 1e-15
+    for nombre, y in zip(nombres_error, soluciones.values()):
+        error = np.abs(y_real - np.asarray(y, dtype=float))
+        porcentaje = np.where(error != 0, np.inf, 0.0)
+        np.divide(error * 100.0, denominador, out=porcentaje, where=distinto_de_cero)
+        columnas[f"ErrAbs_{nombre}"] = error
+        columnas[f"%ErrRel_{nombre}"] = porcentaje
+
+    return pd.DataFrame(columnas)
+
+
+def formatear_tabla(tabla, anchos, formatos):
+    """
+    Texto de la tabla con columnas alineadas a la izquierda. anchos y
+    formatos tienen un elemento por columna (formato como en format() y
+    válido también con %, por ejemplo ".4f" o ".2e").
+    """
+    if len(anchos) != tabla.shape[1] or len(formatos) != tabla.shape[1]:
+        raise ValueError("anchos y formatos deben tener un elemento por columna")
+
+    encabezado = " ".join(f"{nombre:<{ancho}}" for nombre, ancho in zip(tabla.columns, anchos))
+    # Un solo formato % por columna, aplicado con map sobre la columna
+    # convertida a floats de Python; cada fila se une una vez
+    columnas = [list(map(f"%-{ancho}{formato}".__mod__, tabla[columna].tolist()))
+                for columna, ancho, formato in zip(tabla.columns, anchos, formatos)]
+    filas = [" ".join(fila) for fila in zip(*columnas)]
+    return "\n".join([encabezado, "-" * 80] + filas)
+
+
+def imprimir_tabla(tabla, h, anchos, formatos):
+    """Imprime la tabla con el mismo encabezado "RESULTADOS PARA h = ..." de p1..p4."""
+    print(f"\n{'='*80}")
+    print(f"RESULTADOS PARA h = {h}")
+    print(f"{'='*80}")
+    print(formatear_tabla(tabla, anchos, formatos))
+
+
+def exportar_tabla(tabla, ruta):
+    """
+    Guarda la tabla según la extensión de la ruta: .csv, .json, .html,
+    .parquet o .xlsx (los dos últimos requieren pyarrow/openpyxl).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        tabla.to_csv(ruta, index=False)
+    elif extension == ".json":
+        tabla.to_json(ruta, orient="records")
+    elif extension == ".html":
+        tabla.to_html(ruta, index=False)
+    elif extension == ".parquet":
+        tabla.to_parquet(ruta, index=False)
+    elif extension == ".xlsx":
+        tabla.to_excel(ruta, index=False)
+    else:
+        raise ValueError(f"Formato de exportación no soportado: {extension!r}")
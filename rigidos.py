@@ -0,0 +1,498 @@
+"""
+Métodos implícitos para problemas rígidos (stiff).
+
+En una ecuación como la de p3, y' = 2x - 3y + 1, la parte -3y hace que la
+solución decaiga. Si la tasa de decaimiento es grande (por ejemplo -3000y),
+todos los métodos explícitos de solvers.py necesitan pasos diminutos, no
+por precisión sino para no volverse inestables. Los métodos de este módulo
+son implícitos: en cada paso resuelven un sistema no lineal con Newton, y
+su estabilidad permite elegir h solo por la precisión deseada.
+
+    euler_implicito : Euler hacia atrás (BDF1), orden 1
+    bdf             : fórmulas BDF de orden 1 a 5
+    rosenbrock      : Rosenbrock ROS2 (orden 2, sin iteraciones de Newton)
+
+REUTILIZACIÓN DEL JACOBIANO:
+----------------------------
+Newton necesita la matriz M = I - β·h·J, con J = ∂f/∂y. Evaluar J y
+factorizar M (LU) es lo más caro del paso, así que ambos se guardan y se
+reutilizan en los pasos siguientes (Newton simplificado). Solo se vuelve a
+factorizar cuando cambia β·h, y solo se reevalúa J cuando Newton deja de
+converger con la J guardada (si ni así converge, se pasa a Newton completo
+en ese paso).
+
+Todos retornan (x_valores, y_valores, info) como dormand_prince, con
+info = {"pasos", "evaluaciones", "jacobianos", "factorizaciones",
+"iteraciones_newton"}.
+"""
+
+import numpy as np
+
+from solvers import _malla, _medir_rhs, _numero_pasos, _registrador_pasos
+
+
+# Coeficientes BDF normalizados: y_{n+1} = Σ cⱼ·y_{n-j} + β·h·f(x_{n+1}, y_{n+1})
+_BDF_C = {
+    1: (1.0,),
+    2: (4/3, -1/3),
+    3: (18/11, -9/11, 2/11),
+    4: (48/25, -36/25, 16/25, -3/25),
+    5: (300/137, -300/137, 200/137, -75/137, 12/137),
+}
+_BDF_BETA = {1: 1.0, 2: 2/3, 3: 6/11, 4: 12/25, 5: 60/137}
+
+# γ de ROS2 (L-estable)
+_ROS2_GAMMA = 1 + 1/np.sqrt(2)
+
+# Radau IIA de 3 etapas (orden 5, L-estable), usado para arrancar las BDF
+_S6 = np.sqrt(6)
+_RADAU_C = np.array([(4 - _S6)/10, (4 + _S6)/10, 1.0])
+_RADAU_A = np.array([
+    [(88 - 7*_S6)/360, (296 - 169*_S6)/1800, (-2 + 3*_S6)/225],
+    [(296 + 169*_S6)/1800, (88 + 7*_S6)/360, (-2 - 3*_S6)/225],
+    [(16 - _S6)/36, (16 + _S6)/36, 1/9],
+])
+
+
+def _lu_factorizar(A):
+    """Factorización LU con pivoteo parcial (PA = LU), guardada en una matriz."""
+    LU = np.array(A, dtype=float)
+    n = LU.shape[0]
+    pivotes = np.arange(n)
+    for k in range(n - 1):
+        p = k + int(np.argmax(np.abs(LU[k:, k])))
+        if LU[p, k] == 0:
+            raise np.linalg.LinAlgError("Matriz de iteración singular")
+        if p != k:
+            LU[[k, p]] = LU[[p, k]]
+            pivotes[[k, p]] = pivotes[[p, k]]
+        LU[k+1:, k] /= LU[k, k]
+        LU[k+1:, k+1:] -= np.outer(LU[k+1:, k], LU[k, k+1:])
+    if LU[n-1, n-1] == 0:
+        raise np.linalg.LinAlgError("Matriz de iteración singular")
+    return LU, pivotes
+
+
+def _lu_resolver(LU, pivotes, b):
+    """Resuelve A·x = b con la factorización de _lu_factorizar."""
+    x = np.array(b, dtype=float)[pivotes]
+    n = x.size
+    # Sustitución hacia adelante (L tiene unos en la diagonal)
+    for i in range(1, n):
+        x[i] -= LU[i, :i] @ x[:i]
+    # Sustitución hacia atrás
+    for i in range(n - 1, -1, -1):
+        x[i] = (x[i] - LU[i, i+1:] @ x[i+1:]) / LU[i, i]
+    return x
+
+
+def _jacobiano_numerico(F, x, y, f_y):
+    """J = ∂f/∂y por diferencias hacia adelante, una columna por componente."""
+    n = y.size
+    J = np.empty((n, n))
+    for j in range(n):
+        delta = np.sqrt(np.finfo(float).eps) * max(1.0, abs(y[j]))
+        y_mas = y.copy()
+        y_mas[j] += delta
+        J[:, j] = (F(x, y_mas) - f_y) / delta
+    return J
+
+
+def _preparar(f, y0, jacobiano):
+    """
+    Adapta f (y el jacobiano, si se da) para trabajar siempre con vectores,
+    igual que dormand_prince: escalares como arreglos de una componente.
+    """
+    escalar = np.ndim(y0) == 0
+    f = _medir_rhs(f)
+    if escalar:
+        def F(x, y):
+            return np.array([f(x, y[0])], dtype=float)
+        J = None if jacobiano is None else (
+            lambda x, y: np.array([[jacobiano(x, y[0])]], dtype=float))
+    else:
+        def F(x, y):
+            return np.asarray(f(x, y), dtype=float)
+        J = None if jacobiano is None else (
+            lambda x, y: np.atleast_2d(np.asarray(jacobiano(x, y), dtype=float)))
+    return escalar, F, J, np.atleast_1d(np.array(y0, dtype=float))
+
+
+def _nuevo_info():
+    return {"pasos": 0, "evaluaciones": 0, "jacobianos": 0,
+            "factorizaciones": 0, "iteraciones_newton": 0}
+
+
+def _evaluar_jacobiano(F, J, x, y, cache, info):
+    if J is None:
+        f_y = F(x, y)
+        cache["J"] = _jacobiano_numerico(F, x, y, f_y)
+        info["evaluaciones"] += y.size + 1
+    else:
+        cache["J"] = J(x, y)
+    cache["J_fresco"] = True
+    cache["lu"] = None
+    cache["lu_radau"] = {}
+    info["jacobianos"] += 1
+
+
+def _derivada_x(F, F_x, x, y, f_y, info):
+    """fₓ = ∂f/∂x: la dada por el usuario o una diferencia hacia adelante en x."""
+    if F_x is not None:
+        return F_x(x, y)
+    delta = np.sqrt(np.finfo(float).eps) * max(1.0, abs(x))
+    info["evaluaciones"] += 1
+    return (F(x + delta, y) - f_y) / delta
+
+
+def _factorizar(cache, bh, info):
+    n = cache["J"].shape[0]
+    cache["lu"] = _lu_factorizar(np.eye(n) - bh * cache["J"])
+    cache["bh"] = bh
+    info["factorizaciones"] += 1
+
+
+def _newton(F, J, x, psi, bh, y_inicial, cache, info, rtol, atol, max_iter):
+    """
+    Resuelve Y = psi + bh·f(x, Y) con Newton simplificado, usando la J y la
+    LU guardadas en cache. Si la convergencia se degrada (la corrección no
+    baja lo suficiente) o se agotan las iteraciones, reevalúa J en el punto
+    actual, refactoriza y reintenta. Como último recurso usa Newton completo
+    (J reevaluada en cada iteración) antes de rendirse.
+    """
+    completo = False
+    while True:
+        if cache["J"] is None:
+            _evaluar_jacobiano(F, J, x, y_inicial, cache, info)
+        if cache["lu"] is None or cache["bh"] != bh:
+            _factorizar(cache, bh, info)
+
+        Y = y_inicial.copy()
+        norma_anterior = None
+        for _ in range(max_iter):
+            if completo and norma_anterior is not None:
+                _evaluar_jacobiano(F, J, x, Y, cache, info)
+                _factorizar(cache, bh, info)
+            LU, pivotes = cache["lu"]
+            residuo = Y - psi - bh * F(x, Y)
+            info["evaluaciones"] += 1
+            info["iteraciones_newton"] += 1
+            delta = _lu_resolver(LU, pivotes, residuo)
+            Y -= delta
+            norma = np.sqrt(np.mean((delta / (atol + rtol * np.abs(Y))) ** 2))
+            if norma <= 1.0:
+                return Y
+            if not completo and norma_anterior is not None and norma > 0.9 * norma_anterior:
+                break  # Convergencia degradada
+            norma_anterior = norma
+
+        if completo:
+            raise RuntimeError(
+                f"Newton no convergió en x = {x}; pruebe con un paso h menor")
+        if cache["J_fresco"]:
+            completo = True
+        cache["J"] = None  # Reevaluar J en este paso y reintentar
+
+
+def _paso_radau(F, J, x, y, h, cache, info, rtol, atol, max_iter):
+    """
+    Un paso de Radau IIA de 3 etapas. Las etapas Zᵢ = Yᵢ - yₙ cumplen
+    Z = h·(A ⊗ I)·F(x + c·h, yₙ + Z) y se resuelven con Newton sobre el
+    sistema de 3n incógnitas; yₙ₊₁ = yₙ + Z₃.
+
+    Usa la J guardada en cache (la misma para las tres etapas) y la LU del
+    sistema de 3n para ese h, que se guarda mientras J no cambie. Si la
+    convergencia se degrada, primero reevalúa J en (x, y); si ni así
+    converge, evalúa una J por etapa en los iterados actuales (Newton
+    completo).
+    """
+    n = y.size
+
+    def factorizar(jacobianos):
+        M = np.eye(3*n)
+        for i in range(3):
+            for j in range(3):
+                M[i*n:(i+1)*n, j*n:(j+1)*n] -= h * _RADAU_A[i, j] * jacobianos[j]
+        info["factorizaciones"] += 1
+        return _lu_factorizar(M)
+
+    cache["J_fresco"] = False
+    if cache["J"] is None:
+        _evaluar_jacobiano(F, J, x, y, cache, info)
+    if h not in cache["lu_radau"]:
+        cache["lu_radau"][h] = factorizar([cache["J"]] * 3)
+    LU, pivotes = cache["lu_radau"][h]
+
+    Z = np.zeros((3, n))
+    norma_anterior = None
+    for _ in range(3 * max_iter):
+        F_etapas = np.array([F(x + c*h, y + Z[i]) for i, c in enumerate(_RADAU_C)])
+        info["evaluaciones"] += 3
+        info["iteraciones_newton"] += 1
+        residuo = (Z - h * _RADAU_A @ F_etapas).ravel()
+        delta = _lu_resolver(LU, pivotes, residuo).reshape(3, n)
+        Z -= delta
+        norma = np.sqrt(np.mean((delta / (atol + rtol * np.abs(y + Z))) ** 2))
+        if norma <= 1.0:
+            return y + Z[2]
+        if norma_anterior is not None and norma > 0.5 * norma_anterior:
+            if not cache["J_fresco"]:
+                # La J guardada ya no sirve: reevaluarla en este paso
+                _evaluar_jacobiano(F, J, x, y, cache, info)
+                cache["lu_radau"][h] = factorizar([cache["J"]] * 3)
+                LU, pivotes = cache["lu_radau"][h]
+            else:
+                # Convergencia lenta: una J por etapa en los iterados actuales
+                jacobianos = []
+                for i, c in enumerate(_RADAU_C):
+                    _evaluar_jacobiano(F, J, x + c*h, y + Z[i], cache, info)
+                    jacobianos.append(cache["J"])
+                # Solo para este paso: la J guardada queda en la última etapa
+                LU, pivotes = factorizar(jacobianos)
+                cache["lu_radau"] = {}
+            norma_anterior = None
+            continue
+        norma_anterior = norma
+    raise RuntimeError(f"Newton no convergió en x = {x}; pruebe con un paso h menor")
+
+
+def _arranque(F, J, x, y, h, cache, info, rtol, atol, max_iter, profundidad=0):
+    """
+    Paso de arranque de las BDF con Radau IIA y control por duplicación de
+    paso: se compara un paso h con dos pasos h/2. Si Newton no converge o
+    ambos resultados no coinciden (al inicio de un transitorio muy rápido
+    Newton puede caer en una raíz espuria), el paso se divide en dos mitades,
+    recursivamente; en el último nivel se usa Euler implícito, que es el más
+    robusto.
+
+    Todos los subpasos comparten la caché de la BDF: la misma J y una LU
+    por tamaño de paso, así que un arranque sin problemas cuesta una sola
+    J (la que después usa la BDF) y dos factorizaciones.
+    """
+    if profundidad == 6:
+        cache["J_fresco"] = False
+        return _newton(F, J, x + h, y, h, y.copy(), cache, info, rtol, atol, max_iter)
+    try:
+        y_completo = _paso_radau(F, J, x, y, h, cache, info, rtol, atol, max_iter)
+        y_medio = _paso_radau(F, J, x, y, h/2, cache, info, rtol, atol, max_iter)
+        y_mitades = _paso_radau(F, J, x + h/2, y_medio, h/2, cache, info, rtol, atol, max_iter)
+        escala = 1e3 * (atol + rtol * np.abs(y_mitades))
+        if np.sqrt(np.mean(((y_completo - y_mitades) / escala) ** 2)) <= 1.0:
+            return y_mitades
+    except RuntimeError:
+        pass
+    y_medio = _arranque(F, J, x, y, h/2, cache, info, rtol, atol, max_iter, profundidad + 1)
+    return _arranque(F, J, x + h/2, y_medio, h/2, cache, info, rtol, atol, max_iter,
+                     profundidad + 1)
+
+
+def bdf(f, x0, y0, h, x_final, orden=2, jacobiano=None, rtol=1e-8, atol=1e-10,
+        max_iter=10):
+    """
+    Fórmulas de diferenciación hacia atrás (BDF) de paso fijo, orden 1 a 5.
+
+        y_{n+1} = Σⱼ cⱼ·y_{n-j} + β·h·f(x_{n+1}, y_{n+1})
+
+    El valor y_{n+1} aparece en ambos lados, así que en cada paso se resuelve
+    con Newton simplificado (ver el docstring del módulo). Los primeros
+    orden-1 pasos no tienen historia suficiente; se calculan con Radau IIA
+    (implícito, L-estable y de orden 5) para no perder orden al arrancar,
+    subdividiendo el paso de arranque cuando hace falta.
+
+    PARÁMETROS:
+    -----------
+    f : función
+        f(x, y) como en rk4 (y escalar) o en rk4_sistema (y vector; aquí se
+        recibe un numpy.ndarray).
+
+    x0, y0, h, x_final :
+        Igual que en los métodos de solvers.py; la malla es xᵢ = x0 + i·h.
+
+    orden : int
+        Orden de la fórmula BDF, de 1 (Euler implícito) a 5.
+
+    jacobiano : función, opcional
+        jacobiano(x, y) -> ∂f/∂y (float si el problema es escalar, matriz
+        n×n si es un sistema). Si no se da, se aproxima por diferencias.
+
+    rtol, atol : float
+        Tolerancias para la convergencia de Newton.
+
+    max_iter : int
+        Iteraciones de Newton permitidas antes de reevaluar el jacobiano.
+
+    RETORNA:
+    --------
+    x_valores : numpy.ndarray
+    y_valores : numpy.ndarray, forma (n,) o (n, n_estado)
+    info : dict
+    """
+    if orden not in _BDF_C:
+        raise ValueError("orden debe estar entre 1 y 5")
+    escalar, F, J, y_actual = _preparar(f, y0, jacobiano)
+
+    n_pasos = _numero_pasos(x0, h, x_final)
+    x_valores = _malla(x0, h, n_pasos)
+    y_valores = np.empty((n_pasos + 1, y_actual.size))
+    y_valores[0] = y_actual
+
+    info = _nuevo_info()
+    cache = {"J": None, "J_fresco": False, "lu": None, "bh": None, "lu_radau": {}}
+    registrar = _registrador_pasos()
+
+    for i in range(n_pasos):
+        if i < orden - 1:
+            # Arranque con un método de un paso
+            y_valores[i + 1] = _arranque(F, J, x_valores[i], y_valores[i], h,
+                                         cache, info, rtol, atol, max_iter)
+            info["pasos"] += 1
+            if registrar is not None:
+                registrar(x_valores[i + 1], y_valores[i + 1, 0] if escalar else y_valores[i + 1])
+            continue
+
+        coeficientes = _BDF_C[orden]
+        psi = coeficientes[0] * y_valores[i]
+        for j in range(1, orden):
+            psi = psi + coeficientes[j] * y_valores[i - j]
+
+        # Valor inicial: extrapolación lineal de los dos últimos puntos
+        if i > 0:
+            y_inicial = 2 * y_valores[i] - y_valores[i - 1]
+        else:
+            y_inicial = y_valores[i].copy()
+
+        cache["J_fresco"] = False
+        y_valores[i + 1] = _newton(F, J, x_valores[i + 1], psi, _BDF_BETA[orden] * h,
+                                   y_inicial, cache, info, rtol, atol, max_iter)
+        info["pasos"] += 1
+        if registrar is not None:
+            registrar(x_valores[i + 1], y_valores[i + 1, 0] if escalar else y_valores[i + 1])
+
+    if escalar:
+        y_valores = y_valores[:, 0]
+    return x_valores, y_valores, info
+
+
+def euler_implicito(f, x0, y0, h, x_final, jacobiano=None, rtol=1e-8, atol=1e-10,
+                    max_iter=10):
+    """
+    Euler hacia atrás: y_{n+1} = y_n + h·f(x_{n+1}, y_{n+1}).
+
+    Es la BDF de orden 1 (ver bdf para los parámetros y el valor de retorno).
+    """
+    return bdf(f, x0, y0, h, x_final, orden=1, jacobiano=jacobiano,
+               rtol=rtol, atol=atol, max_iter=max_iter)
+
+
+def rosenbrock(f, x0, y0, h, x_final, jacobiano=None, actualizar_cada=20, derivada_x=None,
+               crecimiento_max=2.0):
+    """
+    Método de Rosenbrock ROS2 (orden 2, L-estable) de paso fijo.
+
+    En lugar de iterar con Newton, resuelve dos sistemas lineales por paso
+    con la misma matriz M = I - γ·h·J:
+
+        M·k₁ = f(xₙ, yₙ) + γ·h·fₓ
+        M·k₂ = f(xₙ₊₁, yₙ + h·k₁) - 2·k₁ - γ·h·fₓ
+        yₙ₊₁ = yₙ + h·(3/2·k₁ + 1/2·k₂),      γ = 1 + 1/√2
+
+    fₓ = ∂f/∂x es cero en problemas autónomos; sin ese término el método
+    baja a orden 1 cuando f depende de x (como y' = 2x - 3000y + 1).
+
+    ROS2 conserva el orden 2 aunque J no sea el jacobiano exacto del paso,
+    así que J y la LU se reutilizan durante varios pasos: sin jacobiano
+    analítico, evaluar J cuesta n + 1 evaluaciones de f, más que el propio
+    paso. Lo que sí depende de J es la estabilidad: con una J muy vieja
+    las componentes rígidas dejan de amortiguarse y el incremento
+    yₙ₊₁ - yₙ crece de golpe. Por eso J se reevalúa cada actualizar_cada
+    pasos y, además, cuando el incremento de un paso supera crecimiento_max
+    veces el del paso anterior; en ese caso el paso se repite con la J
+    nueva. fₓ, en cambio, se recalcula en cada paso (una evaluación de f):
+    con una fₓ vieja el método pierde el orden en problemas no autónomos.
+
+    PARÁMETROS:
+    -----------
+    f, x0, y0, h, x_final, jacobiano :
+        Igual que en bdf.
+
+    actualizar_cada : int
+        Cada cuántos pasos, como máximo, se reevalúa J y se refactoriza M. Con 1 se reevalúa en todos los pasos (lo más
+        estable y lo más caro).
+
+    derivada_x : función, opcional
+        derivada_x(x, y) = ∂f/∂x. Si no se da, se aproxima con una
+        diferencia hacia adelante en x (una evaluación más de f).
+
+    crecimiento_max : float
+        Si ‖yₙ₊₁ - yₙ‖ > crecimiento_max·‖yₙ - yₙ₋₁‖ con una J reutilizada,
+        se reevalúa J y se repite el paso.
+
+    RETORNA:
+    --------
+    x_valores, y_valores, info : igual que en bdf.
+    """
+    if actualizar_cada < 1:
+        raise ValueError("actualizar_cada debe ser un entero >= 1")
+    escalar, F, J, y_actual = _preparar(f, y0, jacobiano)
+    if derivada_x is None:
+        F_x = None
+    elif escalar:
+        def F_x(x, y):
+            return np.array([derivada_x(x, y[0])], dtype=float)
+    else:
+        def F_x(x, y):
+            return np.asarray(derivada_x(x, y), dtype=float)
+
+    n_pasos = _numero_pasos(x0, h, x_final)
+    x_valores = _malla(x0, h, n_pasos)
+    y_valores = np.empty((n_pasos + 1, y_actual.size))
+    y_valores[0] = y_actual
+
+    info = _nuevo_info()
+    cache = {"J": None, "J_fresco": False, "lu": None, "bh": None, "edad": 0}
+    gh = _ROS2_GAMMA * h
+    registrar = _registrador_pasos()
+
+    def actualizar(x, y):
+        _evaluar_jacobiano(F, J, x, y, cache, info)
+        cache["edad"] = 0
+
+    def paso(x, y, f_y):
+        if cache["lu"] is None:
+            _factorizar(cache, gh, info)
+        LU, pivotes = cache["lu"]
+        termino_x = gh * cache["f_x"]
+        k1 = _lu_resolver(LU, pivotes, f_y + termino_x)
+        k2 = _lu_resolver(LU, pivotes, F(x + h, y + h * k1) - 2 * k1 - termino_x)
+        info["evaluaciones"] += 1
+        return h * (1.5 * k1 + 0.5 * k2)
+
+    incremento_anterior = None
+    for i in range(n_pasos):
+        x_actual = x_valores[i]
+        y_actual = y_valores[i]
+        f_actual = F(x_actual, y_actual)
+        info["evaluaciones"] += 1
+        if cache["J"] is None or cache["edad"] >= actualizar_cada:
+            actualizar(x_actual, y_actual)
+        cache["f_x"] = _derivada_x(F, F_x, x_actual, y_actual, f_actual, info)
+
+        incremento = paso(x_actual, y_actual, f_actual)
+        norma = np.linalg.norm(incremento)
+        if (cache["edad"] > 0 and incremento_anterior is not None
+                and norma > crecimiento_max * incremento_anterior):
+            # Posible inestabilidad por una J vieja: repetir con J nueva
+            actualizar(x_actual, y_actual)
+            incremento = paso(x_actual, y_actual, f_actual)
+            norma = np.linalg.norm(incremento)
+        cache["edad"] += 1
+        incremento_anterior = norma
+
+        y_valores[i + 1] = y_actual + incremento
+        info["pasos"] += 1
+        if registrar is not None:
+            registrar(x_valores[i + 1], y_valores[i + 1, 0] if escalar else y_valores[i + 1])
+
+    if escalar:
+        y_valores = y_valores[:, 0]
+    return x_valores, y_valores, info
@@ -0,0 +1,148 @@
+"""
+Integradores simplécticos para hamiltonianos separables H(q, p) = T(p) + V(q).
+
+El péndulo de p5 es un sistema hamiltoniano: con θ = q y ω = p,
+
+    dq/dt =  ∂H/∂p = p
+    dp/dt = -∂H/∂q = -(g/l)·sen(q)         H = p²/2 - (g/l)·cos(q)
+
+RK4 no conserva la energía: el error en H crece con el tiempo, y por eso
+p5 usa h = 0.01. Un método simpléctico conserva exactamente un hamiltoniano
+"modificado" cercano a H, así que el error de energía queda acotado (oscila
+sin crecer) aunque el paso sea mucho más grande.
+
+    - Störmer–Verlet (orden 2), en la forma "kick-drift-kick":
+          p½   = pₙ + h/2·F(qₙ)
+          qₙ₊₁ = qₙ + h·V(p½)
+          pₙ₊₁ = p½ + h/2·F(qₙ₊₁)
+      F(qₙ₊₁) se reutiliza como F(qₙ) del paso siguiente, así que cuesta una
+      evaluación de la fuerza por paso.
+
+    - Yoshida (orden 4): tres pasos de Verlet con pasos w₁h, w₀h, w₁h,
+          w₁ = 1/(2 - 2^(1/3)),   w₀ = -2^(1/3)/(2 - 2^(1/3)).
+
+F(q) = -∂V/∂q es la fuerza y V(p) = ∂T/∂p la velocidad (p por defecto,
+es decir T = p²/2).
+
+Dentro de solvers.instrumentar() se cuentan las evaluaciones de la fuerza
+(on_rhs recibe t, q y la fuerza) y los pasos (on_step recibe t y el par
+(q, p)).
+"""
+
+import numpy as np
+
+from solvers import _malla, _medir_rhs, _numero_pasos, _registrador_pasos
+
+
+_W1 = 1 / (2 - 2**(1/3))
+_W0 = -2**(1/3) / (2 - 2**(1/3))
+
+
+def _integrar(pesos, fuerza, t0, q0, p0, h, t_final, velocidad, energia, monitor_cada):
+    """Composición de pasos de Störmer–Verlet con pasos pesos[k]·h."""
+    if monitor_cada < 1:
+        raise ValueError("monitor_cada debe ser un entero >= 1")
+    escalar = np.ndim(q0) == 0
+    if escalar:
+        q, p = float(q0), float(p0)
+    else:
+        q, p = np.array(q0, dtype=float), np.array(p0, dtype=float)
+        if q.shape != p.shape:
+            raise ValueError("q0 y p0 deben tener la misma forma")
+    if velocidad is None:
+        def velocidad(p):
+            return p
+
+    n_pasos = _numero_pasos(t0, h, t_final)
+    t_valores = _malla(t0, h, n_pasos)
+    q_valores = np.empty((n_pasos + 1,) + np.shape(q))
+    p_valores = np.empty((n_pasos + 1,) + np.shape(p))
+    q_valores[0] = q
+    p_valores[0] = p
+
+    def fuerza_en(t, q):
+        return fuerza(q)
+
+    fuerza_en = _medir_rhs(fuerza_en)
+    registrar = _registrador_pasos()
+
+    a = fuerza_en(t0, q)
+    evaluaciones = 1
+    for i in range(n_pasos):
+        t = t_valores[i]
+        for peso in pesos:
+            paso = peso * h
+            t += paso
+            p = p + paso/2 * a
+            q = q + paso * velocidad(p)
+            a = fuerza_en(t, q)
+            p = p + paso/2 * a
+        evaluaciones += len(pesos)
+        q_valores[i + 1] = q
+        p_valores[i + 1] = p
+        if registrar is not None:
+            registrar(t_valores[i + 1], (q, p))
+
+    info = {"evaluaciones_fuerza": evaluaciones,
+            "evaluaciones_velocidad": n_pasos * len(pesos)}
+
+    if energia is not None:
+        indices = np.arange(0, n_pasos + 1, monitor_cada)
+        if indices[-1] != n_pasos:
+            indices = np.append(indices, n_pasos)
+        valores = np.array([energia(q_valores[j], p_valores[j]) for j in indices], dtype=float)
+        deriva = np.abs(valores - valores[0])
+        info["t_energia"] = t_valores[indices]
+        info["energia"] = valores
+        info["deriva_maxima"] = float(deriva.max())
+        info["deriva_relativa"] = (float(deriva.max() / abs(valores[0]))
+                                   if valores[0] != 0 else float("inf"))
+
+    return t_valores, q_valores, p_valores, info
+
+
+def stormer_verlet(fuerza, t0, q0, p0, h, t_final, velocidad=None, energia=None,
+                   monitor_cada=1):
+    """
+    Störmer–Verlet (leapfrog) de paso fijo, orden 2.
+
+    PARÁMETROS:
+    -----------
+    fuerza : función
+        fuerza(q) = -∂V/∂q (float o numpy.ndarray, como q).
+
+    t0, h, t_final : float
+        Malla tᵢ = t0 + i·h, igual que en los métodos de solvers.py.
+
+    q0, p0 : float o array
+        Posición y momento (o velocidad) iniciales.
+
+    velocidad : función, opcional
+        velocidad(p) = ∂T/∂p. Por defecto velocidad(p) = p.
+
+    energia : función, opcional
+        energia(q, p) = H(q, p). Si se da, se calcula cada monitor_cada
+        pasos y se reporta la deriva respecto al valor inicial.
+
+    monitor_cada : int
+        Cada cuántos pasos se evalúa la energía.
+
+    RETORNA:
+    --------
+    t_valores, q_valores, p_valores : numpy.ndarray
+
+    info : dict
+        "evaluaciones_fuerza", "evaluaciones_velocidad" y, si se dio
+        energia: "t_energia", "energia", "deriva_maxima" (max |H - H₀|) y
+        "deriva_relativa" (deriva_maxima / |H₀|).
+    """
+    return _integrar((1.0,), fuerza, t0, q0, p0, h, t_final, velocidad, energia, monitor_cada)
+
+
+def yoshida4(fuerza, t0, q0, p0, h, t_final, velocidad=None, energia=None, monitor_cada=1):
+    """
+    Integrador simpléctico de Yoshida de orden 4 (tres subpasos de
+    Störmer–Verlet por paso). Mismos parámetros y retorno que stormer_verlet.
+    """
+    return _integrar((_W1, _W0, _W1), fuerza, t0, q0, p0, h, t_final, velocidad, energia,
+                     monitor_cada)
@@ -1,135 +1,875 @@
-def euler(f, x0, y0, h, x_final):
-    x_actual = x0
-    y_actual = y0
+import math
+import time
+from contextlib import contextmanager
+from fractions import Fraction
 
-    # Almacenar los resultados
-    x_valores = [x0]
-    y_valores = [y0]
+import numpy as np
 
-    #Lógica
-    while x_actual < x_final:
-        pendiente = f(x_actual, y_actual)
-        y_siguiente = y_actual + h * pendiente
-        x_siguiente = x_actual + h
 
-        x_actual = round(x_siguiente, 4)
-        y_actual = y_siguiente
+def _numero_pasos(x0, h, x_final):
+    """
+    Número de pasos de tamaño h para ir de x0 a x_final.
 
-        x_valores.append(x_actual)
-        y_valores.append(y_actual)
-    return x_valores, y_valores
+    Todos los métodos de paso fijo usan esta misma regla: la malla es
+    xᵢ = x0 + i·h con i = 0..n, y xₙ es el primer punto que alcanza (o
+    supera) x_final. La tolerancia evita que un error de redondeo en
+    (x_final - x0)/h agregue un paso de más.
+    """
+    cociente = (x_final - x0) / h
+    return max(0, math.ceil(cociente - 1e-9 * max(1.0, abs(cociente))))
 
-def euler_mejorado(f, x0, y0, h, x_final):
-    x_actual = x0
-    y_actual = y0
 
-    # Almacenar los resultados
-    x_valores = [x0]
-    y_valores = [y0]
+def _malla(x0, h, n_pasos):
+    """Malla xᵢ = x0 + i·h calculada a partir del índice (sin acumular h)."""
+    return x0 + h * np.arange(n_pasos + 1)
 
-    #Lógica
-    while x_actual < x_final:
-        #Cálculos con K1
-        k1 = f(x_actual, y_actual)
-        y_asterisco = y_actual + h * k1
-        x_siguiente = x_actual + h
 
-        k2 = f(x_siguiente,y_asterisco)
-        y_siguiente = y_actual + h/2 *(k1+k2)
+# ============================================
+# INSTRUMENTACIÓN (OPCIONAL)
+# ============================================
 
-        x_actual = round(x_siguiente, 4)
-        y_actual = y_siguiente
+# Medición activa (ver instrumentar) o None. Mientras es None los métodos
+# no envuelven f ni los estados, así que el costo es una comparación por
+# llamada al método, no por paso.
+_instrumentacion = None
 
-        x_valores.append(x_actual)
-        y_valores.append(y_actual)
-    return x_valores, y_valores
 
-def rk4(f, x0, y0, h, x_final):
-    x_actual = x0
+@contextmanager
+def instrumentar(on_step=None, on_rhs=None):
+    """
+    Activa la instrumentación de todos los métodos dentro del bloque with.
+
+        with instrumentar() as m:
+            rk4(f, 0, 2, 0.01, 0.5)
+        print(m["evaluaciones"], m["pasos"], m["tiempo_etapas"])
+
+    PARÁMETROS:
+    -----------
+    on_step : función, opcional
+        on_step(x, y) después de cada paso aceptado. En los métodos que
+        actualizan el estado en su lugar, y es ese mismo arreglo: se debe
+        copiar si se quiere guardar.
+
+    on_rhs : función, opcional
+        on_rhs(x, y, dydx) después de cada evaluación de f.
+
+    RETORNA (con as):
+    -----------------
+    dict con
+        "evaluaciones"          llamadas a f
+        "pasos"                 pasos aceptados
+        "tiempo_etapas"         segundos dentro de f
+        "tiempo_combinacion"    segundos del paso fuera de f (combinar
+                                etapas, predictor-corrector, Newton...)
+        "tiempo_almacenamiento" segundos guardando la salida (incluye
+                                t_eval y eventos); solo en los métodos de
+                                paso fijo
+
+    Los tiempos de los hooks no se cuentan. No es seguro entre hilos.
+    """
+    global _instrumentacion
+    metricas = {
+        "evaluaciones": 0,
+        "pasos": 0,
+        "tiempo_etapas": 0.0,
+        "tiempo_combinacion": 0.0,
+        "tiempo_almacenamiento": 0.0,
+    }
+    anterior = _instrumentacion
+    _instrumentacion = {"metricas": metricas, "on_step": on_step, "on_rhs": on_rhs}
+    try:
+        yield metricas
+    finally:
+        _instrumentacion = anterior
+
+
+def _medir_rhs(f):
+    """
+    Envuelve f para contar y cronometrar sus evaluaciones. Acepta tanto
+    f(x, y) como las firmas con argumentos extra (f(t, y, salida) en sitio).
+    """
+    if _instrumentacion is None:
+        return f
+    metricas = _instrumentacion["metricas"]
+    on_rhs = _instrumentacion["on_rhs"]
+    reloj = time.perf_counter
+
+    def f_medida(x, y, *extra):
+        inicio = reloj()
+        resultado = f(x, y, *extra)
+        metricas["tiempo_etapas"] += reloj() - inicio
+        metricas["evaluaciones"] += 1
+        if on_rhs is not None:
+            on_rhs(x, y, resultado if resultado is not None or not extra else extra[0])
+        return resultado
+
+    return f_medida
+
+
+def _registrador_pasos():
+    """
+    Para los métodos con su propio ciclo (dormand_prince, rigidos.py):
+    retorna None si no hay instrumentación o una función registrar(x, y)
+    que se llama al aceptar cada paso. El tiempo desde el registro anterior
+    que no se pasó dentro de f cuenta como combinación.
+    """
+    if _instrumentacion is None:
+        return None
+    metricas = _instrumentacion["metricas"]
+    on_step = _instrumentacion["on_step"]
+    reloj = time.perf_counter
+    ultimo = [reloj(), metricas["tiempo_etapas"]]
+
+    def registrar(x, y):
+        metricas["pasos"] += 1
+        metricas["tiempo_combinacion"] += (reloj() - ultimo[0]) - (metricas["tiempo_etapas"] - ultimo[1])
+        if on_step is not None:
+            on_step(x, y)
+        ultimo[0], ultimo[1] = reloj(), metricas["tiempo_etapas"]
+
+    return registrar
+
+
+def _medir_pasos(estados, x0, h):
+    """
+    Envuelve un generador de estados y₀, y₁, ... de paso fijo: el tiempo
+    en producir cada estado es el paso y el tiempo hasta que se pide el
+    siguiente es almacenamiento (en ambos se descuenta el tiempo en f).
+    """
+    if _instrumentacion is None:
+        return estados
+    return _pasos_medidos(estados, x0, h, _instrumentacion)
+
+
+def _pasos_medidos(estados, x0, h, instrumentacion):
+    metricas = instrumentacion["metricas"]
+    on_step = instrumentacion["on_step"]
+    reloj = time.perf_counter
+
+    inicio, etapas = reloj(), metricas["tiempo_etapas"]
+    for i, y in enumerate(estados):
+        if i:
+            metricas["pasos"] += 1
+            metricas["tiempo_combinacion"] += (reloj() - inicio) - (metricas["tiempo_etapas"] - etapas)
+            if on_step is not None:
+                on_step(x0 + i*h, y)
+        inicio, etapas = reloj(), metricas["tiempo_etapas"]
+        yield y
+        metricas["tiempo_almacenamiento"] += (reloj() - inicio) - (metricas["tiempo_etapas"] - etapas)
+        inicio, etapas = reloj(), metricas["tiempo_etapas"]
+
+
+def crear_evento(g, terminal=False, direccion=0):
+    """
+    Describe un evento g(t, y) = 0 que los solvers vigilan paso a paso.
+
+    PARÁMETROS:
+    -----------
+    g : función
+        g(t, y) -> float. Hay evento cuando g cambia de signo dentro de un
+        paso; el instante se refina con un buscador de raíces sobre el
+        interpolante cúbico de Hermite del paso.
+
+    terminal : bool o int
+        False: solo se registra. True: la integración se detiene en el
+        primer evento. Un entero N la detiene en el N-ésimo evento (por
+        ejemplo, tras N cruces por cero de un péndulo).
+
+    direccion : int
+        0 cuenta todos los cruces, +1 solo los de g negativa a positiva y
+        -1 solo los de g positiva a negativa.
+
+    Una función g sin envolver equivale a crear_evento(g).
+    """
+    return {"g": g, "terminal": int(terminal), "direccion": direccion}
+
+
+def _normalizar_eventos(eventos):
+    return [ev if isinstance(ev, dict) else crear_evento(ev) for ev in eventos]
+
+
+def _hermite(x_a, y_a, f_a, x_b, y_b, f_b, x):
+    """Interpolante cúbico de Hermite del paso [x_a, x_b] evaluado en x."""
+    h = x_b - x_a
+    theta = (x - x_a) / h
+    h00 = (1 + 2*theta) * (1 - theta)**2
+    h10 = theta * (1 - theta)**2
+    h01 = theta**2 * (3 - 2*theta)
+    h11 = theta**2 * (theta - 1)
+    return h00*y_a + h10*h*f_a + h01*y_b + h11*h*f_b
+
+
+def _raiz(funcion, a, b, fa, fb, tolerancia):
+    """Raíz de funcion en [a, b] (con fa·fb < 0) por el método de Illinois."""
+    c = b
+    for _ in range(100):
+        c = b - fb * (b - a) / (fb - fa)
+        fc = funcion(c)
+        if fc == 0 or abs(b - a) < tolerancia:
+            break
+        if fc * fb < 0:
+            a, fa = b, fb
+        else:
+            fa /= 2
+        b, fb = c, fc
+    return c
+
+
+def _buscar_eventos(eventos, g_a, g_b, interpolar, x_a, x_b):
+    """
+    Eventos con cambio de signo en el paso [x_a, x_b], como una lista
+    ordenada de (t, índice del evento).
+    """
+    hallados = []
+    for k, evento in enumerate(eventos):
+        sube = g_a[k] < 0 <= g_b[k]
+        baja = g_a[k] > 0 >= g_b[k]
+        if evento["direccion"] > 0:
+            baja = False
+        elif evento["direccion"] < 0:
+            sube = False
+        if not (sube or baja):
+            continue
+        if g_b[k] == 0:
+            t = x_b
+        else:
+            g = evento["g"]
+            t = _raiz(lambda t: g(t, interpolar(t)), x_a, x_b, g_a[k], g_b[k],
+                      1e-12 * max(1.0, abs(x_b)))
+        hallados.append((t, k))
+    hallados.sort()
+    return hallados
+
+
+def _recorrer(estados, derivada, x0, h, n_pasos, guardar_cada=1, t_eval=None,
+              eventos=None):
+    """
+    Recorre los estados y₀..yₙ de la malla xᵢ = x0 + i·h y decide qué se
+    guarda, de modo que el paso interno h no fija cuántos puntos se
+    almacenan ni obliga a integrar de más.
+
+    - guardar_cada=k: guarda x₀, x_k, x_2k, ... y siempre el último punto.
+    - t_eval: guarda la solución en esos tiempos. Los que coinciden con la
+      malla se copian tal cual; los demás se interpolan con un polinomio
+      cúbico de Hermite en el paso [xᵢ, xᵢ₊₁] usando y y derivada(x, y) en
+      los extremos (dos evaluaciones extra solo en los pasos que lo
+      necesitan).
+    - eventos: lista de funciones g(t, y) o de crear_evento(...). Se revisan
+      en cada paso; si uno terminal se cumple, el recorrido se detiene en
+      el instante del evento, que pasa a ser el último punto guardado
+      (salvo con t_eval, donde solo se guardan los tiempos pedidos).
+
+    Retorna (x, y) o, si se dieron eventos, (x, y, resultado_eventos), con
+    resultado_eventos[k] = {"t": tiempos, "y": estados} del evento k.
+    """
+    estados = _medir_pasos(estados, x0, h)
+    if t_eval is None:
+        if guardar_cada < 1:
+            raise ValueError("guardar_cada debe ser un entero >= 1")
+        n_salida = n_pasos // guardar_cada + 1 + (n_pasos % guardar_cada != 0)
+        x_salida = np.empty(n_salida)
+    else:
+        x_salida = np.array(t_eval, dtype=float).ravel()
+        n_salida = x_salida.size
+    tolerancia = 1e-9 * abs(h)
+    if t_eval is not None and n_salida and (
+            np.any(np.diff(x_salida) < 0)
+            or x_salida[0] < x0 - tolerancia
+            or x_salida[-1] > x0 + n_pasos*h + tolerancia):
+        raise ValueError("t_eval debe estar ordenado y dentro de [x0, x_final]")
+
+    if eventos is not None:
+        eventos = _normalizar_eventos(eventos)
+        resultado_eventos = [{"t": [], "y": []} for _ in eventos]
+        conteo = [0] * len(eventos)
+
+    y_salida = None
+    y_anterior = None
+    g_a = None
+    j = 0
+    for i, y in enumerate(estados):
+        x_i = x0 + i*h
+        if y_salida is None:
+            # float32 se conserva; enteros y float64 se guardan en float64
+            tipo = np.result_type(np.asarray(y).dtype, np.float32)
+            y_salida = np.empty((n_salida,) + np.shape(y), dtype=tipo)
+            y_anterior = np.empty(np.shape(y), dtype=tipo)
+        y_i = np.asarray(y, dtype=tipo)[()]
+
+        if i == 0:
+            if eventos is not None:
+                g_a = [evento["g"](x_i, y_i) for evento in eventos]
+        else:
+            x_a = x_i - h
+            pendientes = []
+
+            def interpolar(x):
+                # Las derivadas en los extremos solo se evalúan si hacen falta
+                if not pendientes:
+                    pendientes.append(np.asarray(derivada(x_a, y_anterior[()])))
+                    pendientes.append(np.asarray(derivada(x_i, y_i)))
+                f_a, f_b = pendientes
+                return _hermite(x_a, y_anterior, f_a, x_i, y_i, f_b, x)[()]
+
+            # ----- Eventos dentro del paso (x_a, x_i] -----
+            x_corte = None
+            if eventos is not None:
+                g_b = [evento["g"](x_i, y_i) for evento in eventos]
+                for t, k in _buscar_eventos(eventos, g_a, g_b, interpolar, x_a, x_i):
+                    y_t = y_i if t == x_i else interpolar(t)
+                    resultado_eventos[k]["t"].append(t)
+                    resultado_eventos[k]["y"].append(np.copy(y_t))
+                    conteo[k] += 1
+                    if eventos[k]["terminal"] and conteo[k] >= eventos[k]["terminal"]:
+                        x_corte, y_corte = t, y_t
+                        break
+                g_a = g_b
+
+            # ----- Puntos de t_eval dentro del paso (x_a, x_i) -----
+            if t_eval is not None:
+                limite = x_i - tolerancia if x_corte is None else x_corte + tolerancia
+                while j < n_salida and x_salida[j] < limite:
+                    y_salida[j] = interpolar(x_salida[j])
+                    j += 1
+
+            if x_corte is not None:
+                if t_eval is None:
+                    x_salida[j] = x_corte
+                    y_salida[j] = y_corte
+                    j += 1
+                break
+
+        # Punto de la malla
+        if t_eval is None:
+            if i % guardar_cada == 0 or i == n_pasos:
+                x_salida[j] = x_i
+                y_salida[j] = y
+                j += 1
+        else:
+            while j < n_salida and x_salida[j] <= x_i + tolerancia:
+                y_salida[j] = y
+                j += 1
+        np.copyto(y_anterior, y)
+
+    x_salida, y_salida = x_salida[:j], y_salida[:j]
+    if eventos is None:
+        return x_salida, y_salida
+
+    for resultado in resultado_eventos:
+        resultado["t"] = np.array(resultado["t"])
+        resultado["y"] = np.array(resultado["y"])
+    return x_salida, y_salida, resultado_eventos
+
+
+# ============================================
+# SALIDA DENSA
+# ============================================
+
+def solucion_densa(x, y, derivadas=None, f=None, tipo="hermite"):
+    """
+    Solución continua sol(t) a partir de los puntos calculados por un método.
+
+    Con ella se grafica o se consulta la solución en cualquier t del
+    intervalo sin volver a integrar con un paso más chico: evaluar sol
+    solo cuesta interpolar.
+
+    PARÁMETROS:
+    -----------
+    x : array_like, forma (n,)
+        Puntos de la solución (ordenados; pueden no ser equiespaciados).
+
+    y : array_like, forma (n,) o (n, ...)
+        Estados en esos puntos.
+
+    derivadas : array_like, opcional
+        y'(xᵢ) = f(xᵢ, yᵢ), con la forma de y. Si no se dan y tipo es
+        "hermite", se calculan con f (una evaluación por punto).
+
+    f : función, opcional
+        f(x, y) del problema, para calcular las derivadas.
+
+    tipo : str
+        "hermite":   cúbico de Hermite en cada paso [xᵢ, xᵢ₊₁] con y e y'
+                     en los extremos (la salida natural de los Runge–Kutta).
+        "polinomio": polinomio cúbico que interpola yᵢ₋₁, yᵢ, yᵢ₊₁, yᵢ₊₂
+                     (el mismo grado que usa Adams–Bashforth–Moulton; no
+                     necesita derivadas).
+
+    RETORNA:
+    --------
+    sol : función
+        sol(t) acepta un número o un arreglo de tiempos dentro de
+        [x[0], x[-1]] y retorna un arreglo de forma t.shape + y.shape[1:].
+        Tiene los atributos sol.x, sol.y y sol.tipo.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if tipo not in ("hermite", "polinomio"):
+        raise ValueError(f"tipo debe ser 'hermite' o 'polinomio', no {tipo!r}")
+    if tipo == "hermite":
+        if derivadas is None:
+            if f is None:
+                raise ValueError("El interpolante de Hermite necesita las derivadas o f")
+            derivadas = np.array([np.asarray(f(x[i], y[i][()]), dtype=float)
+                                  for i in range(len(x))]).reshape(y.shape)
+        derivadas = np.asarray(derivadas, dtype=float)
+
+    # Los métodos adaptativos pueden integrar hacia atrás (x decreciente)
+    x_nodos, y_nodos, d_nodos = x, y, derivadas
+    if len(x) > 1 and x[-1] < x[0]:
+        x_nodos, y_nodos = x[::-1], y[::-1]
+        d_nodos = None if derivadas is None else derivadas[::-1]
+    x_min, x_max = x_nodos[0], x_nodos[-1]
+    tolerancia = 1e-9 * max(1.0, abs(x_max - x_min))
+    grado = min(3, len(x) - 1)
+
+    def sol(t):
+        t = np.asarray(t, dtype=float)
+        tt = t.ravel()
+        if tt.size and (tt.min() < x_min - tolerancia or tt.max() > x_max + tolerancia):
+            raise ValueError(f"t debe estar dentro de [{x_min}, {x_max}]")
+        if len(x_nodos) == 1:
+            return np.broadcast_to(y_nodos[0], t.shape + y.shape[1:]).copy()
+
+        # Paso [xᵢ, xᵢ₊₁] que contiene a cada t
+        i = np.clip(np.searchsorted(x_nodos, tt, side="right") - 1, 0, len(x_nodos) - 2)
+        forma = (-1,) + (1,) * (y.ndim - 1)
+        if tipo == "hermite":
+            resultado = _hermite(x_nodos[i].reshape(forma), y_nodos[i], d_nodos[i],
+                                 x_nodos[i + 1].reshape(forma), y_nodos[i + 1], d_nodos[i + 1],
+                                 tt.reshape(forma))
+        else:
+            # Nodos xᵢ₋₁..xᵢ₊₂ (recorridos hacia adentro en los bordes) y
+            # base de Lagrange sobre ellos
+            inicio = np.clip(i - 1, 0, len(x_nodos) - 1 - grado)
+            nodos = inicio[:, None] + np.arange(grado + 1)
+            x_vecinos = x_nodos[nodos]
+            resultado = 0.0
+            for k in range(grado + 1):
+                base = np.ones_like(tt)
+                for m in range(grado + 1):
+                    if m != k:
+                        base *= (tt - x_vecinos[:, m]) / (x_vecinos[:, k] - x_vecinos[:, m])
+                resultado = resultado + base.reshape(forma) * y_nodos[nodos[:, k]]
+        return resultado.reshape(t.shape + y.shape[1:])
+
+    sol.x = x
+    sol.y = y
+    sol.tipo = tipo
+    return sol
+
+
+def _validar_densa(densa, guardar_cada, t_eval):
+    if densa and (guardar_cada != 1 or t_eval is not None):
+        raise ValueError("densa=True necesita todos los puntos de la malla "
+                         "(no se combina con guardar_cada ni t_eval)")
+
+
+# ============================================
+# MOTOR RUNGE–KUTTA EXPLÍCITO (TABLAS DE BUTCHER)
+# ============================================
+
+# Cada método explícito de un paso es una tabla de Butcher (c, A, b):
+#
+#     kᵢ = f(x + cᵢ·h, y + h·Σⱼ aᵢⱼ·kⱼ)        y_nuevo = y + h·Σᵢ bᵢ·kᵢ
+#
+# Los coeficientes se escriben como fracciones exactas. Agregar un método
+# es agregar una entrada a este diccionario.
+_F = Fraction
+TABLAS_BUTCHER = {
+    "euler": {
+        "c": [0],
+        "A": [[]],
+        "b": [1],
+    },
+    "euler_mejorado": {   # Heun
+        "c": [0, 1],
+        "A": [[], [1]],
+        "b": [_F(1, 2), _F(1, 2)],
+    },
+    "ralston": {          # orden 2 con la menor cota del error de truncamiento
+        "c": [0, _F(2, 3)],
+        "A": [[], [_F(2, 3)]],
+        "b": [_F(1, 4), _F(3, 4)],
+    },
+    "rk3": {              # Kutta de orden 3
+        "c": [0, _F(1, 2), 1],
+        "A": [[], [_F(1, 2)], [-1, 2]],
+        "b": [_F(1, 6), _F(2, 3), _F(1, 6)],
+    },
+    "rk4": {
+        "c": [0, _F(1, 2), _F(1, 2), 1],
+        "A": [[], [_F(1, 2)], [0, _F(1, 2)], [0, 0, 1]],
+        "b": [_F(1, 6), _F(1, 3), _F(1, 3), _F(1, 6)],
+    },
+    "rk5": {              # Butcher de orden 5 (6 etapas)
+        "c": [0, _F(1, 4), _F(1, 4), _F(1, 2), _F(3, 4), 1],
+        "A": [[], [_F(1, 4)], [_F(1, 8), _F(1, 8)], [0, _F(-1, 2), 1],
+              [_F(3, 16), 0, 0, _F(9, 16)],
+              [_F(-3, 7), _F(2, 7), _F(12, 7), _F(-12, 7), _F(8, 7)]],
+        "b": [_F(7, 90), 0, _F(32, 90), _F(12, 90), _F(32, 90), _F(7, 90)],
+    },
+}
+
+_TABLAS_COMPILADAS = {}
+
+
+def _fila_entera(coeficientes):
+    """
+    Escribe una fila de coeficientes racionales como (denominador común,
+    [(j, numerador), ...]) sin los ceros, para combinar las etapas como
+    h/den·(n₀k₀ + n₁k₁ + ...). Así rk4 queda y + h/6·(k₀ + 2k₁ + 2k₂ + k₃).
+    """
+    fracciones = [Fraction(a) for a in coeficientes]
+    denominador = math.lcm(*(a.denominator for a in fracciones)) if fracciones else 1
+    terminos = [(j, int(a * denominador)) for j, a in enumerate(fracciones) if a != 0]
+    return denominador, terminos
+
+
+def _expresion_combinacion(denominador, terminos):
+    """Texto de h/den·(Σ nⱼ·kⱼ) para el código generado."""
+    suma = ""
+    for posicion, (j, numerador) in enumerate(terminos):
+        signo = "-" if numerador < 0 else "+"
+        magnitud = abs(numerador)
+        termino = f"k{j}" if magnitud == 1 else f"{magnitud}*k{j}"
+        if posicion == 0:
+            suma = termino if signo == "+" else f"-{termino}"
+        else:
+            suma += f" {signo} {termino}"
+    factor = "h" if denominador == 1 else f"h/{denominador}"
+    return f"{factor}*({suma})" if len(terminos) > 1 else f"{factor}*{suma}"
+
+
+def _compilar_tabla(tabla):
+    """
+    Valida la tabla y genera (una sola vez) el código Python de un paso y
+    de un recorrido completo con las etapas desenrolladas, de modo que el
+    ciclo no recorre listas de coeficientes en cada paso.
+    """
+    if isinstance(tabla, str):
+        if tabla not in TABLAS_BUTCHER:
+            raise ValueError(f"Método desconocido: {tabla!r}. Disponibles: {list(TABLAS_BUTCHER)}")
+        datos = TABLAS_BUTCHER[tabla]
+    else:
+        datos = tabla
+
+    c, A, b = datos["c"], datos["A"], datos["b"]
+    clave = (tuple(map(Fraction, c)), tuple(tuple(map(Fraction, fila)) for fila in A),
+             tuple(map(Fraction, b)))
+    if clave in _TABLAS_COMPILADAS:
+        return _TABLAS_COMPILADAS[clave]
+    etapas = len(c)
+    if len(A) != etapas or len(b) != etapas:
+        raise ValueError("c, A y b deben tener una entrada por etapa")
+    for i, fila in enumerate(A):
+        if len(fila) > i:
+            raise ValueError("La tabla debe ser explícita (A estrictamente triangular inferior)")
+    if c[0] != 0:
+        raise ValueError("La primera etapa debe ser f(x, y) (c₀ = 0)")
+
+    lineas_etapas = []
+    for i in range(etapas):
+        ci = Fraction(c[i])
+        if ci == 0:
+            x = "x"
+        elif ci == 1:
+            x = "x + h"
+        elif ci.numerator == 1:
+            x = f"x + h/{ci.denominator}"
+        else:
+            x = f"x + h*{ci.numerator}/{ci.denominator}"
+        denominador, terminos = _fila_entera(A[i])
+        y = "y" if not terminos else f"y + {_expresion_combinacion(denominador, terminos)}"
+        lineas_etapas.append(f"k{i} = f({x}, {y})")
+    combinacion = "y + " + _expresion_combinacion(*_fila_entera(b))
+
+    fuente = "\n".join([
+        "def _paso(f, x, y, h):",
+        *(f"    {linea}" for linea in lineas_etapas),
+        f"    return {combinacion}",
+        "",
+        "def _recorrido(f, x_valores, y_valores, y, h, n_pasos):",
+        "    for i in range(n_pasos):",
+        "        x = x_valores[i]",
+        *(f"        {linea}" for linea in lineas_etapas),
+        f"        y = {combinacion}",
+        "        y_valores[i + 1] = y",
+        "",
+        # Igual, guardando además k₀ = f(xᵢ, yᵢ) para la salida densa
+        "def _recorrido_denso(f, x_valores, y_valores, dy_valores, y, h, n_pasos):",
+        "    for i in range(n_pasos):",
+        "        x = x_valores[i]",
+        *(f"        {linea}" for linea in lineas_etapas),
+        "        dy_valores[i] = k0",
+        f"        y = {combinacion}",
+        "        y_valores[i + 1] = y",
+        "",
+    ])
+    espacio = {}
+    exec(compile(fuente, "<tabla de Butcher>", "exec"), espacio)
+
+    compilada = {
+        "paso": espacio["_paso"],
+        "recorrido": espacio["_recorrido"],
+        "recorrido_denso": espacio["_recorrido_denso"],
+        "c": [float(ci) for ci in c],
+        "A": [_fila_entera(fila) for fila in A],
+        "b": _fila_entera(b),
+        "fuente": fuente,
+    }
+    _TABLAS_COMPILADAS[clave] = compilada
+    return compilada
+
+
+def _preparar_rk(f, y0):
+    """
+    f medida y, si el estado es un vector, convertida para que siempre
+    retorne un numpy.ndarray (f puede retornar una lista).
+    """
+    f = _medir_rhs(f)
+    if np.ndim(y0) == 0:
+        return f, y0
+    y0 = np.array(y0, dtype=float)
+
+    def F(x, y):
+        return np.asarray(f(x, y), dtype=float)
+
+    return F, y0
+
+
+def _estados_rk(paso, f, x0, y0, h, n_pasos):
+    """Produce y₀, y₁, ... de un método de un paso (sin modificar los estados)."""
     y_actual = y0
+    yield y_actual
+    for i in range(n_pasos):
+        y_actual = paso(f, x0 + i*h, y_actual, h)
+        yield y_actual
 
-    # Almacenar los resultados
-    x_valores = [x0]
-    y_valores = [y0]
 
-    #Lógica
-    while x_actual < x_final:
-        #Cálculos con K1
-        k1 = f(x_actual, y_actual)
+def _estados_rk_np(evaluar, t0, y_actual, h, n_pasos, tabla="rk4", derivadas=None):
+    """
+    Versión en sitio para numpy.ndarray de cualquier forma (vector o lote
+    (n_trayectorias, n_estado)). Las etapas k₀..k_{s-1} viven en un solo
+    arreglo reservado antes del ciclo y evaluar(t, y, salida) escribe en
+    ellas, así que un paso no reserva memoria. El estado se actualiza en el
+    mismo arreglo: quien lo consuma debe copiarlo si lo guarda. Si se da
+    el arreglo derivadas, en derivadas[i] queda k₀ = f(tᵢ, yᵢ) de cada paso.
+    """
+    compilada = _compilar_tabla(tabla)
+    c, filas, pesos = compilada["c"], compilada["A"], compilada["b"]
 
-        #Cálculos con K2
+    # Etapas y buffers de trabajo reservados una sola vez
+    K = np.empty((len(c),) + y_actual.shape, dtype=y_actual.dtype)
+    k = [K[i] for i in range(len(c))]
+    y_temp = np.empty_like(y_actual)
+    auxiliar = np.empty_like(y_actual)
 
-        
-        y_asterisco = y_actual + h/2 * k1
-        k2 = f(x_actual + h/2,y_asterisco)
+    def combinar(denominador, terminos):
+        # y_temp = h/den·(Σ nⱼ·kⱼ)
+        j, numerador = terminos[0]
+        if len(terminos) == 1:
+            np.multiply(k[j], h*numerador/denominador, out=y_temp)
+            return
+        np.multiply(k[j], numerador, out=y_temp)
+        for j, numerador in terminos[1:]:
+            if numerador == 1:
+                np.add(y_temp, k[j], out=y_temp)
+            else:
+                np.multiply(k[j], numerador, out=auxiliar)
+                np.add(y_temp, auxiliar, out=y_temp)
+        np.multiply(y_temp, h/denominador, out=y_temp)
 
-        #Cálculos con K3
-        y_asterisco = y_actual + h/2 * k2
-        k3 = f(x_actual + h/2,y_asterisco)
+    yield y_actual
 
-        #Cálculos con K4
-        y_asterisco = y_actual + h * k3
-        k4 = f(x_actual + h,y_asterisco)
+    for i in range(n_pasos):
+        t_actual = t0 + i*h
+        for etapa, (denominador, terminos) in enumerate(filas):
+            if terminos:
+                combinar(denominador, terminos)
+                y_temp += y_actual
+                evaluar(t_actual + c[etapa]*h, y_temp, k[etapa])
+            else:
+                evaluar(t_actual + c[etapa]*h, y_actual, k[etapa])
+        if derivadas is not None:
+            derivadas[i] = k[0]
 
-        y_siguiente = y_actual + h/6 *(k1+2*k2+2*k3+k4)
+        combinar(*pesos)
+        y_actual += y_temp
+        yield y_actual
 
-        x_actual += h
-        y_actual = y_siguiente
 
-        x_valores.append(x_actual)
-        y_valores.append(y_actual)
-    return x_valores, y_valores
+def runge_kutta(f, x0, y0, h, x_final, tabla="rk4", guardar_cada=1, t_eval=None,
+                eventos=None, densa=False):
+    """
+    Método de Runge–Kutta explícito de paso fijo definido por una tabla de Butcher.
+
+    euler, euler_mejorado, rk4 y rk4_sistema son este mismo método con su
+    tabla; además están "ralston", "rk3" y "rk5" (ver TABLAS_BUTCHER).
+
+    PARÁMETROS:
+    -----------
+    f : función
+        f(x, y). Si y0 es un escalar, y es un float; si y0 es un vector, y
+        es un numpy.ndarray y f puede retornar una lista o un arreglo.
+
+    x0, y0, h, x_final :
+        Igual que en rk4; la malla es xᵢ = x0 + i·h.
+
+    tabla : str o dict
+        Nombre de una tabla de TABLAS_BUTCHER o un dict {"c", "A", "b"}
+        con los coeficientes (números o fractions.Fraction).
+
+    guardar_cada, t_eval, eventos :
+        Reducción de la salida y detección de eventos (ver _recorrer).
+
+    densa : bool
+        Si es True, además retorna sol(t), el interpolante cúbico de
+        Hermite de toda la solución (ver solucion_densa). Las derivadas en
+        la malla son las k₀ de cada paso: solo cuesta una evaluación de f
+        más (en x_final).
+
+    RETORNA:
+    --------
+    x_valores : numpy.ndarray, forma (n_pasos + 1,)
 
+    y_valores : numpy.ndarray, forma (n_pasos + 1,) o (n_pasos + 1, n)
+
+    resultado_eventos : list (solo si se dieron eventos)
+
+    sol : función (solo si densa=True)
+    """
+    _validar_densa(densa, guardar_cada, t_eval)
+    compilada = _compilar_tabla(tabla)
+    n_pasos = _numero_pasos(x0, h, x_final)
+    F, y0 = _preparar_rk(f, y0)
+
+    # Salida reducida (guardar_cada / t_eval), eventos o instrumentación
+    if (guardar_cada != 1 or t_eval is not None or eventos is not None
+            or _instrumentacion is not None):
+        estados = _estados_rk(compilada["paso"], F, x0, y0, h, n_pasos)
+        resultado = _recorrer(estados, F, x0, h, n_pasos, guardar_cada, t_eval, eventos)
+        if densa:
+            resultado += (solucion_densa(resultado[0], resultado[1], f=F),)
+        return resultado
+
+    # Almacenar los resultados (reservados de antemano)
+    x_valores = _malla(x0, h, n_pasos)
+    y_valores = np.empty((n_pasos + 1,) + np.shape(y0))
+    y_valores[0] = y0
+    if not densa:
+        compilada["recorrido"](F, x_valores, y_valores, y0, h, n_pasos)
+        return x_valores, y_valores
+
+    dy_valores = np.empty_like(y_valores)
+    compilada["recorrido_denso"](F, x_valores, y_valores, dy_valores, y0, h, n_pasos)
+    dy_valores[-1] = F(x_valores[-1], y_valores[-1][()])
+    return x_valores, y_valores, solucion_densa(x_valores, y_valores, dy_valores)
+
+
+def euler(f, x0, y0, h, x_final, guardar_cada=1, t_eval=None, eventos=None,
+          densa=False):
+    return runge_kutta(f, x0, y0, h, x_final, "euler", guardar_cada, t_eval, eventos,
+                       densa)
+
+def euler_mejorado(f, x0, y0, h, x_final, guardar_cada=1, t_eval=None,
+                   eventos=None, densa=False):
+    return runge_kutta(f, x0, y0, h, x_final, "euler_mejorado", guardar_cada, t_eval, eventos,
+                       densa)
+
+# Un paso de RK4 desde (x, y), que usan el arranque de ABM y continuacion.py
+_paso_rk4 = _compilar_tabla("rk4")["paso"]
+
+def rk4(f, x0, y0, h, x_final, guardar_cada=1, t_eval=None, eventos=None, densa=False):
+    return runge_kutta(f, x0, y0, h, x_final, "rk4", guardar_cada, t_eval, eventos, densa)
+
+
+def _paso_abm(f, x_siguiente, y_actual, h, historia, modo):
+    """
+    Un paso de Adams-Bashforth-Moulton de orden 4 desde yₙ = y_actual hasta
+    x_siguiente. historia es la lista [f_{n-3}, f_{n-2}, f_{n-1}, f_n] y se
+    actualiza en su lugar: sale f_{n-3} y entra f_{n+1}. Lo usan
+    adams_bashforth_moulton, _estados_abm y continuacion.extender.
+
+    RETORNA:
+    --------
+    y_{n+1} (el valor corregido).
+    """
+    f_n3, f_n2, f_n1, f_n = historia
+
+    # Predictor (Adams-Bashforth):
+    # y_{n+1}^P = y_n + (h/24)[55f_n - 59f_{n-1} + 37f_{n-2} - 9f_{n-3}]
+    y_predicho = y_actual + (h/24) * (
+        55 * f_n      # f_n (más reciente)
+        - 59 * f_n1   # f_{n-1}
+        + 37 * f_n2   # f_{n-2}
+        - 9 * f_n3    # f_{n-3}
+    )
+
+    # Calcular f en el punto predicho
+    f_predicho = f(x_siguiente, y_predicho)
+
+    # Corrector (Adams-Moulton):
+    # y_{n+1}^C = y_n + (h/24)[9f_{n+1}^P + 19f_n - 5f_{n-1} + f_{n-2}]
+    y_corregido = y_actual + (h/24) * (
+        9 * f_predicho   # f_{n+1} usando y predicho
+        + 19 * f_n       # f_n
+        - 5 * f_n1       # f_{n-1}
+        + f_n2           # f_{n-2}
+    )
+
+    # PECE vuelve a evaluar f en el valor corregido; PEC reutiliza f_predicho
+    f_nuevo = f(x_siguiente, y_corregido) if modo == "PECE" else f_predicho
+    historia[:] = [f_n2, f_n1, f_n, f_nuevo]
+    return y_corregido
+
+
+def adams_bashforth_moulton(f, x0, y0, h, x_final, guardar_cada=1, t_eval=None,
+                            eventos=None, modo="PECE", densa=False):
+    # modo "PECE": predecir, evaluar, corregir y volver a evaluar f en el
+    # valor corregido (2 evaluaciones por paso). modo "PEC": reutilizar la
+    # f del valor predicho como f_{n+1} (1 evaluación por paso, menos precisión)
+    # densa=True: además retorna sol(t), el polinomio cúbico que interpola
+    # la solución en la malla (ver solucion_densa), sin evaluaciones extra.
+    _validar_modo_abm(modo)
+    _validar_densa(densa, guardar_cada, t_eval)
+
+    # Al menos 3 pasos: y₁, y₂, y₃ siempre se calculan con RK4
+    n_pasos = max(3, _numero_pasos(x0, h, x_final))
+    f = _medir_rhs(f)
+
+    # Salida reducida (guardar_cada / t_eval), eventos o instrumentación
+    if (guardar_cada != 1 or t_eval is not None or eventos is not None
+            or _instrumentacion is not None):
+        estados = _estados_abm(f, x0, y0, h, n_pasos, modo)
+        resultado = _recorrer(estados, f, x0, h, n_pasos, guardar_cada, t_eval, eventos)
+        if densa:
+            resultado += (solucion_densa(resultado[0], resultado[1], tipo="polinomio"),)
+        return resultado
+
+    x_valores = _malla(x0, h, n_pasos)
+    y_valores = np.empty(n_pasos + 1)
+    y_valores[0] = y0
 
-def adams_bashforth_moulton(f, x0, y0, h, x_final):
     # Inicialización con RK4 para obtener y0, y1, y2, y3
-    
-    x_valores, y_valores = rk4(f, x0, y0, h, x0 + 3*h)
+    for i in range(3):
+        y_valores[i + 1] = _paso_rk4(f, x_valores[i], y_valores[i], h)
     
    
-    f_valores = [f(x_valores[i], y_valores[i]) for i in range(4)]
-    
-    x_actual = x_valores[-1]  # Último x calculado con RK4
+    # Últimas cuatro derivadas: f_{n-3} ... f_n (más reciente)
+    historia = [f(x_valores[i], y_valores[i]) for i in range(4)]
     
     # Continuar desde x₃ hasta x_final
-    while x_actual < x_final - h/2:
-        
-        y_predicho = y_valores[-1] + (h/24) * (
-            55 * f_valores[-1]   # f_n (más reciente)
-            - 59 * f_valores[-2]  # f_{n-1}
-            + 37 * f_valores[-3]  # f_{n-2}
-            - 9 * f_valores[-4]   # f_{n-3}
-        )
-        
-        x_siguiente = x_actual + h
-        
-        # Calcular f en el punto predicho
-        f_predicho = f(x_siguiente, y_predicho)
-        
-        # Fórmula: y_{n+1}^C = y_n + (h/24)[9f_{n+1}^P + 19f_n - 5f_{n-1} + f_{n-2}]
-        
-        y_corregido = y_valores[-1] + (h/24) * (
-            9 * f_predicho        # f_{n+1} usando y predicho
-            + 19 * f_valores[-1]  # f_n
-            - 5 * f_valores[-2]   # f_{n-1}
-            + f_valores[-3]       # f_{n-2}
-        )
-        
-        # Guardar los nuevos valores
-        x_valores.append(x_siguiente)
-        y_valores.append(y_corregido)
-        
-        # Actualizar f_valores: eliminar el más antiguo y agregar el nuevo
-        f_nuevo = f(x_siguiente, y_corregido)
-        f_valores.pop(0)  # Eliminar f_{n-3}
-        f_valores.append(f_nuevo)  # Agregar f_{n+1}
-        
-        x_actual = x_siguiente
+    for n in range(3, n_pasos):
+        y_valores[n + 1] = _paso_abm(f, x_valores[n + 1], y_valores[n], h, historia, modo)
     
+    if densa:
+        return x_valores, y_valores, solucion_densa(x_valores, y_valores, tipo="polinomio")
     return x_valores, y_valores
 
 
-def rk4_sistema(f_sistema, t0, y0_vector, h, t_final):
+def rk4_sistema(f_sistema, t0, y0_vector, h, t_final, guardar_cada=1, t_eval=None,
+                eventos=None, densa=False):
     """
     Método RK4 adaptado para sistemas de ecuaciones diferenciales.
     
@@ -163,8 +903,8 @@ def rk4_sistema(f_sistema, t0, y0_vector, h, t_final):
             return [y[1], -(g/l)*sin(y[0])]
         
         t, y = rk4_sistema(f, 0, [1.0, 2.0], 0.01, 10)
-        theta = [y[i][0] for i in range(len(y))]  # Extraer θ(t)
-        omega = [y[i][1] for i in range(len(y))]  # Extraer ω(t)
+        theta = y[:, 0]  # Extraer θ(t)
+        omega = y[:, 1]  # Extraer ω(t)
     
     PARÁMETROS:
     -----------
@@ -185,12 +925,30 @@ def rk4_sistema(f_sistema, t0, y0_vector, h, t_final):
     t_final : float
         Tiempo final de integración
     
+    guardar_cada : int
+        Guardar solo uno de cada k pasos (más el último). El paso interno
+        sigue siendo h; solo cambia cuántos puntos se almacenan.
+    
+    t_eval : array_like, opcional
+        Tiempos (ordenados, dentro de [t0, t_final]) en los que se quiere la
+        solución. Los que no caen en la malla se interpolan con un polinomio
+        cúbico de Hermite dentro del paso que los contiene.
+    
+    eventos : list, opcional
+        Funciones g(t, y) o crear_evento(g, terminal, direccion) que se
+        revisan en cada paso (ver crear_evento). Con eventos terminales la
+        integración se detiene en el instante del evento.
+    
+    densa : bool
+        Si es True, además retorna sol(t): la solución continua (Hermite)
+        evaluable en cualquier arreglo de tiempos (ver solucion_densa).
+    
     RETORNA:
     --------
-    t_valores : list
-        Lista de tiempos [t₀, t₁, t₂, ...]
+    t_valores : numpy.ndarray
+        Tiempos [t₀, t₁, t₂, ...] con tᵢ = t₀ + i·h
     
-    y_valores : list de listas
+    y_valores : numpy.ndarray, forma (n_pasos + 1, n)
         y_valores[i] = [y₁(tᵢ), y₂(tᵢ), ...]
         Ejemplo: y_valores[0] = [1.0, 2.0] (condición inicial)
                  y_valores[1] = [1.02, 1.95] (primer paso)
@@ -210,51 +968,743 @@ def rk4_sistema(f_sistema, t0, y0_vector, h, t_final):
     
     Donde cada k es un VECTOR [k₁_y₁, k₁_y₂, ...] y las operaciones
     como Yₙ + k₁/2 se hacen componente por componente.
+
+    Es runge_kutta con la tabla "rk4": y llega a f_sistema como
+    numpy.ndarray.
     """
     
-    t_actual = t0
-    y_actual = y0_vector[:]  # Copiar el vector inicial
-    
-    # Almacenar resultados
-    t_valores = [t0]
-    y_valores = [y0_vector[:]]  # Guardar copia del vector inicial
-    
-    # Número de ecuaciones en el sistema
-    n = len(y0_vector)
-    
-    # Iterar hasta alcanzar t_final
-    while t_actual < t_final - h/2:  # Tolerancia para errores de redondeo
-        
-        # ========== K1 = h * f(t, Y) ==========
-        f_actual = f_sistema(t_actual, y_actual)
-        k1 = [h * f_actual[i] for i in range(n)]
-        
-        # ========== K2 = h * f(t + h/2, Y + k1/2) ==========
-        y_temp = [y_actual[i] + k1[i]/2 for i in range(n)]
-        f_temp = f_sistema(t_actual + h/2, y_temp)
-        k2 = [h * f_temp[i] for i in range(n)]
-        
-        # ========== K3 = h * f(t + h/2, Y + k2/2) ==========
-        y_temp = [y_actual[i] + k2[i]/2 for i in range(n)]
-        f_temp = f_sistema(t_actual + h/2, y_temp)
-        k3 = [h * f_temp[i] for i in range(n)]
-        
-        # ========== K4 = h * f(t + h, Y + k3) ==========
-        y_temp = [y_actual[i] + k3[i] for i in range(n)]
-        f_temp = f_sistema(t_actual + h, y_temp)
-        k4 = [h * f_temp[i] for i in range(n)]
-        
-        # ========== Y_nuevo = Y + (k1 + 2k2 + 2k3 + k4)/6 ==========
-        y_siguiente = [
-            y_actual[i] + (k1[i] + 2*k2[i] + 2*k3[i] + k4[i])/6
-            for i in range(n)
-        ]
-        
-        t_actual += h
-        y_actual = y_siguiente
-        
-        # Guardar resultados
-        t_valores.append(round(t_actual, 3))
-        y_valores.append(y_actual[:])
-    
-    return t_valores, y_valores
\ No newline at end of file
+    return runge_kutta(f_sistema, t0, y0_vector, h, t_final, "rk4", guardar_cada, t_eval,
+                       eventos, densa)
+
+
+def rk4_sistema_np(f_sistema, t0, y0_vector, h, t_final, en_sitio=False,
+                   guardar_cada=1, t_eval=None, eventos=None, densa=False, dtype=np.float64):
+    """
+    Método RK4 para sistemas con el estado y las etapas en numpy.ndarray.
+
+    Da los mismos valores que rk4_sistema, pero sin reservar memoria en
+    cada paso. rk4_sistema usa el paso compilado de la tabla "rk4", en el
+    que cada expresión como yₙ + h/2·k₁ crea un arreglo nuevo. Aquí los
+    vectores k₁..k₄ y el estado temporal se reservan una sola vez antes del
+    ciclo y las etapas se combinan en sitio (out=). Con en_sitio=True
+    tampoco f_sistema reserva su salida. Conviene para sistemas con cientos
+    o miles de componentes.
+
+    PARÁMETROS:
+    -----------
+    f_sistema : función
+        Si en_sitio es False: f_sistema(t, y) -> arreglo con las derivadas.
+        Si en_sitio es True:  f_sistema(t, y, dydt) escribe las derivadas
+        en el arreglo dydt y no retorna nada (no reserva memoria).
+
+    t0, h, t_final : float
+        Igual que en rk4_sistema.
+
+    y0_vector : list o numpy.ndarray
+        Vector de condiciones iniciales.
+
+    en_sitio : bool
+        Indica cuál de las dos firmas de f_sistema se usa.
+
+    guardar_cada, t_eval, eventos, densa :
+        Reducción de la salida, detección de eventos y salida densa, igual
+        que en rk4_sistema.
+
+    dtype : numpy.float64 o numpy.float32
+        Tipo del estado, de las etapas y de la trayectoria guardada. Con
+        float32 se usa la mitad de memoria y de tráfico de caché, a cambio
+        de unos 7 dígitos significativos (ver convergencia.comparar_precision).
+        t_valores y la salida densa siguen en float64.
+
+    RETORNA:
+    --------
+    t_valores : numpy.ndarray, forma (n_pasos + 1,)
+
+    y_valores : numpy.ndarray, forma (n_pasos + 1, n)
+        y_valores[i] es el vector de estado en t_valores[i].
+
+    resultado_eventos : list (solo si se dieron eventos)
+
+    sol : función (solo si densa=True)
+    """
+    _validar_densa(densa, guardar_cada, t_eval)
+    y0 = np.array(y0_vector, dtype=_validar_dtype(dtype))
+    evaluar, derivada = _evaluadores(f_sistema, en_sitio, y0)
+
+    n_pasos = _numero_pasos(t0, h, t_final)
+
+    # Salida reducida (guardar_cada / t_eval) o detección de eventos
+    if guardar_cada != 1 or t_eval is not None or eventos is not None:
+        estados = _estados_rk_np(evaluar, t0, y0, h, n_pasos, "rk4")
+        resultado = _recorrer(estados, derivada, t0, h, n_pasos, guardar_cada, t_eval, eventos)
+        if densa:
+            resultado += (solucion_densa(resultado[0], resultado[1], f=derivada),)
+        return resultado
+
+    return _guardar_rk_np(evaluar, t0, y0, h, n_pasos, "rk4", densa)
+
+
+def _evaluadores(f_sistema, en_sitio, y0):
+    """
+    (evaluar, derivada) para los métodos con estado numpy.ndarray:
+    evaluar(t, y, salida) escribe f en las etapas reservadas de antemano
+    (convirtiendo al dtype del estado) y derivada(t, y) la retorna.
+    """
+    if en_sitio:
+        evaluar = f_sistema
+
+        def derivada(t, y):
+            dydt = np.empty(y0.shape, dtype=y0.dtype)
+            f_sistema(t, y, dydt)
+            return dydt
+    else:
+        def evaluar(t, y, salida):
+            salida[:] = f_sistema(t, y)
+
+        derivada = f_sistema
+    return _medir_rhs(evaluar), _medir_rhs(derivada)
+
+
+def _guardar_rk_np(evaluar, t0, y0, h, n_pasos, tabla, densa):
+    """Recorre _estados_rk_np guardando toda la malla (y las k₀ si densa)."""
+    t_valores = _malla(t0, h, n_pasos)
+    y_valores = np.empty((n_pasos + 1,) + y0.shape, dtype=y0.dtype)
+    derivadas = np.empty_like(y_valores) if densa else None
+    estados = _estados_rk_np(evaluar, t0, y0, h, n_pasos, tabla, derivadas)
+    for i, y in enumerate(_medir_pasos(estados, t0, h)):
+        y_valores[i] = y
+
+    if not densa:
+        return t_valores, y_valores
+    evaluar(t_valores[-1], y_valores[-1], derivadas[-1])
+    return t_valores, y_valores, solucion_densa(t_valores, y_valores, derivadas)
+
+
+def _validar_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"dtype debe ser float32 o float64, no {dtype}")
+    return dtype
+
+
+def _validar_modo_abm(modo):
+    if modo not in ("PECE", "PEC"):
+        raise ValueError(f"modo debe ser 'PECE' o 'PEC', no {modo!r}")
+
+
+def adams_bashforth_moulton_sistema(f_sistema, t0, y0_vector, h, t_final, modo="PECE",
+                                    en_sitio=False, guardar_cada=1, t_eval=None,
+                                    eventos=None, densa=False, dtype=np.float64):
+    """
+    Adams–Bashforth–Moulton de orden 4 para SISTEMAS con estado numpy.ndarray.
+
+    Es el mismo predictor-corrector que adams_bashforth_moulton, aplicado a
+    un vector de estado (por ejemplo el péndulo de p5). Las últimas cuatro
+    derivadas se guardan en un anillo fijo de forma (4, n): en cada paso la
+    fila más antigua (f_{n-3}) se sobrescribe con f_{n+1} y solo se mueve el
+    índice de la cabeza, sin desplazar ni crear arreglos.
+
+        Predictor (AB4): Y* = Yₙ + h/24·(55fₙ - 59fₙ₋₁ + 37fₙ₋₂ - 9fₙ₋₃)
+        Corrector (AM4): Yₙ₊₁ = Yₙ + h/24·(9f(tₙ₊₁, Y*) + 19fₙ - 5fₙ₋₁ + fₙ₋₂)
+
+    Y₁, Y₂, Y₃ se obtienen con RK4 (rk4_sistema_np).
+
+    PARÁMETROS:
+    -----------
+    f_sistema, t0, y0_vector, h, t_final, en_sitio :
+        Igual que en rk4_sistema_np.
+
+    modo : str
+        "PECE": después de corregir se vuelve a evaluar f en Yₙ₊₁ para la
+                historia (2 evaluaciones de f por paso).
+        "PEC":  se guarda f(tₙ₊₁, Y*) como fₙ₊₁ (1 evaluación por paso, a
+                cambio de algo de precisión y estabilidad).
+
+    guardar_cada, t_eval, eventos :
+        Igual que en rk4_sistema.
+
+    densa : bool
+        Si es True, además retorna sol(t): el polinomio cúbico que
+        interpola la solución en la malla (ver solucion_densa).
+
+    dtype : numpy.float64 o numpy.float32
+        Tipo del estado, del anillo de derivadas y de la trayectoria
+        (igual que en rk4_sistema_np).
+
+    RETORNA:
+    --------
+    t_valores : numpy.ndarray, forma (n_pasos + 1,)
+
+    y_valores : numpy.ndarray, forma (n_pasos + 1, n)
+    """
+    _validar_modo_abm(modo)
+    _validar_densa(densa, guardar_cada, t_eval)
+    y0 = np.array(y0_vector, dtype=_validar_dtype(dtype))
+    n = y0.size
+    evaluar, derivada = _evaluadores(f_sistema, en_sitio, y0)
+
+    # Al menos 3 pasos: Y₁, Y₂, Y₃ siempre se calculan con RK4
+    n_pasos = max(3, _numero_pasos(t0, h, t_final))
+    estados = _estados_abm_sistema(evaluar, t0, y0, h, n_pasos, modo)
+
+    # Salida reducida (guardar_cada / t_eval) o detección de eventos
+    if guardar_cada != 1 or t_eval is not None or eventos is not None:
+        resultado = _recorrer(estados, derivada, t0, h, n_pasos, guardar_cada, t_eval, eventos)
+    else:
+        t_valores = _malla(t0, h, n_pasos)
+        y_valores = np.empty((n_pasos + 1, n), dtype=y0.dtype)
+        for i, y in enumerate(_medir_pasos(estados, t0, h)):
+            y_valores[i] = y
+        resultado = (t_valores, y_valores)
+
+    if densa:
+        resultado += (solucion_densa(resultado[0], resultado[1], tipo="polinomio"),)
+    return resultado
+
+
+def _estados_abm_sistema(evaluar, t0, y_actual, h, n_pasos, modo):
+    """Produce Y₀, Y₁, ... del ABM vectorizado (estado actualizado en su lugar)."""
+    n = y_actual.size
+
+    # Anillo con las últimas cuatro derivadas; filas[i] son vistas fijas
+    anillo = np.empty((4, n), dtype=y_actual.dtype)
+    filas = [anillo[0], anillo[1], anillo[2], anillo[3]]
+    y_pred = np.empty_like(y_actual)
+    f_pred = np.empty_like(y_actual)
+    y_temp = np.empty_like(y_actual)
+
+    # Arranque con RK4: Y₀..Y₃ y sus derivadas en las filas 0..3
+    for i, y in enumerate(_estados_rk_np(evaluar, t0, y_actual, h, 3, "rk4")):
+        evaluar(t0 + i*h, y, filas[i])
+        yield y
+
+    cabeza = 3  # fila de fₙ; fₙ₋₁, fₙ₋₂, fₙ₋₃ están en cabeza-1, -2, -3 (mód 4)
+    for n_paso in range(3, n_pasos):
+        f_n = filas[cabeza]
+        f_n1 = filas[(cabeza + 3) % 4]
+        f_n2 = filas[(cabeza + 2) % 4]
+        vieja = (cabeza + 1) % 4
+        f_n3 = filas[vieja]
+        t_siguiente = t0 + (n_paso + 1)*h
+
+        # ========== Predictor (Adams–Bashforth) ==========
+        np.multiply(f_n, 55, out=y_pred)
+        np.multiply(f_n1, -59, out=y_temp)
+        y_pred += y_temp
+        np.multiply(f_n2, 37, out=y_temp)
+        y_pred += y_temp
+        np.multiply(f_n3, -9, out=y_temp)
+        y_pred += y_temp
+        y_pred *= h/24
+        y_pred += y_actual
+
+        evaluar(t_siguiente, y_pred, f_pred)
+
+        # ========== Corrector (Adams–Moulton) ==========
+        np.multiply(f_pred, 9, out=y_temp)
+        np.multiply(f_n, 19, out=y_pred)
+        y_temp += y_pred
+        np.multiply(f_n1, -5, out=y_pred)
+        y_temp += y_pred
+        y_temp += f_n2
+        y_temp *= h/24
+        y_actual += y_temp
+
+        # fₙ₊₁ ocupa la fila de fₙ₋₃
+        if modo == "PECE":
+            evaluar(t_siguiente, y_actual, f_n3)
+        else:
+            np.copyto(f_n3, f_pred)
+        cabeza = vieja
+
+        yield y_actual
+
+
+def integrar_ensamble(f_lote, t0, Y0, h, t_final, parametros=None, metodo="rk4",
+                      guardar_cada=1, t_eval=None, densa=False, dtype=np.float64):
+    """
+    Integra un LOTE de trayectorias a la vez (ensamble).
+
+    En lugar de llamar a un solver una vez por cada combinación de
+    condiciones iniciales y parámetros, se avanza todo el lote de forma
+    (n_trayectorias, n_estado) en cada paso. La función del sistema recibe
+    el lote completo, así que el costo del intérprete se paga una vez por
+    paso y no una vez por trayectoria.
+
+    EJEMPLO DE USO - PÉNDULO EN LA TIERRA Y EN LA LUNA:
+    ----------------------------------------------------
+        def f_lote(t, Y, P):
+            # Y[:, 0] = θ, Y[:, 1] = ω ; P[:, 0] = g, P[:, 1] = l
+            dY = np.empty_like(Y)
+            dY[:, 0] = Y[:, 1]
+            dY[:, 1] = -(P[:, 0]/P[:, 1]) * np.sin(Y[:, 0])
+            return dY
+
+        Y0 = [[1.0, 2.0], [1.0, 2.0]]
+        P = [[32.0, 3.0], [5.28, 3.0]]
+        t, Y = integrar_ensamble(f_lote, 0, Y0, 0.01, 10, parametros=P)
+        theta_tierra = Y[:, 0, 0]
+        theta_luna = Y[:, 1, 0]
+
+    PARÁMETROS:
+    -----------
+    f_lote : función
+        f_lote(t, Y) o f_lote(t, Y, P) si se dan parámetros. Debe retornar
+        un arreglo con la misma forma que Y (n_trayectorias, n_estado).
+
+    t0, h, t_final : float
+        Igual que en rk4_sistema. Todas las trayectorias comparten la malla.
+
+    Y0 : array_like, forma (n_trayectorias, n_estado)
+        Una fila de condiciones iniciales por trayectoria.
+
+    parametros : array_like, opcional
+        Arreglo cuya primera dimensión es n_trayectorias; la fila i son los
+        parámetros de la trayectoria i. Se pasa tal cual a f_lote.
+
+    metodo : str o dict
+        Tabla de Butcher del método: "euler", "euler_mejorado", "rk4" o
+        cualquier otra de TABLAS_BUTCHER (ver runge_kutta).
+
+    guardar_cada, t_eval :
+        Reducción de la salida, igual que en rk4_sistema. Los ensambles no
+        admiten eventos: cada trayectoria cruzaría en un instante distinto.
+
+    densa : bool
+        Si es True, además retorna sol(t) (Hermite) para todo el lote:
+        sol(t) tiene forma t.shape + (n_trayectorias, n_estado).
+
+    dtype : numpy.float64 o numpy.float32
+        Tipo del lote, de los parámetros, de las etapas y de la
+        trayectoria. En ensambles grandes, limitados por el ancho de banda
+        de memoria, float32 reduce a la mitad el tráfico y el tamaño de
+        y_valores cuando bastan unos 6 dígitos significativos.
+
+    RETORNA:
+    --------
+    t_valores : numpy.ndarray, forma (n_pasos + 1,)
+
+    y_valores : numpy.ndarray, forma (n_pasos + 1, n_trayectorias, n_estado)
+        y_valores[i, j] es el estado de la trayectoria j en t_valores[i].
+    """
+    _validar_densa(densa, guardar_cada, t_eval)
+    y0 = np.array(Y0, dtype=_validar_dtype(dtype))
+    if y0.ndim != 2:
+        raise ValueError("Y0 debe tener forma (n_trayectorias, n_estado)")
+    _compilar_tabla(metodo)
+
+    if parametros is None:
+        derivada = f_lote
+    else:
+        P = np.asarray(parametros, dtype=y0.dtype)
+        if P.shape[0] != y0.shape[0]:
+            raise ValueError("parametros debe tener una fila por trayectoria")
+
+        def derivada(t, y):
+            return f_lote(t, y, P)
+
+    derivada = _medir_rhs(derivada)
+
+    def evaluar(t, y, salida):
+        salida[...] = derivada(t, y)
+
+    n_pasos = _numero_pasos(t0, h, t_final)
+
+    # Salida reducida: guardar cada k pasos o solo en los puntos de t_eval
+    if guardar_cada != 1 or t_eval is not None:
+        estados = _estados_rk_np(evaluar, t0, y0, h, n_pasos, metodo)
+        return _recorrer(estados, derivada, t0, h, n_pasos, guardar_cada, t_eval)
+
+    return _guardar_rk_np(evaluar, t0, y0, h, n_pasos, metodo, densa)
+
+
+# Coeficientes del par embebido de Dormand–Prince 5(4)
+_DP_C = (0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+# Diferencia entre los pesos de orden 5 y los de orden 4 (estimador del error)
+_DP_E = (71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40)
+# Extensión continua de orden 4: y(xₙ + θh) = yₙ + h·Σᵢ kᵢ·Σₘ Pᵢₘ·θ^(m+1)
+_DP_P = np.array([
+    [1.0, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0.0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0.0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0.0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0.0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+
+def _potencias_theta(theta):
+    """θ, θ², θ³, θ⁴ en el último eje."""
+    return np.asarray(theta, dtype=float)[..., None] ** np.arange(1, 5)
+
+
+def _solucion_dormand_prince(x, y, pasos, coeficientes):
+    """
+    sol(t) de dormand_prince con la extensión continua de orden 4 de cada
+    paso: y(xᵢ + θ·hᵢ) = yᵢ + coeficientesᵢ·(θ, θ², θ³, θ⁴). hᵢ es el paso
+    completo (el último paso puede terminar antes, en un evento terminal).
+    Misma interfaz que solucion_densa.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    y_2d = y.reshape(len(x), -1)
+    direccion = 1.0 if len(x) < 2 or x[-1] >= x[0] else -1.0
+    x_orientado = direccion * x
+    x_min, x_max = min(x[0], x[-1]), max(x[0], x[-1])
+    tolerancia = 1e-9 * max(1.0, x_max - x_min)
+
+    def sol(t):
+        t = np.asarray(t, dtype=float)
+        tt = t.ravel()
+        if tt.size and (tt.min() < x_min - tolerancia or tt.max() > x_max + tolerancia):
+            raise ValueError(f"t debe estar dentro de [{x_min}, {x_max}]")
+        if len(x) == 1:
+            return np.broadcast_to(y[0], t.shape + y.shape[1:]).copy()
+
+        # Paso que contiene a cada t
+        i = np.clip(np.searchsorted(x_orientado, direccion * tt, side="right") - 1,
+                    0, len(x) - 2)
+        theta = (tt - x[i]) / pasos[i]
+        resultado = y_2d[i] + np.einsum("knm,km->kn", coeficientes[i], _potencias_theta(theta))
+        return resultado.reshape(t.shape + y.shape[1:])
+
+    sol.x = x
+    sol.y = y
+    sol.tipo = "dormand_prince"
+    return sol
+
+
+def dormand_prince(f, x0, y0, x_final, rtol=1e-6, atol=1e-9, h0=None, h_max=None,
+                   eventos=None, densa=False):
+    """
+    Runge–Kutta embebido de Dormand–Prince 5(4) con paso adaptativo.
+
+    Los demás métodos usan un h fijo, así que en un problema como el de p4
+    (crecimiento logístico) el paso se elige pensando en la zona de mayor
+    pendiente y después se desperdicia en la meseta. Aquí cada paso calcula
+    dos soluciones (orden 5 y orden 4) con las mismas etapas; su diferencia
+    estima el error local y el paso se agranda o se achica para que ese error
+    quede dentro de la tolerancia pedida.
+
+    Detalles:
+      - Control PI del paso: h_nuevo = h · 0.9 · err^(-0.7/5) · err_ant^(0.4/5)
+      - FSAL ("first same as last"): la última etapa de un paso aceptado es
+        f(x_{n+1}, y_{n+1}), que se reutiliza como k₁ del paso siguiente, por
+        lo que cada paso cuesta 6 evaluaciones de f y no 7.
+      - El último paso se recorta para terminar exactamente en x_final.
+
+    PARÁMETROS:
+    -----------
+    f : función
+        f(x, y). Si y0 es un escalar, y es un float (como en rk4); si y0 es
+        un vector, y es un numpy.ndarray (como en rk4_sistema).
+
+    x0, x_final : float
+        Intervalo de integración.
+
+    y0 : float o list
+        Condición inicial escalar o vector de condiciones iniciales.
+
+    rtol, atol : float
+        Tolerancias relativa y absoluta. Cada componente debe cumplir
+        |error| <= atol + rtol·|y|.
+
+    h0 : float, opcional
+        Paso inicial. Si no se da, se estima a partir de f(x0, y0).
+
+    h_max : float, opcional
+        Paso máximo permitido.
+
+    eventos : list, opcional
+        Funciones g(x, y) o crear_evento(...). Se revisan en cada paso
+        aceptado sobre la extensión continua del paso (ver densa). Un
+        evento terminal detiene la integración en el instante del evento.
+
+    densa : bool
+        Si es True, info["sol"] es la solución continua sol(t): la
+        extensión continua de orden 4 de Dormand–Prince, que combina las
+        7 etapas de cada paso aceptado (sin evaluaciones extra de f). Su
+        error es del orden de la tolerancia pedida, también entre los
+        puntos aceptados (un Hermite cúbico con las derivadas FSAL sería
+        solo de orden 3).
+
+    RETORNA:
+    --------
+    x_valores : numpy.ndarray
+        Puntos aceptados (no equiespaciados).
+
+    y_valores : numpy.ndarray
+        Forma (n,) para problemas escalares o (n, n_estado) para sistemas.
+
+    info : dict
+        "pasos_aceptados", "pasos_rechazados" y "evaluaciones" (llamadas a f).
+        Si se dieron eventos, info["eventos"][k] = {"t": ..., "y": ...}.
+    """
+    escalar = np.ndim(y0) == 0
+    f = _medir_rhs(f)
+    registrar = _registrador_pasos()
+    if escalar:
+        def F(x, y):
+            return np.array([f(x, y[0])], dtype=float)
+    else:
+        def F(x, y):
+            return np.asarray(f(x, y), dtype=float)
+
+    y_actual = np.atleast_1d(np.array(y0, dtype=float))
+    x_actual = x0
+    direccion = 1.0 if x_final >= x0 else -1.0
+    h_max = abs(x_final - x0) if h_max is None else abs(h_max)
+
+    seguridad, alpha, beta = 0.9, 0.7/5, 0.4/5
+    fac_min, fac_max = 0.2, 10.0
+
+    k = [None] * 7
+    k[0] = F(x_actual, y_actual)
+    evaluaciones = 1
+
+    def norma(v, escala):
+        return np.sqrt(np.mean((v / escala) ** 2))
+
+    if h0 is None:
+        # Estimación inicial del paso (Hairer, Nørsett y Wanner)
+        escala = atol + rtol * np.abs(y_actual)
+        d0 = norma(y_actual, escala)
+        d1 = norma(k[0], escala)
+        h_prueba = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+        h_prueba = min(h_prueba, h_max)
+        f_prueba = F(x_actual + direccion * h_prueba, y_actual + direccion * h_prueba * k[0])
+        evaluaciones += 1
+        d2 = norma(f_prueba - k[0], escala) / h_prueba
+        if max(d1, d2) <= 1e-15:
+            h1 = max(1e-6, h_prueba * 1e-3)
+        else:
+            h1 = (0.01 / max(d1, d2)) ** (1/5)
+        h = min(100 * h_prueba, h1, h_max)
+    else:
+        h = min(abs(h0), h_max)
+
+    def estado(y):
+        return y[0] if escalar else y
+
+    if eventos is not None:
+        eventos = _normalizar_eventos(eventos)
+        resultado_eventos = [{"t": [], "y": []} for _ in eventos]
+        conteo = [0] * len(eventos)
+        g_a = [evento["g"](x_actual, estado(y_actual)) for evento in eventos]
+
+    x_valores = [x_actual]
+    y_valores = [y_actual.copy()]
+    pasos = []
+    coeficientes = []
+    aceptados = rechazados = 0
+    terminar = False
+    err_anterior = 1e-4
+    rechazo_previo = False
+
+    while direccion * (x_final - x_actual) > 0 and not terminar:
+        # Recortar el último paso para caer justo en x_final
+        if h >= abs(x_final - x_actual):
+            h = abs(x_final - x_actual)
+        paso = direccion * h
+
+        for s in range(1, 7):
+            y_etapa = y_actual.copy()
+            for j, a in enumerate(_DP_A[s]):
+                if a:
+                    y_etapa += paso * a * k[j]
+            k[s] = F(x_actual + _DP_C[s] * paso, y_etapa)
+        evaluaciones += 6
+
+        # y_etapa de la última etapa es ya la solución de orden 5
+        y_nuevo = y_etapa
+        error = paso * sum(e * k[j] for j, e in enumerate(_DP_E) if e)
+        escala = atol + rtol * np.maximum(np.abs(y_actual), np.abs(y_nuevo))
+        err = norma(error, escala)
+
+        if err <= 1.0:
+            aceptados += 1
+            if densa or eventos is not None:
+                # Extensión continua del paso (antes de que FSAL reemplace k₁)
+                coeficientes_paso = paso * (np.stack(k, axis=1) @ _DP_P)
+            x_anterior, y_anterior, paso_anterior = x_actual, y_actual, paso
+            x_actual = x_final if h == abs(x_final - x_actual) else x_actual + paso
+            y_actual = y_nuevo
+            k[0] = k[6]  # FSAL
+
+            if eventos is not None:
+                def interpolar(x):
+                    theta = (x - x_anterior) / paso_anterior
+                    return estado(y_anterior + coeficientes_paso @ _potencias_theta(theta))
+
+                g_b = [evento["g"](x_actual, estado(y_actual)) for evento in eventos]
+                for t, i in _buscar_eventos(eventos, g_a, g_b, interpolar,
+                                            x_anterior, x_actual):
+                    y_t = interpolar(t)
+                    resultado_eventos[i]["t"].append(t)
+                    resultado_eventos[i]["y"].append(np.copy(y_t))
+                    conteo[i] += 1
+                    if eventos[i]["terminal"] and conteo[i] >= eventos[i]["terminal"]:
+                        # El instante del evento es el último punto
+                        x_actual = t
+                        y_actual = np.atleast_1d(np.array(y_t, dtype=float))
+                        terminar = True
+                        break
+                g_a = g_b
+
+            x_valores.append(x_actual)
+            y_valores.append(y_actual.copy())
+            if densa:
+                pasos.append(paso_anterior)
+                coeficientes.append(coeficientes_paso)
+            if registrar is not None:
+                registrar(x_actual, estado(y_actual))
+
+            err = max(err, 1e-10)
+            factor = seguridad * err ** (-alpha) * err_anterior ** beta
+            factor = min(fac_max, max(fac_min, factor))
+            if rechazo_previo:
+                factor = min(factor, 1.0)
+            h = min(h * factor, h_max)
+            err_anterior = max(err, 1e-4)
+            rechazo_previo = False
+        else:
+            rechazados += 1
+            h *= max(fac_min, seguridad * err ** (-1/5))
+            rechazo_previo = True
+
+    y_valores = np.array(y_valores)
+    if escalar:
+        y_valores = y_valores[:, 0]
+    info = {
+        "pasos_aceptados": aceptados,
+        "pasos_rechazados": rechazados,
+        "evaluaciones": evaluaciones,
+    }
+    if eventos is not None:
+        for resultado in resultado_eventos:
+            resultado["t"] = np.array(resultado["t"])
+            resultado["y"] = np.array(resultado["y"])
+        info["eventos"] = resultado_eventos
+    if densa:
+        info["sol"] = _solucion_dormand_prince(
+            x_valores, y_valores, np.array(pasos),
+            np.array(coeficientes).reshape(len(pasos), y_actual.size, 4))
+    return np.array(x_valores), y_valores, info
+
+
+# ============================================
+# VERSIONES EN FLUJO (GENERADORES)
+# ============================================
+
+def _estados_abm(f, x0, y0, h, n_pasos, modo="PECE"):
+    # Arranque con RK4: y₁, y₂, y₃
+    y_valores = [y0]
+    for i in range(3):
+        y_valores.append(_paso_rk4(f, x0 + i*h, y_valores[-1], h))
+    yield from y_valores
+
+    historia = [f(x0 + i*h, y_valores[i]) for i in range(4)]
+    y_actual = y_valores[-1]
+
+    for n in range(3, n_pasos):
+        y_actual = _paso_abm(f, x0 + (n + 1)*h, y_actual, h, historia, modo)
+        yield y_actual
+
+
+def _emitir(estados, x0, h, tam_bloque, n_estado=None):
+    """
+    Convierte la secuencia de estados y₀, y₁, ... en pares (tᵢ, yᵢ) o, si
+    se pide tam_bloque, en bloques (t_bloque, y_bloque) de hasta tam_bloque
+    puntos. Solo existe en memoria un bloque a la vez.
+    """
+    estados = _medir_pasos(estados, x0, h)
+    if tam_bloque is None:
+        for i, y in enumerate(estados):
+            yield x0 + i*h, y
+        return
+
+    forma = (tam_bloque,) if n_estado is None else (tam_bloque, n_estado)
+    y_bloque = np.empty(forma)
+    i0 = j = 0
+    for y in estados:
+        y_bloque[j] = y
+        j += 1
+        if j == tam_bloque:
+            yield x0 + h * np.arange(i0, i0 + j), y_bloque
+            y_bloque = np.empty(forma)
+            i0 += j
+            j = 0
+    if j:
+        yield x0 + h * np.arange(i0, i0 + j), y_bloque[:j]
+
+
+def euler_iter(f, x0, y0, h, x_final, tam_bloque=None):
+    """
+    Versión en flujo de euler: produce los pasos uno por uno sin guardar
+    la trayectoria completa.
+
+    Con tam_bloque=None produce pares (xᵢ, yᵢ), empezando por (x0, y0).
+    Con tam_bloque=k produce bloques (x_bloque, y_bloque) de hasta k puntos
+    como numpy.ndarray. La memoria usada no depende de x_final, así que el
+    resultado se puede pasar directo a un reductor:
+
+        y_final = None
+        for x, y in euler_iter(f, 0, 2, 1e-6, 100):
+            y_final = y
+
+        maximo = max(y_b.max() for _, y_b in euler_iter(f, 0, 2, 1e-6, 100, tam_bloque=4096))
+
+    Los valores y la malla son los mismos que retorna euler.
+    """
+    return runge_kutta_iter(f, x0, y0, h, x_final, "euler", tam_bloque)
+
+
+def euler_mejorado_iter(f, x0, y0, h, x_final, tam_bloque=None):
+    """Versión en flujo de euler_mejorado (ver euler_iter)."""
+    return runge_kutta_iter(f, x0, y0, h, x_final, "euler_mejorado", tam_bloque)
+
+
+def rk4_iter(f, x0, y0, h, x_final, tam_bloque=None):
+    """Versión en flujo de rk4 (ver euler_iter)."""
+    return runge_kutta_iter(f, x0, y0, h, x_final, "rk4", tam_bloque)
+
+
+def runge_kutta_iter(f, x0, y0, h, x_final, tabla="rk4", tam_bloque=None):
+    """Versión en flujo de runge_kutta con cualquier tabla (ver euler_iter)."""
+    compilada = _compilar_tabla(tabla)
+    n_pasos = _numero_pasos(x0, h, x_final)
+    F, y0 = _preparar_rk(f, y0)
+    estados = _estados_rk(compilada["paso"], F, x0, y0, h, n_pasos)
+    n_estado = None if np.ndim(y0) == 0 else len(y0)
+    return _emitir(estados, x0, h, tam_bloque, n_estado=n_estado)
+
+
+def adams_bashforth_moulton_iter(f, x0, y0, h, x_final, tam_bloque=None, modo="PECE"):
+    """
+    Versión en flujo de adams_bashforth_moulton (ver euler_iter). Solo se
+    conservan las últimas cuatro derivadas que el método necesita.
+    """
+    _validar_modo_abm(modo)
+    n_pasos = max(3, _numero_pasos(x0, h, x_final))
+    f = _medir_rhs(f)
+    return _emitir(_estados_abm(f, x0, y0, h, n_pasos, modo), x0, h, tam_bloque)
+
+
+def rk4_sistema_iter(f_sistema, t0, y0_vector, h, t_final, tam_bloque=None):
+    """
+    Versión en flujo de rk4_sistema (ver euler_iter).
+
+    Con tam_bloque=None cada yᵢ es un numpy.ndarray [y₁(tᵢ), y₂(tᵢ), ...];
+    con tam_bloque=k cada y_bloque tiene forma (≤k, n).
+    """
+    return runge_kutta_iter(f_sistema, t0, y0_vector, h, t_final, "rk4", tam_bloque)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from barrido import barrido
+from solvers import adams_bashforth_moulton, euler, euler_mejorado, rk4, rk4_sistema
+
+
+def f(x, y):
+    return (x + y - 1)**2
+
+
+@pytest.mark.parametrize("opcion", ["guardar_cada", "t_eval", "eventos", "densa"])
+def test_opciones_que_cambian_la_salida_se_rechazan(opcion):
+    with pytest.raises(ValueError, match=opcion):
+        barrido([(rk4, f, 0.0, 2.0, 0.1, 0.5, {opcion: True})], max_procesos=1)
+
+
+def pendulo(t, y):
+    return np.array([y[1], -(32/3) * np.sin(y[0])])
+
+
+TAREAS = [
+    (euler, f, 0.0, 2.0, 0.1, 0.5),
+    (euler_mejorado, f, 0.0, 2.0, 0.05, 0.5),
+    (adams_bashforth_moulton, f, 0.0, 2.0, 0.2, 0.5, {"modo": "PEC"}),
+    (rk4_sistema, pendulo, 0.0, [1.0, 2.0], 0.01, 2.0),
+]
+
+
+@pytest.mark.parametrize("opciones", [{"max_procesos": 1},
+                                      {"max_procesos": 2, "min_filas_paralelo": 0}])
+def test_barrido_igual_a_las_corridas_en_serie(opciones):
+    for (x, y), tarea in zip(barrido(TAREAS, **opciones), TAREAS):
+        metodo, argumentos = tarea[0], tarea[1:6]
+        extra = tarea[6] if len(tarea) == 7 else {}
+        x_serie, y_serie = metodo(*argumentos, **extra)
+        np.testing.assert_array_equal(x, x_serie)
+        np.testing.assert_array_equal(y, np.asarray(y_serie))
+
+
+def test_barrido_pequeno_no_crea_pool(monkeypatch):
+    import barrido as modulo
+
+    def sin_pool(*args, **kwargs):
+        raise AssertionError("no se debía crear el pool")
+
+    monkeypatch.setattr(modulo, "ProcessPoolExecutor", sin_pool)
+    resultados = barrido([(rk4, f, 0.0, 2.0, h, 0.5) for h in (0.1, 0.05)], max_procesos=4)
+    np.testing.assert_array_equal(resultados[1][1], rk4(f, 0.0, 2.0, 0.05, 0.5)[1])
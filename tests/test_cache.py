@@ -0,0 +1,65 @@
+import importlib.util
+
+import numpy as np
+
+import solvers
+from cache import clave_corrida, memoizar
+
+
+def f(x, y):
+    return (x + y - 1)**2
+
+
+def crear_funcion_pendulo(g, l):
+    def f_pendulo(t, y):
+        return np.array([y[1], -(g/l) * np.sin(y[0])])
+    return f_pendulo
+
+
+def test_acierto_y_resultado_identico(tmp_path):
+    rk4_cache = memoizar(solvers.rk4, carpeta=str(tmp_path))
+    x1, y1 = rk4_cache(f, 0, 2, 0.01, 0.5)
+    x2, y2 = rk4_cache(f, 0, 2, 0.01, 0.5)
+    assert rk4_cache.estadisticas == {"aciertos": 1, "fallos": 1, "sin_clave": 0}
+    np.testing.assert_array_equal(y1, y2)
+    np.testing.assert_array_equal(y2, solvers.rk4(f, 0, 2, 0.01, 0.5)[1])
+
+
+def test_estado_del_modulo_no_cambia_la_clave(tmp_path):
+    rk4_cache = memoizar(solvers.rk4, carpeta=str(tmp_path))
+    rk4_cache(f, 0, 2, 0.01, 0.5)
+    # Compilar otras tablas llena la caché de _compilar_tabla
+    solvers._compilar_tabla("rk5")
+    solvers._compilar_tabla("ralston")
+    rk4_cache(f, 0, 2, 0.01, 0.5)
+    with solvers.instrumentar():
+        rk4_cache(f, 0, 2, 0.01, 0.5)
+    assert rk4_cache.estadisticas["aciertos"] == 2
+    assert rk4_cache.estadisticas["fallos"] == 1
+
+
+def test_claves_distintas():
+    argumentos = (0, [1.0, 2.0], 0.01, 1.0)
+    tierra = clave_corrida(solvers.rk4_sistema, (crear_funcion_pendulo(32, 3),) + argumentos, {})
+    luna = clave_corrida(solvers.rk4_sistema, (crear_funcion_pendulo(5.28, 3),) + argumentos, {})
+    assert tierra != luna
+    assert clave_corrida(solvers.rk4, (f, 0, 2, 0.01, 0.5), {}) != \
+        clave_corrida(solvers.rk4, (f, 0, 2, 0.02, 0.5), {})
+    assert clave_corrida(solvers.rk4, (f, 0, 2, 0.01, 0.5), {}) != \
+        clave_corrida(solvers.euler, (f, 0, 2, 0.01, 0.5), {})
+
+
+def _cargar_modulo(ruta):
+    spec = importlib.util.spec_from_file_location("modulo_cache_prueba", ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def test_cambio_en_el_fuente_invalida(tmp_path):
+    ruta = tmp_path / "modulo.py"
+    ruta.write_text("_K = 2.0\n\ndef f(x, y):\n    return -_K * y\n")
+    antes = clave_corrida(solvers.rk4, (_cargar_modulo(str(ruta)).f, 0, 1, 0.1, 1), {})
+    ruta.write_text("_K = 3.25\n\ndef f(x, y):\n    return -_K * y\n")
+    despues = clave_corrida(solvers.rk4, (_cargar_modulo(str(ruta)).f, 0, 1, 0.1, 1), {})
+    assert antes != despues
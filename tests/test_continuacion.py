@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import solvers
+from continuacion import METODOS, cargar_estado, extender, guardar_estado, iniciar_integracion
+
+
+def f(x, y):
+    return np.sin(3*x)*y + x
+
+
+def pendulo(t, y):
+    return np.array([y[1], -np.sin(y[0])])
+
+
+def por_tramos(metodo, f, y0, h, cortes, ruta=None, x0=0.0):
+    estado = iniciar_integracion(metodo, x0, y0, h)
+    tramos = [np.reshape(y0, (1,) + np.shape(y0))]
+    for corte in cortes:
+        tramos.append(extender(estado, f, corte)[1])
+        if ruta is not None:
+            guardar_estado(estado, ruta)
+            estado = cargar_estado(ruta)
+    return np.concatenate(tramos)
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+def test_extender_por_tramos_es_identico_a_una_corrida(metodo):
+    # Con x0 = 1.7 y h = 0.1, x0 + (i + 1)·h y (x0 + i·h) + h difieren en el último bit
+    if metodo == "adams_bashforth_moulton":
+        _, y = solvers.adams_bashforth_moulton(f, 1.7, 2.0, 0.1, 2.7)
+    else:
+        _, y = solvers.runge_kutta(f, 1.7, 2.0, 0.1, 2.7, tabla=metodo)
+    y_tramos = por_tramos(metodo, f, 2.0, 0.1, (2.0, 2.35, 2.7), x0=1.7)
+    np.testing.assert_array_equal(y_tramos, y)
+
+
+@pytest.mark.parametrize("metodo", ["euler", "euler_mejorado", "rk4"])
+def test_presets_identicos_con_checkpoints(metodo, tmp_path):
+    _, y = getattr(solvers, metodo)(f, 0.0, 2.0, 0.01, 0.5)
+    y_tramos = por_tramos(metodo, f, 2.0, 0.01, (0.2, 0.41, 0.5), tmp_path / "estado.npz")
+    np.testing.assert_array_equal(y_tramos, y)
+
+
+def test_sistema_rk4_identico_a_rk4_sistema():
+    _, y = solvers.rk4_sistema(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0)
+    np.testing.assert_array_equal(por_tramos("rk4", pendulo, [1.0, 2.0], 0.01, (1.0, 3.0)), y)
+
+
+@pytest.mark.parametrize("metodo", ["rk4", "adams_bashforth_moulton"])
+def test_extender_se_instrumenta_como_una_corrida(metodo):
+    with solvers.instrumentar() as esperadas:
+        if metodo == "rk4":
+            solvers.rk4(f, 0.0, 2.0, 0.1, 1.0)
+        else:
+            solvers.adams_bashforth_moulton(f, 0.0, 2.0, 0.1, 1.0)
+    with solvers.instrumentar() as metricas:
+        por_tramos(metodo, f, 2.0, 0.1, (0.25, 1.0))
+    assert metricas["pasos"] == esperadas["pasos"] == 10
+    assert metricas["evaluaciones"] == esperadas["evaluaciones"]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from solvers import crear_evento, dormand_prince, rk4, rk4_sistema_np, solucion_densa
+
+
+def f(x, y):
+    return (x + y - 1)**2
+
+
+def exacta(x):
+    return np.tan(x + np.pi/4) - x + 1
+
+
+def oscilador(t, y):
+    return np.array([y[1], -y[0]])
+
+
+@pytest.mark.parametrize("rtol", [1e-4, 1e-6, 1e-8])
+def test_dormand_prince_densa_con_la_precision_de_la_malla(rtol):
+    x, y, info = dormand_prince(f, 0.0, 2.0, 0.7, rtol=rtol, atol=rtol * 1e-3, densa=True)
+    t = np.linspace(0.0, 0.7, 2001)
+    error_malla = np.abs(y - exacta(x)).max()
+    error_densa = np.abs(info["sol"](t) - exacta(t)).max()
+    assert error_densa < 3 * error_malla
+    np.testing.assert_allclose(info["sol"](x), y, rtol=0, atol=1e-14)
+
+
+def test_dormand_prince_densa_hacia_atras_y_con_evento_terminal():
+    x, y, info = dormand_prince(oscilador, 0.0, [0.0, 1.0], -10.0, rtol=1e-6, atol=1e-9,
+                                densa=True)
+    t = np.linspace(-10.0, 0.0, 3001)
+    assert np.abs(info["sol"](t) - np.stack([np.sin(t), np.cos(t)], axis=1)).max() < 1e-5
+
+    evento = crear_evento(lambda t, y: y[0] - 0.5, terminal=True)
+    x, y, info = dormand_prince(oscilador, 0.0, [0.0, 1.0], 10.0, rtol=1e-8, atol=1e-11,
+                                eventos=[evento], densa=True)
+    assert x[-1] == pytest.approx(np.pi/6, abs=1e-8)
+    np.testing.assert_array_equal(info["sol"](x[-1]), y[-1])
+
+
+def test_rk4_densa_orden_4_entre_los_puntos():
+    t = np.linspace(0.0, 0.5, 1001)
+    errores = []
+    for h in (0.05, 0.025):
+        _, _, sol = rk4(f, 0.0, 2.0, h, 0.5, densa=True)
+        errores.append(np.abs(sol(t) - exacta(t)).max())
+    assert np.log2(errores[0] / errores[1]) > 3.7
+
+
+def test_densa_pasa_por_los_puntos_y_valida_el_intervalo():
+    x, y, sol = rk4_sistema_np(oscilador, 0.0, [0.0, 1.0], 0.1, 2.0, densa=True)
+    np.testing.assert_allclose(sol(x), y, rtol=0, atol=1e-15)
+    assert sol(np.zeros((2, 3))).shape == (2, 3, 2)
+    with pytest.raises(ValueError):
+        sol(2.5)
+    with pytest.raises(ValueError):
+        rk4(f, 0.0, 2.0, 0.1, 0.5, densa=True, guardar_cada=2)
+
+
+def test_polinomio_interpola_sin_derivadas():
+    x = np.linspace(0.0, 1.0, 11)
+    sol = solucion_densa(x, x**3, tipo="polinomio")
+    t = np.linspace(0.0, 1.0, 57)
+    np.testing.assert_allclose(sol(t), t**3, atol=1e-14)
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from expresiones import compilar_rhs
+
+
+PENDULO = {"theta": "omega", "omega": "-(g/l)*sin(theta)"}
+
+
+def test_parametros_fijos_se_evaluan_al_compilar():
+    f = compilar_rhs(PENDULO, parametros={"g": 32.0, "l": 3.0})
+    assert "g / l" not in f.fuente
+    y = np.array([1.0, 2.0])
+    np.testing.assert_array_equal(f(0.0, y), [2.0, -(32.0/3.0)*np.sin(1.0)])
+
+
+@pytest.mark.parametrize("tipo", [np.float32, np.float64])
+def test_sistema_conserva_el_tipo_del_estado(tipo):
+    f = compilar_rhs(PENDULO, parametros={"g": 32.0, "l": 3.0})
+    assert f(0.0, np.array([1.0, 2.0], dtype=tipo)).dtype == tipo
+    assert f(0.0, [1, 2]).dtype == np.float64
@@ -0,0 +1,12 @@
+import numpy as np
+import pandas as pd
+
+from reportes import formatear_tabla
+
+
+def test_formatear_tabla_igual_a_format():
+    tabla = pd.DataFrame({"xn": [0.0, 0.1, 0.2], "ErrAbs": [1e-9, np.inf, np.nan]})
+    texto = formatear_tabla(tabla, [6, 12], [".1f", ".4e"])
+    filas = texto.split("\n")[2:]
+    esperadas = [f"{x:<6.1f} {e:<12.4e}" for x, e in zip(tabla["xn"], tabla["ErrAbs"])]
+    assert filas == esperadas
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from rigidos import bdf, euler_implicito, rosenbrock
+
+
+LAMBDA = -3000.0
+
+
+def f_no_autonoma(x, y):
+    """y' = λ(y - cos x) - sen x, con solución y = cos x si y(0) = 1."""
+    return LAMBDA * (y - np.cos(x)) - np.sin(x)
+
+
+def orden_observado(metodo, hs, **opciones):
+    errores = []
+    for h in hs:
+        x, y, _ = metodo(f_no_autonoma, 0.0, 1.0, h, 1.0, **opciones)
+        errores.append(np.abs(y - np.cos(x)).max())
+    return np.log2(errores[0] / errores[-1]) / (len(hs) - 1)
+
+
+@pytest.mark.parametrize("opciones", [
+    {},
+    {"jacobiano": lambda x, y: LAMBDA,
+     "derivada_x": lambda x, y: LAMBDA * np.sin(x) - np.cos(x)},
+])
+def test_rosenbrock_orden_2_en_problema_no_autonomo(opciones):
+    assert orden_observado(rosenbrock, (0.1, 0.05, 0.025), **opciones) > 1.9
+
+
+def test_rosenbrock_reutiliza_jacobiano():
+    _, y_siempre, info_siempre = rosenbrock(f_no_autonoma, 0.0, 1.0, 0.025, 1.0,
+                                            actualizar_cada=1)
+    _, y, info = rosenbrock(f_no_autonoma, 0.0, 1.0, 0.025, 1.0)
+    assert info["jacobianos"] < info_siempre["jacobianos"] // 10
+    np.testing.assert_allclose(y, y_siempre, rtol=1e-6)
+
+
+def test_bdf_arranque_comparte_jacobiano():
+    A = np.array([[-1000.0, 0.0], [1.0, -1.0]])
+    f = lambda x, y: A @ y
+    for orden in (2, 3, 4, 5):
+        _, _, info = bdf(f, 0.0, [1.0, 0.0], 0.1, 5.0, orden=orden)
+        assert info["jacobianos"] <= 2
+
+
+@pytest.mark.parametrize("orden", [1, 2, 3])
+def test_bdf_orden(orden):
+    hs = (0.02, 0.01, 0.005)
+    assert orden_observado(bdf, hs, orden=orden) == pytest.approx(orden, abs=0.2)
+
+
+def test_euler_implicito_es_bdf1():
+    f = lambda x, y: 2*x - 3000*y + 1
+    np.testing.assert_array_equal(euler_implicito(f, 0, 1, 0.1, 0.8)[1],
+                                  bdf(f, 0, 1, 0.1, 0.8, orden=1)[1])
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+import solvers
+from simplecticos import stormer_verlet, yoshida4
+
+
+def fuerza(q):
+    return -np.sin(q)
+
+
+def energia(q, p):
+    return p**2/2 - np.cos(q)
+
+
+@pytest.mark.parametrize("metodo, subpasos", [(stormer_verlet, 1), (yoshida4, 3)])
+def test_instrumentacion(metodo, subpasos):
+    pasos = []
+    with solvers.instrumentar(on_step=lambda t, y: pasos.append(t)) as metricas:
+        t, _, _, info = metodo(fuerza, 0.0, 1.0, 0.0, 0.1, 2.0)
+    assert metricas["pasos"] == len(t) - 1
+    assert metricas["evaluaciones"] == info["evaluaciones_fuerza"] == 1 + subpasos * (len(t) - 1)
+    np.testing.assert_array_equal(pasos, t[1:])
+
+
+def test_energia_acotada():
+    *_, info = stormer_verlet(fuerza, 0.0, 1.0, 0.0, 0.1, 200.0, energia=energia)
+    assert info["deriva_relativa"] < 1e-2
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import solvers
+from convergencia import comparar_precision
+from solvers import (TABLAS_BUTCHER, adams_bashforth_moulton, adams_bashforth_moulton_sistema,
+                     integrar_ensamble, rk4_sistema, rk4_sistema_np, runge_kutta)
+
+
+def f(x, y):
+    return (x + y - 1)**2
+
+
+def exacta(x):
+    return np.tan(x + np.pi/4) - x + 1
+
+
+def pendulo(t, y):
+    return np.array([y[1], -(32/3) * np.sin(y[0])])
+
+
+def pendulo_lote(t, Y, P):
+    return np.stack([Y[:, 1], -(P[:, 0] / P[:, 1]) * np.sin(Y[:, 0])], axis=1)
+
+
+ORDENES = {"euler": 1, "euler_mejorado": 2, "ralston": 2, "rk3": 3, "rk4": 4, "rk5": 5}
+
+
+@pytest.mark.parametrize("tabla", sorted(TABLAS_BUTCHER))
+def test_orden_de_cada_tabla(tabla):
+    errores = []
+    for h in (0.05, 0.025):
+        x, y = runge_kutta(f, 0.0, 2.0, h, 0.5, tabla=tabla)
+        errores.append(abs(y[-1] - exacta(x[-1])))
+    assert np.log2(errores[0] / errores[1]) == pytest.approx(ORDENES[tabla], abs=0.25)
+
+
+@pytest.mark.parametrize("metodo", ["euler", "euler_mejorado", "rk4"])
+def test_presets_identicos_a_su_tabla(metodo):
+    x, y = getattr(solvers, metodo)(f, 0.0, 2.0, 0.01, 0.5)
+    x_tabla, y_tabla = runge_kutta(f, 0.0, 2.0, 0.01, 0.5, tabla=metodo)
+    np.testing.assert_array_equal(x, x_tabla)
+    np.testing.assert_array_equal(y, y_tabla)
+
+    iterados = list(getattr(solvers, f"{metodo}_iter")(f, 0.0, 2.0, 0.01, 0.5))
+    np.testing.assert_array_equal([y_i for _, y_i in iterados], y)
+
+
+def test_rk4_sistema_np_y_ensamble_identicos_a_rk4_sistema():
+    t, y = rk4_sistema(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0)
+    np.testing.assert_array_equal(rk4_sistema_np(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0)[1], y)
+
+    P = [[32.0, 3.0], [5.28, 3.0]]
+    _, Y = integrar_ensamble(pendulo_lote, 0.0, [[1.0, 2.0], [1.0, 2.0]], 0.01, 3.0,
+                             parametros=P)
+    np.testing.assert_allclose(Y[:, 0], y, rtol=0, atol=1e-12)
+
+
+def test_abm_sistema_igual_al_escalar():
+    _, y = adams_bashforth_moulton(f, 0.0, 2.0, 0.01, 0.5)
+    _, y_sistema = adams_bashforth_moulton_sistema(lambda x, y: f(x, y), 0.0, [2.0], 0.01, 0.5)
+    np.testing.assert_allclose(y_sistema[:, 0], y, rtol=1e-13)
+
+
+def test_guardar_cada_y_t_eval_consistentes_con_la_malla():
+    x, y = rk4_sistema_np(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0)
+    x_cada, y_cada = rk4_sistema_np(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0, guardar_cada=10)
+    np.testing.assert_array_equal(y_cada, y[::10])
+    np.testing.assert_array_equal(x_cada, x[::10])
+    _, y_eval = rk4_sistema_np(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0, t_eval=x[[5, 123]])
+    np.testing.assert_allclose(y_eval, y[[5, 123]], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("metodo", [rk4_sistema_np, adams_bashforth_moulton_sistema])
+def test_float32(metodo):
+    _, y = metodo(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0, dtype=np.float32)
+    assert y.dtype == np.float32
+    info = comparar_precision(metodo, pendulo, 0.0, [1.0, 2.0], 0.01, 3.0)
+    assert 4 < info["digitos"] < 8
+    assert info["bytes_float32"] * 2 == info["bytes_float64"]
+    with pytest.raises(ValueError):
+        metodo(pendulo, 0.0, [1.0, 2.0], 0.01, 3.0, dtype=np.int32)
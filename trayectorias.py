@@ -0,0 +1,139 @@
+"""
+Trayectorias largas en disco.
+
+rk4_sistema y los demás métodos devuelven la trayectoria completa en
+memoria. Para integraciones muy largas aquí la solución se escribe a disco
+por bloques a medida que se calcula (con las versiones *_iter de
+solvers.py, que solo mantienen un bloque en memoria) y después se vuelve a
+abrir con numpy.memmap, sin copiar ni cargar el archivo completo:
+
+    integrar_a_disco(rk4_sistema_iter, f, 0, [1.0, 2.0], 1e-4, 1000, "pendulo.tray")
+
+    y, info = abrir_trayectoria("pendulo.tray")
+    theta = y[::100, 0]                       # lee solo lo que se usa
+    t = tiempos(info, 0, len(y))[::100]
+
+FORMATO (binario, little-endian):
+    cabecera de 64 bytes:
+        b"SMNTRAY\\0"  identificador
+        uint32        versión del formato (1)
+        uint32        reservado
+        int64         n_estado (0 = problema escalar, y es 1D)
+        int64         n_puntos (se completa al cerrar)
+        float64       t0
+        float64       h
+    datos: n_puntos filas de n_estado float64 (la malla tᵢ = t0 + i·h no
+    se guarda).
+
+Si la escritura se interrumpe, n_puntos queda en 0 y al abrir se deduce
+del tamaño del archivo, así que los bloques ya escritos se pueden leer.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+
+_IDENTIFICADOR = b"SMNTRAY\0"
+_VERSION = 1
+_CABECERA = struct.Struct("<8sIIqqdd")
+_TAM_CABECERA = 64
+
+
+def _escribir_cabecera(archivo, n_estado, n_puntos, t0, h):
+    cabecera = _CABECERA.pack(_IDENTIFICADOR, _VERSION, 0, n_estado, n_puntos, t0, h)
+    archivo.seek(0)
+    archivo.write(cabecera.ljust(_TAM_CABECERA, b"\0"))
+
+
+def escribir_trayectoria(ruta, bloques, t0, h, n_estado=None):
+    """
+    Escribe una trayectoria bloque por bloque.
+
+    PARÁMETROS:
+    -----------
+    ruta : str
+        Archivo de salida (se sobrescribe).
+
+    bloques : iterable
+        Pares (t_bloque, y_bloque) consecutivos, como los que producen las
+        funciones *_iter de solvers.py con tam_bloque. t_bloque no se guarda.
+
+    t0, h : float
+        Malla de la trayectoria.
+
+    n_estado : int, opcional
+        Dimensión del estado; None para problemas escalares.
+
+    RETORNA:
+    --------
+    n_puntos : int, número de puntos escritos.
+    """
+    columnas = 0 if n_estado is None else int(n_estado)
+    n_puntos = 0
+    with open(ruta, "wb") as archivo:
+        _escribir_cabecera(archivo, columnas, 0, float(t0), float(h))
+        for _, y_bloque in bloques:
+            y_bloque = np.ascontiguousarray(y_bloque, dtype="<f8")
+            if y_bloque.shape[1:] != (() if columnas == 0 else (columnas,)):
+                raise ValueError(f"Bloque con forma {y_bloque.shape}, se esperaba n_estado = {n_estado}")
+            archivo.write(y_bloque.data)
+            n_puntos += len(y_bloque)
+        _escribir_cabecera(archivo, columnas, n_puntos, float(t0), float(h))
+    return n_puntos
+
+
+def integrar_a_disco(metodo_iter, f, x0, y0, h, x_final, ruta, tam_bloque=65536, **opciones):
+    """
+    Integra con una de las funciones *_iter de solvers.py (euler_iter,
+    rk4_iter, rk4_sistema_iter, ...) y escribe el resultado en ruta. La
+    memoria usada es la de un bloque de tam_bloque puntos, no la de la
+    trayectoria completa. **opciones se pasan al método (por ejemplo
+    modo="PEC"). Retorna el número de puntos escritos.
+    """
+    bloques = metodo_iter(f, x0, y0, h, x_final, tam_bloque=tam_bloque, **opciones)
+    n_estado = None if np.ndim(y0) == 0 else len(y0)
+    return escribir_trayectoria(ruta, bloques, x0, h, n_estado)
+
+
+def abrir_trayectoria(ruta, modo="r"):
+    """
+    Abre una trayectoria escrita con escribir_trayectoria como numpy.memmap
+    (sin copiar los datos). modo es el de numpy.memmap: "r" solo lectura,
+    "r+" lectura y escritura, "c" copia al escribir.
+
+    RETORNA:
+    --------
+    y : numpy.memmap, forma (n_puntos,) o (n_puntos, n_estado)
+
+    info : dict con "t0", "h", "n_estado" y "n_puntos"
+    """
+    with open(ruta, "rb") as archivo:
+        cabecera = archivo.read(_TAM_CABECERA)
+    if len(cabecera) < _CABECERA.size:
+        raise ValueError(f"{ruta} no es un archivo de trayectoria")
+    identificador, version, _, columnas, n_puntos, t0, h = _CABECERA.unpack_from(cabecera)
+    if identificador != _IDENTIFICADOR:
+        raise ValueError(f"{ruta} no es un archivo de trayectoria")
+    if version != _VERSION:
+        raise ValueError(f"Versión de formato no soportada: {version}")
+
+    tam_fila = 8 * max(1, columnas)
+    disponibles = (os.path.getsize(ruta) - _TAM_CABECERA) // tam_fila
+    if n_puntos == 0 or n_puntos > disponibles:
+        # Escritura interrumpida: se usa lo que alcanzó a escribirse
+        n_puntos = disponibles
+
+    forma = (n_puntos,) if columnas == 0 else (n_puntos, columnas)
+    info = {"t0": t0, "h": h, "n_estado": columnas or None, "n_puntos": n_puntos}
+    if n_puntos == 0:
+        return np.empty(forma), info
+    y = np.memmap(ruta, dtype="<f8", mode=modo, offset=_TAM_CABECERA, shape=forma)
+    return y, info
+
+
+def tiempos(info, inicio=0, fin=None):
+    """Malla tᵢ = t0 + i·h para los índices inicio..fin-1 de una trayectoria abierta."""
+    fin = info["n_puntos"] if fin is None else fin
+    return info["t0"] + info["h"] * np.arange(inicio, fin)